@@ -1,9 +1,15 @@
 from __future__ import annotations
 
+import os
 from pathlib import Path
 
 from flask import Flask
 
+from .admin import AdminController
+from .assets import AssetPipeline
+from .cache import create_cache
+from .compression import ResponseCompressor
+from .json_provider import FastJSONProvider
 from .pokeapi_client import PokeAPIClient
 from .pokemon_service import PokemonService
 from .routes import PokemonController
@@ -12,16 +18,55 @@ from .routes import PokemonController
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 
-def create_app() -> Flask:
+def create_app(*, background_init: bool = False) -> Flask:
+    """Build the app; ``background_init`` is for servers, which want the first request fast."""
     app = Flask(
         __name__,
         template_folder=str(BASE_DIR / "templates"),
         static_folder=str(BASE_DIR / "static"),
     )
+    app.json = FastJSONProvider(app)
 
-    client = PokeAPIClient()
-    service = PokemonService(client=client)
-    controller = PokemonController(service=service)
+    session = None
+    cassette = os.environ.get("POKEDEX_CASSETTE")
+    if cassette:
+        from .cassette import CassetteSession
+
+        session = CassetteSession(
+            cassette,
+            mode=os.environ.get("POKEDEX_CASSETTE_MODE", CassetteSession.REPLAY),
+            latency=float(os.environ.get("POKEDEX_CASSETTE_LATENCY_MS", "0")) / 1000,
+        )
+    client = PokeAPIClient(
+        session=session,
+        cache=create_cache(os.environ.get("POKEDEX_CACHE_URL")),
+        hedge=os.environ.get("POKEDEX_HEDGE_REQUESTS", "0") == "1",
+    )
+    service = PokemonService(
+        client=client,
+        snapshot_path=os.environ.get("POKEDEX_SNAPSHOT"),
+        crawl_stats=os.environ.get("POKEDEX_STAT_CRAWL", "1") != "0",
+        type_chart_path=os.environ.get("POKEDEX_TYPE_CHART"),
+    )
+    controller = PokemonController(
+        service=service,
+        request_budget=float(os.environ.get("POKEDEX_REQUEST_BUDGET", "8")),
+        # Benchmark aid; on by default when replaying a cassette.
+        count_upstream_calls=os.environ.get(
+            "POKEDEX_COUNT_UPSTREAM_CALLS", "1" if cassette else "0"
+        )
+        == "1",
+    )
     controller.register(app)
+    app.extensions["pokemon_service"] = service
+    AdminController(service=service, token=os.environ.get("POKEDEX_ADMIN_TOKEN")).register(app)
+    compressor = ResponseCompressor()
+    compressor.register(app)
+    AssetPipeline(app.static_folder, compressor=compressor).register(app)
+
+    # NumPy, the stat index and the snapshot load lazily. A server starts on them now
+    # so the first Pokémon request rarely has to wait; CLI commands and tests do not.
+    if background_init:
+        service.preload_in_background()
 
     return app
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import hmac
+import json
+
+import click
+from flask import Blueprint, Flask, Response, jsonify, request
+from flask.cli import AppGroup
+
+from .pokemon_service import PokemonService
+
+
+class AdminController:
+    """Token-protected cache administration endpoints plus the ``flask cache`` CLI.
+
+    Without a token the HTTP endpoints answer 404, so they are never exposed by accident.
+    """
+
+    def __init__(self, service: PokemonService, token: str | None = None) -> None:
+        self.service = service
+        self.token = token
+        self.blueprint = Blueprint("admin", __name__, url_prefix="/api/admin")
+        self.blueprint.before_request(self._authorize)
+        self.blueprint.after_request(self._no_store)
+        self._register_routes()
+
+    def register(self, app: Flask) -> None:
+        app.register_blueprint(self.blueprint)
+        app.cli.add_command(self._cli())
+
+    def _register_routes(self) -> None:
+        self.blueprint.add_url_rule("/cache", view_func=self.cache_stats, methods=["GET"])
+        self.blueprint.add_url_rule(
+            "/cache/invalidate", view_func=self.invalidate, methods=["POST"]
+        )
+        self.blueprint.add_url_rule("/cache/rewarm", view_func=self.rewarm, methods=["POST"])
+
+    def cache_stats(self):
+        try:
+            top = int(request.args.get("top", 10))
+        except ValueError:
+            top = 10
+        return jsonify(self.service.cache_report(top=max(1, top)))
+
+    def invalidate(self):
+        payload = request.get_json(silent=True) or request.form
+        try:
+            if payload.get("pokemon"):
+                result = self.service.invalidate_pokemon(payload["pokemon"])
+            elif payload.get("namespace"):
+                result = self.service.invalidate_namespace(payload["namespace"])
+            else:
+                return jsonify({"error": "Indica un 'pokemon' o un 'namespace'."}), 400
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        return jsonify(result)
+
+    def rewarm(self):
+        return jsonify(self.service.rewarm(refresh=True)), 202
+
+    def _authorize(self):
+        if not self.token:
+            return jsonify({"error": "Not found"}), 404
+        supplied = request.headers.get("X-Admin-Token", "")
+        authorization = request.headers.get("Authorization", "")
+        if authorization.startswith("Bearer "):
+            supplied = authorization[len("Bearer ") :]
+        if not hmac.compare_digest(supplied.encode(), self.token.encode()):
+            return jsonify({"error": "Unauthorized"}), 401
+        return None
+
+    @staticmethod
+    def _no_store(response: Response) -> Response:
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
+    def _cli(self) -> AppGroup:
+        group = AppGroup("cache", help="Inspect and manage the PokéAPI response cache.")
+
+        @group.command("stats")
+        @click.option("--top", default=10, show_default=True, help="Number of hottest keys.")
+        def stats_command(top: int) -> None:
+            """Print entries, bytes, hit rates per namespace and the hottest keys."""
+            click.echo(json.dumps(self.service.cache_report(top=top), indent=2))
+
+        @group.command("invalidate")
+        @click.option("--pokemon", help="Pokémon id or name to drop.")
+        @click.option("--namespace", help="Drop a whole namespace, e.g. type or pokedex.")
+        def invalidate_command(pokemon: str | None, namespace: str | None) -> None:
+            """Drop one Pokémon or a whole namespace from the cache."""
+            if bool(pokemon) == bool(namespace):
+                raise click.UsageError("Pass exactly one of --pokemon or --namespace.")
+            try:
+                if pokemon:
+                    result = self.service.invalidate_pokemon(pokemon)
+                else:
+                    result = self.service.invalidate_namespace(namespace)
+            except ValueError as exc:
+                raise click.BadParameter(str(exc)) from exc
+            click.echo(json.dumps(result, indent=2))
+
+        @group.command("snapshot")
+        @click.argument("path", type=click.Path(dir_okay=False))
+        @click.option(
+            "--timeout",
+            default=600.0,
+            show_default=True,
+            help="Seconds to wait for the stat crawl before writing what is indexed.",
+        )
+        def snapshot_command(path: str, timeout: float) -> None:
+            """Write every known Pokémon to a binary snapshot loaded via POKEDEX_SNAPSHOT."""
+            # The crawl retries failed ids forever; during an outage it would never finish.
+            complete = self.service.ensure_stat_crawl(wait=True, timeout=timeout)
+            count = self.service.export_snapshot(path)
+            click.echo(f"{count} Pokémon -> {path}")
+            if not complete:
+                click.echo("Warning: the stat crawl did not finish; the snapshot is partial.", err=True)
+
+        @group.command("rewarm")
+        def rewarm_command() -> None:
+            """Fetch every regional Pokédex and the type chart again."""
+            click.echo(json.dumps(self.service.warm_up(refresh=True), indent=2))
+
+        return group
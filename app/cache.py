@@ -0,0 +1,512 @@
+from __future__ import annotations
+
+import json
+import logging
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import Counter, OrderedDict
+from typing import Dict, Iterable, Iterator, List, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from .exceptions import CacheError
+
+
+logger = logging.getLogger(__name__)
+
+
+def serialize(value: dict) -> bytes:
+    return zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+
+
+def deserialize(blob: bytes) -> dict:
+    return json.loads(zlib.decompress(blob))
+
+
+def encoded_size(value: dict) -> int:
+    """Length of ``value`` as compact JSON; ASCII-only, so characters are bytes."""
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+class CacheStats:
+    """Hit/miss counters per namespace (``pokemon``, ``type``...) and per key."""
+
+    MAX_TRACKED_KEYS = 4096
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hits: Counter = Counter()
+        self._misses: Counter = Counter()
+        self._key_hits: Counter = Counter()
+
+    def record(self, key: str, hit: bool) -> None:
+        namespace = key.split("/", 1)[0]
+        with self._lock:
+            if hit:
+                self._hits[namespace] += 1
+                self._key_hits[key] += 1
+                if len(self._key_hits) > self.MAX_TRACKED_KEYS:
+                    # Keep the hot keys and forget the long tail.
+                    hottest = self._key_hits.most_common(self.MAX_TRACKED_KEYS // 4)
+                    self._key_hits = Counter(dict(hottest))
+            else:
+                self._misses[namespace] += 1
+
+    def snapshot(self, top: int = 10) -> dict:
+        with self._lock:
+            namespaces = {}
+            for namespace in sorted(set(self._hits) | set(self._misses)):
+                hits, misses = self._hits[namespace], self._misses[namespace]
+                namespaces[namespace] = {
+                    "hits": hits,
+                    "misses": misses,
+                    "hit_rate": round(hits / (hits + misses), 4),
+                }
+            hottest = [{"key": key, "hits": hits} for key, hits in self._key_hits.most_common(top)]
+        return {"namespaces": namespaces, "hottest": hottest}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._hits.clear()
+            self._misses.clear()
+            self._key_hits.clear()
+
+
+class CacheBackend(ABC):
+    """Key/value store for PokéAPI payloads shared by the client."""
+
+    #: True when every worker process sees the same entries.
+    shared = False
+
+    @abstractmethod
+    def get(self, key: str) -> dict | None:
+        ...
+
+    @abstractmethod
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def delete_prefix(self, prefix: str) -> int:
+        """Remove every key starting with ``prefix`` and return how many were removed."""
+
+    @abstractmethod
+    def size(self) -> Dict[str, int]:
+        """Number of live entries and the bytes they take in the backend (JSON size in memory)."""
+
+    def count(self, keys: Iterable[str]) -> int:
+        """How many of ``keys`` hold a live entry, ideally without decoding them."""
+        return len(self.get_many(keys))
+
+    def remaining_ttl(self, keys: Iterable[str]) -> float | None:
+        """Seconds until the first of ``keys`` expires, or None if any of them is missing."""
+        return None
+
+    def after_fork(self) -> None:
+        """Forget connections inherited from the parent process."""
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        found: Dict[str, dict] = {}
+        for key in keys:
+            value = self.get(key)
+            if value is not None:
+                found[key] = value
+        return found
+
+    def set_many(self, items: Dict[str, dict], ttl: float) -> None:
+        for key, value in items.items():
+            self.set(key, value, ttl)
+
+
+class MemoryCache(CacheBackend):
+    """Per-process LRU cache with expiry; values are kept as Python objects.
+
+    Evicts by entry count and by ``max_bytes`` of JSON: a single ``pokemon/*``
+    payload can take hundreds of kilobytes, so the count alone bounds nothing.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries: int = 4096, max_bytes: int | None = DEFAULT_MAX_BYTES) -> None:
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        # key -> (expires at, value, JSON size measured when it was stored)
+        self._entries: "OrderedDict[str, Tuple[float, dict, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> dict | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] < time.monotonic():
+                self._discard(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, dict], ttl: float) -> None:
+        with self._lock:
+            # Re-storing the same object (stale refreshes, aliases) reuses the known size.
+            sizes = {
+                id(entry[1]): entry[2]
+                for entry in map(self._entries.get, items)
+                if entry is not None
+            }
+        for value in items.values():
+            if id(value) not in sizes:
+                sizes[id(value)] = encoded_size(value)
+
+        expires = time.monotonic() + ttl
+        with self._lock:
+            for key, value in items.items():
+                self._discard(key)
+                self._entries[key] = (expires, value, sizes[id(value)])
+                self._bytes += sizes[id(value)]
+            while len(self._entries) > self.max_entries or (
+                self.max_bytes is not None and self._bytes > self.max_bytes and self._entries
+            ):
+                self._discard(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._discard(key)
+
+    def count(self, keys: Iterable[str]) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(
+                1 for key in keys if key in self._entries and self._entries[key][0] >= now
+            )
+
+    def remaining_ttl(self, keys: Iterable[str]) -> float | None:
+        now = time.monotonic()
+        with self._lock:
+            entries = [self._entries.get(key) for key in keys]
+        if not entries or None in entries:
+            return None
+        remaining = min(entry[0] for entry in entries) - now
+        return remaining if remaining > 0 else None
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def delete_prefix(self, prefix: str) -> int:
+        with self._lock:
+            keys = [key for key in self._entries if key.startswith(prefix)]
+            for key in keys:
+                self._discard(key)
+        return len(keys)
+
+    def size(self) -> Dict[str, int]:
+        with self._lock:
+            return {"entries": len(self._entries), "bytes": self._bytes}
+
+    def _discard(self, key: str) -> None:
+        # Callers hold the lock.
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCache(CacheBackend):
+    """Cache stored in a SQLite file, shared by every worker on the same host."""
+
+    shared = True
+    #: Seconds between purges of expired rows; reads already skip them.
+    PURGE_INTERVAL = 60.0
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._local = threading.local()
+        self._purged_at = 0.0
+        connection = self._connection()
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS cache_expires_at ON cache (expires_at)")
+
+    def _connection(self) -> sqlite3.Connection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def get(self, key: str) -> dict | None:
+        return self.get_many([key]).get(key)
+
+    def count(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        placeholders = ",".join("?" for _ in keys)
+        (count,) = self._connection().execute(
+            f"SELECT COUNT(*) FROM cache WHERE key IN ({placeholders}) AND expires_at >= ?",
+            (*keys, time.time()),
+        ).fetchone()
+        return count
+
+    def remaining_ttl(self, keys: Iterable[str]) -> float | None:
+        keys = set(keys)
+        if not keys:
+            return None
+        now = time.time()
+        placeholders = ",".join("?" for _ in keys)
+        count, expires_at = self._connection().execute(
+            f"SELECT COUNT(*), MIN(expires_at) FROM cache WHERE key IN ({placeholders}) AND expires_at >= ?",
+            (*keys, now),
+        ).fetchone()
+        return expires_at - now if count == len(keys) else None
+
+    def after_fork(self) -> None:
+        # SQLite connections must not cross fork(); every worker opens its own.
+        self._local = threading.local()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        placeholders = ",".join("?" for _ in keys)
+        rows = self._connection().execute(
+            f"SELECT key, value FROM cache WHERE key IN ({placeholders}) AND expires_at >= ?",
+            (*keys, time.time()),
+        )
+        return {key: deserialize(blob) for key, blob in rows}
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, dict], ttl: float) -> None:
+        expires_at = time.time() + ttl
+        rows = [(key, serialize(value), expires_at) for key, value in items.items()]
+        connection = self._connection()
+        with connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)", rows
+            )
+            if time.monotonic() - self._purged_at >= self.PURGE_INTERVAL:
+                self._purged_at = time.monotonic()
+                connection.execute("DELETE FROM cache WHERE expires_at < ?", (time.time(),))
+
+    def delete(self, key: str) -> None:
+        self._connection().execute("DELETE FROM cache WHERE key = ?", (key,))
+
+    def clear(self) -> None:
+        self._connection().execute("DELETE FROM cache")
+
+    def delete_prefix(self, prefix: str) -> int:
+        cursor = self._connection().execute(
+            "DELETE FROM cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+        )
+        return cursor.rowcount
+
+    def size(self) -> Dict[str, int]:
+        entries, size = self._connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(LENGTH(value)), 0) FROM cache WHERE expires_at >= ?",
+            (time.time(),),
+        ).fetchone()
+        return {"entries": entries, "bytes": size}
+
+
+class RedisCache(CacheBackend):
+    """Cache speaking the Redis protocol (RESP) directly over a socket."""
+
+    shared = True
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        db: int = 0,
+        prefix: str = "pokedex:",
+        socket_timeout: float = 2.0,
+    ) -> None:
+        self.host = host
+        self.port = port
+        self.db = db
+        self.prefix = prefix
+        self.socket_timeout = socket_timeout
+        self._local = threading.local()
+
+    def get(self, key: str) -> dict | None:
+        return self.get_many([key]).get(key)
+
+    def count(self, keys: Iterable[str]) -> int:
+        keys = list(keys)
+        if not keys:
+            return 0
+        replies = self._execute_safely([("EXISTS", *(self.prefix + key for key in keys))])
+        return replies[0] if replies else 0
+
+    def remaining_ttl(self, keys: Iterable[str]) -> float | None:
+        keys = list(keys)
+        if not keys:
+            return None
+        replies = self._execute_safely([("PTTL", self.prefix + key) for key in keys])
+        # PTTL answers -2 for a missing key and -1 for one that never expires.
+        if not replies or min(replies) < 0:
+            return None
+        return min(replies) / 1000
+
+    def after_fork(self) -> None:
+        # The socket is shared with the parent; leave it open for the parent and reconnect.
+        self._local = threading.local()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, dict]:
+        keys = list(keys)
+        if not keys:
+            return {}
+        replies = self._execute_safely([("MGET", *(self.prefix + key for key in keys))])
+        if replies is None:
+            return {}
+        return {key: deserialize(blob) for key, blob in zip(keys, replies[0]) if blob is not None}
+
+    def set(self, key: str, value: dict, ttl: float) -> None:
+        self.set_many({key: value}, ttl)
+
+    def set_many(self, items: Dict[str, dict], ttl: float) -> None:
+        milliseconds = str(max(1, int(ttl * 1000)))
+        commands = [
+            ("SET", self.prefix + key, serialize(value), "PX", milliseconds)
+            for key, value in items.items()
+        ]
+        if commands:
+            self._execute_safely(commands)
+
+    def delete(self, key: str) -> None:
+        self._execute_safely([("DEL", self.prefix + key)])
+
+    def clear(self) -> None:
+        self.delete_prefix("")
+
+    def delete_prefix(self, prefix: str) -> int:
+        removed = 0
+        for keys in self._scan(prefix):
+            replies = self._execute_safely([("DEL", *keys)])
+            removed += replies[0] if replies else 0
+        return removed
+
+    def size(self) -> Dict[str, int]:
+        entries = size = 0
+        for keys in self._scan(""):
+            replies = self._execute_safely([("STRLEN", key) for key in keys])
+            if replies is not None:
+                entries += len(keys)
+                size += sum(replies)
+        return {"entries": entries, "bytes": size}
+
+    def _scan(self, prefix: str) -> Iterator[list]:
+        # Glob characters in the prefix are escaped so it matches literally.
+        pattern = "".join("\\" + char if char in "*?[]\\" else char for char in self.prefix + prefix)
+        cursor = "0"
+        while True:
+            replies = self._execute_safely([("SCAN", cursor, "MATCH", pattern + "*", "COUNT", "500")])
+            if replies is None:
+                return
+            cursor, keys = replies[0]
+            if keys:
+                yield keys
+            if cursor in (b"0", "0"):
+                return
+
+    def _execute_safely(self, commands: List[tuple]) -> list | None:
+        # A cache outage must never take the Pokédex down: treat it as a miss.
+        try:
+            return self._execute(commands)
+        except (OSError, CacheError) as exc:
+            logger.warning("Redis cache unavailable: %s", exc)
+            self._disconnect()
+            return None
+
+    def _execute(self, commands: List[tuple]) -> list:
+        sock, reader = self._connection()
+        sock.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read_reply(reader) for _ in commands]
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            sock = socket.create_connection((self.host, self.port), timeout=self.socket_timeout)
+            connection = (sock, sock.makefile("rb"))
+            self._local.connection = connection
+            if self.db:
+                self._execute([("SELECT", str(self.db))])
+        return connection
+
+    def _disconnect(self) -> None:
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            try:
+                connection[1].close()
+                connection[0].close()
+            except OSError:
+                pass
+
+    @staticmethod
+    def _encode(command: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for argument in command:
+            data = argument if isinstance(argument, bytes) else str(argument).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def _read_reply(self, reader):
+        line = reader.readline()
+        if not line:
+            raise ConnectionError("Redis closed the connection")
+        kind, body = line[:1], line[1:-2]
+        if kind == b"+":
+            return body.decode("utf-8")
+        if kind == b"-":
+            raise CacheError(body.decode("utf-8"))
+        if kind == b":":
+            return int(body)
+        if kind == b"$":
+            length = int(body)
+            return None if length < 0 else reader.read(length + 2)[:-2]
+        if kind == b"*":
+            length = int(body)
+            return None if length < 0 else [self._read_reply(reader) for _ in range(length)]
+        raise CacheError(f"Unexpected Redis reply: {line!r}")
+
+
+def create_cache(url: str | None = None) -> CacheBackend:
+    """Build a backend from a URL such as memory://, sqlite:///path or redis://host:port/0."""
+    parsed = urlparse(url or "memory://")
+    if parsed.scheme == "memory":
+        # memory://?max_mb=64 caps the JSON size of the cached payloads.
+        max_mb = parse_qs(parsed.query).get("max_mb")
+        if max_mb:
+            return MemoryCache(max_bytes=int(float(max_mb[0]) * 1024 * 1024))
+        return MemoryCache()
+    if parsed.scheme == "sqlite":
+        return SQLiteCache(parsed.path if parsed.netloc == "" else parsed.netloc + parsed.path)
+    if parsed.scheme == "redis":
+        db = int(parsed.path.strip("/") or 0)
+        return RedisCache(host=parsed.hostname or "localhost", port=parsed.port or 6379, db=db)
+    raise ValueError(f"Unsupported cache URL: {url}")
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Callable
+from urllib.parse import quote, urlsplit
+
+
+class CassetteResponse:
+    """The subset of ``requests.Response`` that ``PokeAPIClient`` reads."""
+
+    def __init__(self, status_code: int, body: bytes) -> None:
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self._body = body
+
+    def json(self) -> dict:
+        return json.loads(self._body)
+
+
+class CassetteSession:
+    """Session for ``PokeAPIClient`` that records PokéAPI responses or replays them offline.
+
+    ``record`` forwards every request to a real ``requests.Session`` and writes
+    the status and body to ``<directory>/<namespace>/<rest>.json.gz``.
+    ``replay`` answers from those files only, waiting ``latency`` seconds
+    first, and fails like a dropped connection when a response was never
+    recorded.
+    """
+
+    RECORD = "record"
+    REPLAY = "replay"
+    SUFFIX = ".json.gz"
+
+    def __init__(
+        self,
+        directory: str | Path,
+        mode: str = REPLAY,
+        latency: float = 0.0,
+        session=None,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if mode not in (self.RECORD, self.REPLAY):
+            raise ValueError(f"Unknown cassette mode: {mode}")
+        self.directory = Path(directory)
+        self.mode = mode
+        self.latency = latency
+        self.sleep = sleep
+        self._session = session
+        self._lock = threading.Lock()
+        self.recorded = 0
+        self.replayed = 0
+
+    def get(self, url: str, timeout: float | None = None):
+        path = self.path_for(url)
+        if self.mode == self.RECORD:
+            return self._record(url, path, timeout)
+        return self._replay(url, path, timeout)
+
+    def path_for(self, url: str) -> Path:
+        endpoint = urlsplit(url).path.split("/api/v2/", 1)[-1].strip("/")
+        namespace, _, rest = endpoint.partition("/")
+        return self.directory / quote(namespace, safe="") / f"{quote(rest, safe='')}{self.SUFFIX}"
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.directory.glob(f"*/*{self.SUFFIX}"))
+
+    def _record(self, url: str, path: Path, timeout: float | None):
+        if self._session is None:
+            import requests
+
+            self._session = requests.Session()
+        response = self._session.get(url, timeout=timeout)
+        # Server errors are transient; keeping them would replay an outage forever.
+        if response.status_code < 500:
+            document = {"url": url, "status": response.status_code, "body": response.text}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            partial = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+            partial.write_bytes(gzip.compress(json.dumps(document).encode("utf-8")))
+            partial.replace(path)
+            with self._lock:
+                self.recorded += 1
+        return response
+
+    def _replay(self, url: str, path: Path, timeout: float | None) -> CassetteResponse:
+        import requests
+
+        if self.latency > 0:
+            if timeout is not None and self.latency >= timeout:
+                self.sleep(timeout)
+                raise requests.Timeout(f"Simulated latency exceeded the timeout for {url}")
+            self.sleep(self.latency)
+        try:
+            document = json.loads(gzip.decompress(path.read_bytes()))
+        except FileNotFoundError as exc:
+            raise requests.ConnectionError(f"No recorded response for {url}") from exc
+        with self._lock:
+            self.replayed += 1
+        return CassetteResponse(document["status"], document["body"].encode("utf-8"))
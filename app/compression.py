@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import click
+from flask import Flask, Response, request, send_from_directory
+from werkzeug.security import safe_join
+
+try:  # Brotli is optional; without it only gzip is negotiated.
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    brotli = None
+
+
+class ResponseCompressor:
+    """Negotiates gzip/brotli encoding for API responses and static assets."""
+
+    COMPRESSIBLE_MIMETYPES = (
+        "application/json",
+        "application/javascript",
+        "text/javascript",
+        "text/css",
+        "text/html",
+        "image/svg+xml",
+    )
+    STATIC_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+    PRECOMPRESS_EXTENSIONS = (".js", ".css", ".html", ".svg", ".json")
+
+    def __init__(self, min_size: int = 500, cache_size: int = 256, gzip_level: int = 6) -> None:
+        self.min_size = min_size
+        self.cache_size = cache_size
+        self.gzip_level = gzip_level
+        self._cache: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._app: Flask | None = None
+
+    def register(self, app: Flask) -> None:
+        self._app = app
+        app.after_request(self.compress_response)
+        if "static" in app.view_functions:
+            app.view_functions["static"] = self.send_static
+        app.cli.command("precompress-assets")(self._precompress_command)
+
+    def available_encodings(self) -> List[str]:
+        return ["br", "gzip"] if brotli is not None else ["gzip"]
+
+    def negotiate(self) -> str | None:
+        accepted = request.accept_encodings
+        for encoding in self.available_encodings():
+            if accepted.quality(encoding) > 0:
+                return encoding
+        return None
+
+    def compress_response(self, response: Response) -> Response:
+        if (
+            response.direct_passthrough
+            or response.is_streamed
+            or response.status_code < 200
+            or response.status_code in (204, 304)
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in self.COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        response.vary.add("Accept-Encoding")
+        body = response.get_data()
+        if len(body) < self.min_size:
+            return response
+
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        etag, weak = response.get_etag()
+        cache_key = (etag or hashlib.blake2b(body, digest_size=16).hexdigest(), encoding)
+        with self._cache_lock:
+            compressed = self._cache.get(cache_key)
+            if compressed is not None:
+                self._cache.move_to_end(cache_key)
+        if compressed is None:
+            # Compressed outside the lock; two threads may race on a miss, which is harmless.
+            compressed = self.compress(body, encoding)
+            self._remember(cache_key, compressed)
+
+        response.set_data(compressed)
+        response.headers["Content-Encoding"] = encoding
+        if etag and not weak:
+            # The encoded body is no longer byte-identical, but a weak ETag still
+            # validates because If-None-Match uses weak comparison.
+            response.set_etag(etag, weak=True)
+        return response
+
+    def compress(self, body: bytes, encoding: str, *, level: int | None = None) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=level if level is not None else 5)
+        return gzip.compress(body, compresslevel=level or self.gzip_level, mtime=0)
+
+    def send_static(self, filename: str) -> Response:
+        app = self._app
+        encoding = self.negotiate()
+        if encoding is not None:
+            variant = filename + self.STATIC_SUFFIXES[encoding]
+            path = safe_join(app.static_folder, variant)
+            if path is not None and Path(path).is_file():
+                mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+                response = send_from_directory(app.static_folder, variant, mimetype=mimetype)
+                response.headers["Content-Encoding"] = encoding
+                response.vary.add("Accept-Encoding")
+                return response
+        response = app.send_static_file(filename)
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def precompress_directory(self, directory: str | Path) -> Dict[str, List[str]]:
+        written: Dict[str, List[str]] = {}
+        for path in sorted(Path(directory).rglob("*")):
+            if not path.is_file() or path.suffix not in self.PRECOMPRESS_EXTENSIONS:
+                continue
+            data = path.read_bytes()
+            outputs: List[str] = []
+            for encoding in self.available_encodings():
+                level = 11 if encoding == "br" else 9
+                target = path.with_name(path.name + self.STATIC_SUFFIXES[encoding])
+                target.write_bytes(self.compress(data, encoding, level=level))
+                outputs.append(target.name)
+            written[str(path)] = outputs
+        return written
+
+    def _precompress_command(self) -> None:
+        """Write .br/.gz variants of the static assets."""
+        written = self.precompress_directory(self._app.static_folder)
+        for source, outputs in written.items():
+            click.echo(f"{source} -> {', '.join(outputs)}")
+
+    def _remember(self, key: Tuple[str, str], value: bytes) -> None:
+        with self._cache_lock:
+            self._cache[key] = value
+            self._cache.move_to_end(key)
+            if len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
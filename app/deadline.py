@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar, Token, copy_context
+from typing import Callable, Iterator, TypeVar
+
+T = TypeVar("T")
+
+# Monotonic timestamp by which the current request must be answered, if any.
+_deadline: ContextVar[float | None] = ContextVar("pokedex_deadline", default=None)
+
+
+def start(budget: float) -> Token:
+    """Set a deadline ``budget`` seconds from now, keeping an earlier one if already set."""
+    deadline = time.monotonic() + budget
+    current = _deadline.get()
+    if current is not None:
+        deadline = min(deadline, current)
+    return _deadline.set(deadline)
+
+
+def reset(token: Token) -> None:
+    _deadline.reset(token)
+
+
+@contextmanager
+def deadline(budget: float) -> Iterator[None]:
+    token = start(budget)
+    try:
+        yield
+    finally:
+        reset(token)
+
+
+def remaining() -> float | None:
+    """Seconds left before the deadline (may be negative), or None without a deadline."""
+    current = _deadline.get()
+    if current is None:
+        return None
+    return current - time.monotonic()
+
+
+def propagate(function: Callable[..., T]) -> Callable[..., T]:
+    """Wrap ``function`` so thread-pool workers run it under the caller's deadline.
+
+    Worker threads do not inherit context variables; every call gets its own
+    copy of the submitting context because one context cannot be entered twice.
+    """
+    context = copy_context()
+
+    def run(*args, **kwargs) -> T:
+        return context.copy().run(function, *args, **kwargs)
+
+    return run
@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from typing import List
+
+# Cache keys answered from the stale copy during the current request. The list
+# is shared with pool workers, whose copied contexts point at the same object.
+_stale_keys: ContextVar[List[str] | None] = ContextVar("pokedex_stale_keys", default=None)
+
+
+def begin() -> Token:
+    return _stale_keys.set([])
+
+
+def end(token: Token) -> None:
+    _stale_keys.reset(token)
+
+
+def mark_stale(key: str) -> None:
+    keys = _stale_keys.get()
+    if keys is not None:
+        keys.append(key)
+
+
+def stale_keys() -> List[str]:
+    return list(_stale_keys.get() or ())
@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import threading
+from typing import Dict
+
+from .models import EvolutionChain
+
+
+class EvolutionIndex:
+    """Maps every species (by id and by name) to the evolution chain it belongs to.
+
+    A chain is registered once for all of its members, so after the first
+    lookup the rest of the family resolves without any PokéAPI call.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._chains: Dict[str, EvolutionChain] = {}
+        self.chain_count = 0
+
+    def __len__(self) -> int:
+        return self.chain_count
+
+    def get(self, identifier: str | int) -> EvolutionChain | None:
+        return self._chains.get(self._key(identifier))
+
+    def add(self, chain: EvolutionChain) -> None:
+        with self._lock:
+            for member in chain.members:
+                self._chains[self._key(member.identifier)] = chain
+                self._chains[self._key(member.name)] = chain
+            self.chain_count += 1
+
+    @staticmethod
+    def _key(identifier: str | int) -> str:
+        return str(identifier).strip().lower().replace(" ", "-")
@@ -4,3 +4,15 @@ class PokemonNotFoundError(Exception):
 
 class PokeAPIError(Exception):
     """Raised when the PokéAPI returns an unexpected error."""
+
+
+class CacheError(Exception):
+    """Raised when a shared cache backend replies with an error."""
+
+
+class DeadlineExceededError(PokeAPIError):
+    """Raised when a request has used up its time budget before PokéAPI answered."""
+
+
+class UpstreamUnavailableError(PokeAPIError):
+    """Raised without calling PokéAPI while the circuit breaker is open."""
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import typing as t
+
+from flask import Flask, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:  # orjson is optional; the standard library serializer is the fallback.
+    import orjson
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask JSON provider backed by orjson that also serializes domain models."""
+
+    sort_keys = False
+
+    def __init__(self, app: Flask, *, use_orjson: bool = True) -> None:
+        super().__init__(app)
+        self.use_orjson = use_orjson and orjson is not None
+
+    @staticmethod
+    def default(o: t.Any) -> t.Any:
+        # Models expose their wire format through to_dict(); routes can hand them over as-is.
+        to_dict = getattr(o, "to_dict", None)
+        if callable(to_dict):
+            return to_dict()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj: t.Any, **kwargs: t.Any) -> str:
+        if not self.use_orjson or kwargs:
+            return super().dumps(obj, **kwargs)
+        return self._dumps_bytes(obj).decode("utf-8")
+
+    def loads(self, s: str | bytes, **kwargs: t.Any) -> t.Any:
+        if not self.use_orjson or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args: t.Any, **kwargs: t.Any) -> Response:
+        if not self.use_orjson or (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumps_bytes(obj) + b"\n", mimetype=self.mimetype)
+
+    def _dumps_bytes(self, obj: t.Any) -> bytes:
+        # Native dataclass output would use attribute names (identifier, not id) and
+        # miss computed fields, so models keep going through to_dict() in default().
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
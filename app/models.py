@@ -1,11 +1,20 @@
 from dataclasses import dataclass
-from typing import List
+from typing import Iterator, List
+
+# Languages the Pokédex answers in, default first. The snapshot format stores one
+# description per entry, so changing this tuple means writing snapshots again.
+LANGUAGES = ("es", "en", "fr", "de", "it", "ja", "ko")
 
 
 def _title_case(text: str) -> str:
     return text.replace('-', ' ').title()
 
 
+def _image_url(sprites: dict) -> str:
+    official_artwork = sprites.get("other", {}).get("official-artwork", {}).get("front_default")
+    return official_artwork or sprites.get("front_default") or ""
+
+
 @dataclass
 class PokemonStat:
     name: str
@@ -37,10 +46,7 @@ class Pokemon:
         types = [_title_case(entry["type"]["name"]) for entry in data.get("types", [])]
         abilities = [_title_case(entry["ability"]["name"]) for entry in data.get("abilities", [])]
         stats = [PokemonStat.from_api(entry) for entry in data.get("stats", [])]
-        sprites = data.get("sprites", {})
-        official_artwork = sprites.get("other", {}).get("official-artwork", {}).get("front_default")
-        default_sprite = sprites.get("front_default")
-        image_url = official_artwork or default_sprite or ""
+        image_url = _image_url(data.get("sprites", {}))
         height_m = round((data.get("height", 0) or 0) / 10, 2)
         weight_kg = round((data.get("weight", 0) or 0) / 10, 2)
 
@@ -79,6 +85,9 @@ class Pokemon:
 class PokemonSummary:
     identifier: int
     name: str
+    types: List[str] | None = None
+    total_stats: int | None = None
+    image_url: str | None = None
 
     @classmethod
     def from_url(cls, name: str, url: str) -> "PokemonSummary":
@@ -90,5 +99,81 @@ class PokemonSummary:
                 identifier = 0
         return cls(identifier=identifier, name=_title_case(name))
 
+    @classmethod
+    def from_api(cls, data: dict) -> "PokemonSummary":
+        return cls(
+            identifier=data.get("id", 0),
+            name=_title_case(data.get("name", "")),
+            types=[_title_case(entry["type"]["name"]) for entry in data.get("types", [])],
+            total_stats=sum(entry.get("base_stat", 0) for entry in data.get("stats", [])),
+            image_url=_image_url(data.get("sprites", {})),
+        )
+
+    @property
+    def is_hydrated(self) -> bool:
+        return self.types is not None
+
+    def to_dict(self) -> dict:
+        payload = {"id": self.identifier, "name": self.name}
+        if self.is_hydrated:
+            payload["types"] = self.types
+            payload["total_stats"] = self.total_stats
+            payload["image_url"] = self.image_url
+        return payload
+
+
+@dataclass
+class EvolutionStage:
+    species: PokemonSummary
+    trigger: str | None
+    min_level: int | None
+    item: str | None
+    evolves_to: List["EvolutionStage"]
+
+    @classmethod
+    def from_api(cls, data: dict) -> "EvolutionStage":
+        species = data.get("species", {})
+        details = (data.get("evolution_details") or [{}])[0]
+        item = details.get("item") or {}
+        return cls(
+            species=PokemonSummary.from_url(species.get("name", ""), species.get("url", "")),
+            trigger=_title_case(details.get("trigger", {}).get("name", "")) or None,
+            min_level=details.get("min_level"),
+            item=_title_case(item.get("name", "")) or None,
+            evolves_to=[cls.from_api(child) for child in data.get("evolves_to", [])],
+        )
+
+    def walk(self) -> Iterator["EvolutionStage"]:
+        yield self
+        for child in self.evolves_to:
+            yield from child.walk()
+
+    def to_dict(self) -> dict:
+        return {
+            **self.species.to_dict(),
+            "trigger": self.trigger,
+            "min_level": self.min_level,
+            "item": self.item,
+            "evolves_to": [child.to_dict() for child in self.evolves_to],
+        }
+
+
+@dataclass
+class EvolutionChain:
+    identifier: int
+    root: EvolutionStage
+
+    @classmethod
+    def from_api(cls, data: dict) -> "EvolutionChain":
+        return cls(identifier=data.get("id", 0), root=EvolutionStage.from_api(data.get("chain", {})))
+
+    @property
+    def members(self) -> List[PokemonSummary]:
+        return [stage.species for stage in self.root.walk()]
+
     def to_dict(self) -> dict:
-        return {"id": self.identifier, "name": self.name}
+        return {
+            "id": self.identifier,
+            "species": [member.to_dict() for member in self.members],
+            "chain": self.root.to_dict(),
+        }
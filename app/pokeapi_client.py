@@ -1,8 +1,23 @@
 from __future__ import annotations
 
-import requests
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Callable, Deque, Dict, Iterable, List
 
-from .exceptions import PokeAPIError, PokemonNotFoundError
+from . import deadline, degraded, upstream_calls
+from .cache import CacheBackend, CacheStats, MemoryCache
+from .circuit_breaker import CircuitBreaker
+from .exceptions import (
+    DeadlineExceededError,
+    PokeAPIError,
+    PokemonNotFoundError,
+    UpstreamUnavailableError,
+)
+
+if TYPE_CHECKING:
+    import requests
 
 
 class PokeAPIClient:
@@ -10,19 +25,272 @@ class PokeAPIClient:
 
     BASE_URL = "https://pokeapi.co/api/v2"
     MAX_POKEMON_ID = 1010
+    LATENCY_WINDOW = 200
+    HEDGE_MIN_SAMPLES = 20
+    DEADLINE_MESSAGE = "La PokéAPI está tardando demasiado. Inténtalo de nuevo en un momento."
+    STALE_ENTRIES = 2048
+    STALE_BYTES = 32 * 1024 * 1024
 
-    def __init__(self, session: requests.Session | None = None, timeout: int = 10) -> None:
-        self.session = session or requests.Session()
+    def __init__(
+        self,
+        session: requests.Session | None = None,
+        timeout: int = 10,
+        cache: CacheBackend | None = None,
+        cache_ttl: float = 3600,
+        hedge: bool = False,
+        breaker: CircuitBreaker | None = None,
+        stale_ttl: float = 24 * 3600,
+        stale_cache: CacheBackend | None = None,
+    ) -> None:
+        self._session = session
         self.timeout = timeout
+        self.cache = cache if cache is not None else MemoryCache()
+        self.cache_ttl = cache_ttl
+        self.stats = CacheStats()
+        self.hedge = hedge
+        self.breaker = breaker if breaker is not None else CircuitBreaker()
+        self.stale_ttl = stale_ttl
+        # Last good copies for outages. Kept apart from the main cache, in process
+        # memory, so they neither use its capacity nor double its writes, and
+        # survive its evictions. With an in-memory main cache the entries are the
+        # same objects; with a shared backend each worker holds its own decoded copy.
+        self.stale_cache = (
+            stale_cache
+            if stale_cache is not None
+            else MemoryCache(self.STALE_ENTRIES, max_bytes=self.STALE_BYTES)
+        )
+        self.hedged_requests = 0
+        self._latencies: Deque[float] = deque(maxlen=self.LATENCY_WINDOW)
+        self._latency_lock = threading.Lock()
+        # Guards the lazily created HTTP session and hedge pool only.
+        self._connection_lock = threading.Lock()
+        self._hedge_executor: ThreadPoolExecutor | None = None
+
+    def after_fork(self) -> None:
+        """Give a forked worker its own HTTP connections, hedge pool and cache connections."""
+        self._session = None
+        self._hedge_executor = None
+        self.cache.after_fork()
+
+    @property
+    def session(self) -> requests.Session:
+        # requests is imported on the first cache miss; it is the costliest import at startup.
+        if self._session is None:
+            with self._connection_lock:
+                if self._session is None:
+                    import requests
+
+                    self._session = requests.Session()
+        return self._session
+
+    @session.setter
+    def session(self, session: requests.Session) -> None:
+        self._session = session
+
+    def refresh(self, endpoint: str) -> dict:
+        """Fetch ``endpoint`` from PokéAPI even if it is cached, and store the new copy.
+
+        The cached copy is only replaced once the new one arrives, so a failed
+        refresh leaves it in place.
+        """
+        key = endpoint.strip("/")
+        payload = self._fetch(key)
+        self._store({key: payload})
+        return payload
+
+    def cached(self, endpoint: str) -> dict | None:
+        return self.cache.get(endpoint.strip("/"))
+
+    def get_cached_pokemon(self, identifiers: Iterable[int]) -> Dict[int, dict]:
+        keys = {f"pokemon/{identifier}": identifier for identifier in identifiers}
+        found = self.cache.get_many(keys)
+        # Misses fall through to _get(), which records them.
+        for key in found:
+            self.stats.record(key, hit=True)
+        return {keys[key]: payload for key, payload in found.items()}
+
+    def upstream_available(self) -> bool:
+        return self.breaker.state == CircuitBreaker.CLOSED
+
+    def cache_report(self, top: int = 10) -> dict:
+        return {
+            "backend": type(self.cache).__name__,
+            "shared": self.cache.shared,
+            **self.cache.size(),
+            "stale_entries": len(self.stale_cache),
+            **self.stats.snapshot(top),
+        }
+
+    def invalidate_pokemon(self, identifier: str | int) -> List[str]:
+        """Drop every cached key for one Pokémon (id and name aliases, species included)."""
+        key = str(identifier).strip().lower()
+        names = {key}
+        payload = self.cache.get(f"pokemon/{key}")
+        if payload is not None:
+            names.update(str(payload[field]) for field in ("id", "name") if payload.get(field))
+            names.add(payload.get("species", {}).get("name", ""))
+        keys = sorted(
+            f"{namespace}/{name}" for name in names if name for namespace in ("pokemon", "pokemon-species")
+        )
+        for cache_key in keys:
+            self.cache.delete(cache_key)
+        self.forget_stale(keys)
+        return keys
+
+    def invalidate_namespace(self, namespace: str) -> int:
+        prefix = namespace.strip("/") + "/"
+        self.forget_stale(prefix=prefix)
+        return self.cache.delete_prefix(prefix)
+
+    def forget_stale(self, keys: Iterable[str] = (), prefix: str | None = None) -> None:
+        """Drop this process's last good copies; other workers call it when syncing invalidations."""
+        for key in keys:
+            self.stale_cache.delete(key)
+        if prefix is not None:
+            self.stale_cache.delete_prefix(prefix)
+
+    def _get(
+        self,
+        endpoint: str,
+        alias_keys: Callable[[dict], List[str]] | None = None,
+        store: bool = True,
+    ) -> dict:
+        key = endpoint.strip("/")
+        cached = self.cache.get(key)
+        self.stats.record(key, hit=cached is not None)
+        if cached is not None:
+            if store and self.stale_ttl > 0 and not self.stale_cache.count([key]):
+                # Hits also fill the stale store with entries fetched by other workers,
+                # once: re-storing a decoded copy on every hit means measuring it again.
+                self.stale_cache.set(key, cached, self.stale_ttl)
+            return cached
+        try:
+            payload = self._fetch(key)
+        except PokemonNotFoundError:
+            raise
+        except PokeAPIError:
+            # Degraded mode: the last good copy beats an error page.
+            stale = self.stale_cache.get(key) if self.stale_ttl > 0 else None
+            if stale is None:
+                raise
+            degraded.mark_stale(key)
+            return stale
+        if not store:
+            return payload
+        items = {key: payload}
+        if alias_keys is not None:
+            items.update(dict.fromkeys(alias_keys(payload), payload))
+        self._store(items)
+        return payload
 
-    def _get(self, endpoint: str) -> dict:
+    def _store(self, items: Dict[str, dict]) -> None:
+        if self.cache_ttl > 0:
+            self.cache.set_many(items, self.cache_ttl)
+        if self.stale_ttl > 0:
+            self.stale_cache.set_many(items, self.stale_ttl)
+
+    def latency_p95(self) -> float | None:
+        """95th percentile of recent upstream latencies, once enough samples exist."""
+        with self._latency_lock:
+            samples = sorted(self._latencies)
+        if len(samples) < self.HEDGE_MIN_SAMPLES:
+            return None
+        return samples[int(0.95 * (len(samples) - 1))]
+
+    def _fetch(self, endpoint: str) -> dict:
         url = f"{self.BASE_URL}/{endpoint.lstrip('/')}"
+        # Each call only gets what is left of the request's budget.
+        budget = deadline.remaining()
+        if budget is not None and budget <= 0:
+            raise DeadlineExceededError(self.DEADLINE_MESSAGE)
+        timeout = self.timeout if budget is None else min(self.timeout, budget)
+        if not self.breaker.allow():
+            raise UpstreamUnavailableError(
+                "La PokéAPI no está disponible ahora mismo. Inténtalo de nuevo en un rato."
+            )
+
+        hedge_after = self.latency_p95() if self.hedge else None
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            if hedge_after is None or hedge_after >= timeout:
+                payload = self._request(url, timeout)
+            else:
+                payload = self._hedged_request(url, timeout, hedge_after)
+        except PokemonNotFoundError:
+            # A 404 still proves PokéAPI is up.
+            self.breaker.record_success()
+            raise
+        except DeadlineExceededError:
+            # Running out of this request's own budget says nothing about PokéAPI's health.
+            raise
+        except PokeAPIError:
+            self.breaker.record_failure()
+            raise
+        self.breaker.record_success()
+        return payload
+
+    def _hedged_request(self, url: str, timeout: float, hedge_after: float) -> dict:
+        """Call ``url`` on this thread; past the recent p95, a copy runs in the hedge pool.
+
+        Only the copy uses the pool, so the pool size never limits how many
+        requests run at once and time spent queued for it cannot trigger a
+        hedge. The caller keeps its own answer when it gets one; the copy's
+        answer is used when the first attempt fails.
+        """
+        with self._connection_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="hedge")
+        started = time.monotonic()
+        first_done = threading.Event()
+        request = deadline.propagate(self._request)
+
+        def hedge() -> dict | None:
+            # A copy still queued when the first attempt finishes is cancelled or skipped.
+            if first_done.wait(max(0.0, hedge_after - (time.monotonic() - started))):
+                return None
+            with self._latency_lock:
+                self.hedged_requests += 1
+            return request(url, max(0.001, timeout - (time.monotonic() - started)))
+
+        second = self._hedge_executor.submit(hedge)
+        try:
+            return self._request(url, timeout)
+        except PokemonNotFoundError:
+            raise
+        except PokeAPIError as exc:
+            error = exc
+        finally:
+            first_done.set()
+            second.cancel()
+        if second.cancelled():
+            raise error
+        try:
+            payload = second.result()
+        except PokemonNotFoundError:
+            raise
+        except PokeAPIError:
+            raise error
+        if payload is None:
+            raise error
+        return payload
+
+    def _request(self, url: str, timeout: float) -> dict:
+        import requests
+
+        upstream_calls.record(url)
+        started = time.monotonic()
+        try:
+            response = self.session.get(url, timeout=timeout)
         except requests.RequestException as exc:
+            budget = deadline.remaining()
+            # A timeout shortened to fit the request's budget is the deadline, not PokéAPI.
+            cut_short = isinstance(exc, requests.Timeout) and timeout < self.timeout
+            if budget is not None and (budget <= 0 or cut_short):
+                raise DeadlineExceededError(self.DEADLINE_MESSAGE) from exc
             raise PokeAPIError(
                 "No pudimos conectar con la PokéAPI. ¿Hay internet en tu Pokédex?"
             ) from exc
+        with self._latency_lock:
+            self._latencies.append(time.monotonic() - started)
 
         if response.status_code == 404:
             raise PokemonNotFoundError("¡Oh no! Ese Pokémon no existe todavía.")
@@ -37,14 +305,26 @@ class PokeAPIClient:
         except ValueError as exc:
             raise PokeAPIError("La PokéAPI envió datos que no pudimos entender.") from exc
 
-    def get_pokemon(self, identifier: str | int) -> dict:
-        return self._get(f"pokemon/{identifier}")
+    def get_pokemon(self, identifier: str | int, *, store: bool = True) -> dict:
+        """The ``pokemon/`` payload; with ``store=False`` a miss is fetched but not cached."""
+        # Lookups by name also warm the id key used by batched list hydration.
+        return self._get(f"pokemon/{identifier}", alias_keys=self._pokemon_keys, store=store)
+
+    @staticmethod
+    def _pokemon_keys(payload: dict) -> List[str]:
+        return [f"pokemon/{payload[field]}" for field in ("id", "name") if payload.get(field)]
 
     def get_pokemon_species(self, identifier: str | int) -> dict:
         return self._get(f"pokemon-species/{identifier}")
 
+    def get_evolution_chain(self, chain_id: int) -> dict:
+        return self._get(f"evolution-chain/{chain_id}")
+
     def get_type(self, type_name: str) -> dict:
         return self._get(f"type/{type_name}")
 
-    def get_pokedex(self, pokedex_name: str) -> dict:
-        return self._get(f"pokedex/{pokedex_name}")
+    def get_pokedex(self, pokedex_name: str, *, cached_only: bool = False) -> dict | None:
+        endpoint = f"pokedex/{pokedex_name}"
+        if cached_only:
+            return self.cached(endpoint)
+        return self._get(endpoint)
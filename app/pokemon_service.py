@@ -1,32 +1,214 @@
 from __future__ import annotations
 
+import logging
 import random
-from typing import Dict, List
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from pathlib import Path
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Iterator, List, Tuple
 
-from .exceptions import PokeAPIError, PokemonNotFoundError
-from .models import Pokemon, PokemonSummary
+from . import deadline, degraded
+from .evolutions import EvolutionIndex
+from .exceptions import PokeAPIError, PokemonNotFoundError, UpstreamUnavailableError
+from .models import LANGUAGES, EvolutionChain, Pokemon, PokemonSummary
 from .pokeapi_client import PokeAPIClient
 from .regions import PokemonRegions, RegionInfo
 
+if TYPE_CHECKING:
+    # NumPy-backed modules are imported on first use so create_app() stays cheap.
+    from .snapshot import PokemonSnapshot
+    from .stat_index import StatIndex, StatIndexCrawler
+    from .tournament import Tournament
+    from .type_chart import TypeChart
+
+
+logger = logging.getLogger(__name__)
+
 
 class PokemonService:
     """Domain service that prepares friendly Pokémon data for the UI."""
 
-    def __init__(self, client: PokeAPIClient, rng: random.Random | None = None) -> None:
+    HYDRATION_CONCURRENCY = 8
+    # Shared by every request; its threads keep their cache connections between requests.
+    FETCH_POOL_SIZE = 32
+    MAX_HYDRATED_RESULTS = 60
+    LANGUAGES = LANGUAGES
+    DEFAULT_LANGUAGE = LANGUAGES[0]
+    MYSTERY_DESCRIPTION = "Este Pokémon es todo un misterio. ¡Sigue investigando!"
+    TYPE_CHART_PENDING_NOTICE = (
+        "La tabla de tipos aún se está preparando: por ahora comparamos solo las estadísticas."
+    )
+    LOCAL_RANDOM_ATTEMPTS = 3
+    FLAVOR_INDEX_SIZE = 2048
+    COMPARE_MEMO_SIZE = 512
+    MAX_LEADERBOARD_SIZE = 100
+    MAX_SEARCH_PAGE_SIZE = 100
+    MAX_TOURNAMENT_SIZE = 64
+    MAX_SIMILAR_RESULTS = 50
+    CACHE_NAMESPACES = ("pokemon", "pokemon-species", "type", "pokedex", "evolution-chain")
+    # Shared backends carry an invalidation log so every worker drops its derived state.
+    INVALIDATION_LOG_KEY = "admin/invalidations"
+    INVALIDATION_LOG_SIZE = 100
+    INVALIDATION_LOG_TTL = 7 * 24 * 3600
+    INVALIDATION_POLL_SECONDS = 2.0
+    READINESS_REWARM_INTERVAL = 60.0
+
+    def __init__(
+        self,
+        client: PokeAPIClient,
+        rng: random.Random | None = None,
+        stat_index: StatIndex | None = None,
+        crawl_stats: bool = False,
+        type_chart: TypeChart | None = None,
+        type_chart_path: str | None = None,
+        evolution_index: EvolutionIndex | None = None,
+        snapshot: PokemonSnapshot | None = None,
+        snapshot_path: str | None = None,
+    ) -> None:
         self.client = client
         self.rng = rng or random.Random()
+        self._snapshot = snapshot
+        self.snapshot_path = snapshot_path
+        self._stat_index = stat_index
+        self._preload_lock = threading.Lock()
+        self._preload_thread: threading.Thread | None = None
+        self._preload_thread_lock = threading.Lock()
+        self.crawl_stats = crawl_stats
+        self._crawler: StatIndexCrawler | None = None
+        self._crawler_lock = threading.Lock()
+        self._fetch_executor: ThreadPoolExecutor | None = None
+        self._fetch_executor_lock = threading.Lock()
+        self.type_chart = type_chart
+        self.type_chart_path = type_chart_path
+        self._type_chart_lock = threading.Lock()
+        self.evolution_index = evolution_index if evolution_index is not None else EvolutionIndex()
+        self._type_chart_snapshot_valid = True
+        self._invalidation_epoch = 0
+        self._invalidation_checked = 0.0
+        self._invalidation_lock = threading.Lock()
+        self._rewarm_thread: threading.Thread | None = None
+        self._rewarm_lock = threading.Lock()
+        self._type_chart_thread: threading.Thread | None = None
+        self._warming = False
+        self._warmed_at: float | None = None
+        # Set by the first warm-up that left the cache warm; forked workers inherit it.
+        self._warmed_once = False
+        self._flavor_texts: "OrderedDict[object, Dict[str, str]]" = OrderedDict()
+        self._flavor_lock = threading.Lock()
+        # Comparisons keyed by (lower id, higher id, lang, mode), plus the ids behind names.
+        self._compare_memo: "OrderedDict[Tuple[int, int, str, str], Tuple[float, dict]]"
+        self._compare_memo = OrderedDict()
+        self._compare_ids: Dict[str, int] = {}
+        self._compare_lock = threading.Lock()
+
+    @property
+    def snapshot(self) -> PokemonSnapshot | None:
+        """The binary snapshot at ``snapshot_path``, mapped on first access."""
+        if self._snapshot is None and self.snapshot_path:
+            with self._preload_lock:
+                if self._snapshot is None and Path(self.snapshot_path).exists():
+                    from .snapshot import PokemonSnapshot
+
+                    self._snapshot = PokemonSnapshot(self.snapshot_path)
+        return self._snapshot
+
+    @property
+    def stat_index(self) -> StatIndex:
+        """Columnar stat index, built on first access (from the snapshot when there is one)."""
+        if self._stat_index is None:
+            snapshot = self.snapshot
+            with self._preload_lock:
+                if self._stat_index is None:
+                    from .stat_index import StatIndex
+
+                    self._stat_index = (
+                        StatIndex.from_snapshot(snapshot) if snapshot is not None else StatIndex()
+                    )
+        return self._stat_index
+
+    def preload(self) -> None:
+        """Import the NumPy-backed modules and build the stat index without calling PokéAPI."""
+        from . import tournament, type_chart  # noqa: F401
 
-    def get_pokemon(self, identifier: str | int) -> Pokemon:
-        pokemon_data = self.client.get_pokemon(identifier)
-        species_data = self.client.get_pokemon_species(pokemon_data.get("id"))
-        description = self._extract_description(species_data)
+        _ = self.stat_index
+        with self._type_chart_lock:
+            if self.type_chart is None:
+                self.type_chart = self._type_chart_from_disk()
+        thread = self._preload_thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join()
+
+    def preload_in_background(self) -> None:
+        """Run preload() in a daemon thread so the first request rarely pays for it."""
+        with self._preload_thread_lock:
+            if self._preload_thread is None:
+                self._preload_thread = threading.Thread(
+                    target=self.preload, name="pokedex-preload", daemon=True
+                )
+                self._preload_thread.start()
+
+    def get_pokemon(self, identifier: str | int, lang: str = DEFAULT_LANGUAGE) -> Pokemon:
+        try:
+            pokemon_data = self.client.get_pokemon(identifier)
+        except PokemonNotFoundError:
+            raise
+        except PokeAPIError:
+            pokemon = self.snapshot.get(identifier, lang) if self.snapshot is not None else None
+            if pokemon is None:
+                raise
+            pokemon.description = pokemon.description or self.MYSTERY_DESCRIPTION
+            degraded.mark_stale(f"snapshot/pokemon/{pokemon.identifier}")
+            return pokemon
+        self.stat_index.add(pokemon_data)
+        species_id = pokemon_data.get("id")
+        try:
+            species_data = self.client.get_pokemon_species(species_id)
+        except PokemonNotFoundError:
+            raise
+        except PokeAPIError:
+            # The Pokémon itself is known; a missing description should not hide it.
+            degraded.mark_stale(f"pokemon-species/{species_id}")
+            return Pokemon.from_api(pokemon_data, self.MYSTERY_DESCRIPTION)
+        description = self._describe(species_id, species_data, lang)
         return Pokemon.from_api(pokemon_data, description)
 
-    def get_random_pokemon(self) -> Pokemon:
-        random_id = self.rng.randint(1, self.client.MAX_POKEMON_ID)
-        return self.get_pokemon(random_id)
+    def get_random_pokemon(self, lang: str = DEFAULT_LANGUAGE) -> Pokemon:
+        if self.client.upstream_available():
+            random_id = self.rng.randint(1, self.client.MAX_POKEMON_ID)
+            try:
+                return self.get_pokemon(random_id, lang=lang)
+            except PokemonNotFoundError:
+                raise
+            except PokeAPIError:
+                if not len(self.stat_index):
+                    raise
+        return self._get_local_random_pokemon(lang)
 
-    def get_pokemon_by_type(self, type_name: str, limit: int = 12) -> List[PokemonSummary]:
+    def _get_local_random_pokemon(self, lang: str) -> Pokemon:
+        """Pick among Pokémon already seen, so the surprise button works during outages."""
+        identifiers = self.stat_index.identifiers()
+        if not identifiers and self.snapshot is not None:
+            identifiers = self.snapshot.ids.tolist()
+        if not identifiers:
+            raise UpstreamUnavailableError(
+                "La PokéAPI no está disponible ahora mismo. Inténtalo de nuevo en un rato."
+            )
+        error: PokeAPIError | None = None
+        for _ in range(self.LOCAL_RANDOM_ATTEMPTS):
+            identifier = identifiers[self.rng.randint(0, len(identifiers) - 1)]
+            try:
+                return self.get_pokemon(identifier, lang=lang)
+            except PokeAPIError as exc:
+                error = exc
+        raise error
+
+    def get_pokemon_by_type(
+        self, type_name: str, limit: int = 12, *, hydrate: bool = False
+    ) -> List[PokemonSummary]:
         try:
             type_data = self.client.get_type(type_name)
         except PokemonNotFoundError as exc:
@@ -41,29 +223,33 @@ class PokemonService:
                 url=pokemon_info.get("url", ""),
             )
             summaries.append(summary)
+        if hydrate:
+            summaries = self._hydrate_all(summaries)
         return summaries
 
     def get_regions_catalogue(self) -> List[dict]:
         regions: List[RegionInfo] = PokemonRegions.all()
         return [self._region_to_dict(region, include_featured=True) for region in regions]
 
-    def get_region_details(self, region_key: str, limit: int = 12) -> dict:
-        try:
-            region = PokemonRegions.get(region_key)
-        except KeyError as exc:
-            raise ValueError("¡Esa región aún no está en el mapa!") from exc
-
-        pokedex_data = self.client.get_pokedex(region.pokedex)
+    def get_region_details(
+        self,
+        region_key: str,
+        limit: int = 12,
+        *,
+        hydrate: bool = False,
+        cached_only: bool = False,
+    ) -> dict | None:
+        region = self._get_region(region_key)
+        if cached_only:
+            pokedex_data = self.client.get_pokedex(region.pokedex, cached_only=True)
+            if pokedex_data is None:
+                return None
+        else:
+            pokedex_data = self.client.get_pokedex(region.pokedex)
         entries = pokedex_data.get("pokemon_entries", [])
-
-        summaries: List[PokemonSummary] = []
-        for entry in entries[:limit]:
-            species = entry.get("pokemon_species", {})
-            summary = PokemonSummary.from_url(
-                name=species.get("name", ""),
-                url=species.get("url", ""),
-            )
-            summaries.append(summary)
+        summaries = [self._summary_from_pokedex_entry(entry) for entry in entries[:limit]]
+        if hydrate:
+            summaries = self._hydrate_all(summaries)
 
         return {
             "region": self._region_to_dict(region, include_featured=True),
@@ -71,7 +257,399 @@ class PokemonService:
             "total_available": len(entries),
         }
 
-    def compare_pokemon(self, identifier_a: str | int, identifier_b: str | int) -> dict:
+    def stream_region_entries(
+        self, region_key: str, concurrency: int | None = None
+    ) -> Tuple[int, Iterator[PokemonSummary]]:
+        region = self._get_region(region_key)
+        entries = self.client.get_pokedex(region.pokedex).get("pokemon_entries", [])
+        summaries = (self._summary_from_pokedex_entry(entry) for entry in entries)
+        return len(entries), self.iter_hydrated(summaries, concurrency)
+
+    def iter_hydrated(
+        self, summaries: Iterable[PokemonSummary], concurrency: int | None = None
+    ) -> Iterator[PokemonSummary]:
+        window = max(1, concurrency or self.HYDRATION_CONCURRENCY)
+        pending: Deque[Future] = deque()
+        executor = self.fetch_executor()
+        hydrate = deadline.propagate(self._hydrate_summary)
+        iterator = iter(summaries)
+        try:
+            while True:
+                batch = list(islice(iterator, window))
+                if not batch:
+                    break
+                # One multi-get per window; only cache misses go to the thread pool.
+                cached = self.client.get_cached_pokemon([summary.identifier for summary in batch])
+                for summary in batch:
+                    if summary.identifier in cached:
+                        future: Future = Future()
+                        future.set_result(self._hydrate_from(summary, cached[summary.identifier]))
+                    else:
+                        future = executor.submit(hydrate, summary)
+                    pending.append(future)
+                while len(pending) >= window:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+    def fetch_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for upstream fetches; SQLite and Redis connections are per thread."""
+        if self._fetch_executor is None:
+            with self._fetch_executor_lock:
+                if self._fetch_executor is None:
+                    self._fetch_executor = ThreadPoolExecutor(
+                        max_workers=self.FETCH_POOL_SIZE, thread_name_prefix="pokemon-fetch"
+                    )
+        return self._fetch_executor
+
+    def get_leaderboard(
+        self, stat: str = "total", type_name: str | None = None, limit: int = 20
+    ) -> dict:
+        from .stat_index import StatIndex
+
+        stat = self._stat_column(stat or "total", allowed=("total",) + StatIndex.STAT_KEYS)
+        type_name = self._type_key(type_name) if type_name else None
+        limit = max(1, min(limit, self.MAX_LEADERBOARD_SIZE))
+
+        self.ensure_stat_crawl()
+        return {
+            "stat": stat,
+            "type": type_name,
+            "pokemon": self.stat_index.top(stat, type_name, limit),
+            "indexed": len(self.stat_index),
+            "complete": self._crawler is not None and self._crawler.done,
+        }
+
+    def search_pokemon(
+        self,
+        ranges: Dict[str, Tuple[float | None, float | None]] | None = None,
+        type_names: Iterable[str] = (),
+        sort: str = "total",
+        order: str = "desc",
+        page: int = 1,
+        per_page: int = 20,
+    ) -> dict:
+        """Filter the stat index by inclusive ranges and types.
+
+        Ranges accept any base stat, ``total``, ``height`` (metres) and
+        ``weight`` (kilograms).
+        """
+        from .stat_index import StatIndex
+
+        criteria: Dict[str, Tuple[float | None, float | None]] = {}
+        for field, (low, high) in (ranges or {}).items():
+            column = self._stat_column(field, allowed=StatIndex.COLUMNS[1:])
+            # PokéAPI measures height in decimetres and weight in hectograms.
+            scale = 10 if column in ("height", "weight") else 1
+            criteria[column] = (
+                None if low is None else round(low * scale, 6),
+                None if high is None else round(high * scale, 6),
+            )
+        type_keys = [self._type_key(type_name) for type_name in type_names]
+        sort = self._stat_column(sort or "total", allowed=StatIndex.COLUMNS)
+        order = (order or "desc").strip().lower()
+        if order not in ("asc", "desc"):
+            raise ValueError("El orden debe ser asc o desc.")
+        page = max(1, page)
+        per_page = max(1, min(per_page, self.MAX_SEARCH_PAGE_SIZE))
+
+        self.ensure_stat_crawl()
+        total, results = self.stat_index.search(
+            criteria,
+            type_keys,
+            sort=sort,
+            descending=order == "desc",
+            offset=(page - 1) * per_page,
+            limit=per_page,
+        )
+        return {
+            "total": total,
+            "page": page,
+            "per_page": per_page,
+            "sort": sort,
+            "order": order,
+            "pokemon": results,
+            "indexed": len(self.stat_index),
+            "complete": self._crawler is not None and self._crawler.done,
+        }
+
+    def find_similar(self, pokemon_id: int, k: int = 5, *, shared_types: bool = False) -> dict:
+        """Closest stat profiles from the in-memory index; PokéAPI is never contacted."""
+        k = max(1, min(k, self.MAX_SIMILAR_RESULTS))
+        self.ensure_stat_crawl()
+        if pokemon_id not in self.stat_index:
+            # A Pokémon already in the response cache can join the index straight away.
+            for pokemon_data in self.client.get_cached_pokemon([pokemon_id]).values():
+                self.stat_index.add(pokemon_data)
+
+        found = self.stat_index.nearest(pokemon_id, k, shared_types=shared_types)
+        if found is None:
+            raise PokemonNotFoundError(
+                "Todavía no conocemos a ese Pokémon. ¡Búscalo primero y vuelve a intentarlo!"
+            )
+        pokemon, similar = found
+        return {
+            "pokemon": pokemon,
+            "similar": similar,
+            "shared_types": shared_types,
+            "indexed": len(self.stat_index),
+            "complete": self._crawler is not None and self._crawler.done,
+        }
+
+    def ensure_stat_crawl(self, wait: bool = False, timeout: float | None = None) -> bool:
+        """Start the background stat crawl once; True when every Pokémon has been indexed.
+
+        With ``wait`` this blocks until the crawl finishes or ``timeout`` seconds pass.
+        """
+        if not self.crawl_stats:
+            return False
+        if self._crawler is None:
+            with self._crawler_lock:
+                if self._crawler is None:
+                    from .stat_index import StatIndexCrawler
+
+                    # Workers start at different numbers, so on a shared cache each one
+                    # mostly reads what the others already fetched. An in-process cache
+                    # would only hold a thousand full payloads for the sake of six stats.
+                    last = self.client.MAX_POKEMON_ID
+                    first = self.rng.randint(1, last)
+                    self._crawler = StatIndexCrawler(
+                        self.stat_index,
+                        partial(self.client.get_pokemon, store=self.client.cache.shared),
+                        [*range(first, last + 1), *range(1, first)],
+                        cached=self.client.get_cached_pokemon,
+                    )
+                    self._crawler.start()
+        crawler = self._crawler
+        if crawler is None:
+            return False
+        if wait:
+            crawler.join(timeout)
+        return crawler.done
+
+    def _reset_stat_index(self) -> None:
+        """Forget every indexed stat; add() never overwrites a row, so corrections need a new index."""
+        from .stat_index import StatIndex
+
+        with self._crawler_lock:
+            if self._crawler is not None:
+                self._crawler.stop()
+                self._crawler = None
+            self._stat_index = StatIndex()
+
+    def get_initial_state(self, limit: int = 12) -> dict:
+        regions = self.get_regions_catalogue()
+        region = None
+        if regions:
+            region = self.get_region_details(regions[0]["key"], limit=limit, cached_only=True)
+        return {"regions": regions, "region": region}
+
+    def warm_up(self, refresh: bool = False) -> dict:
+        """Load every regional Pokédex and the type chart into the cache.
+
+        With ``refresh`` they are fetched from PokéAPI again even when cached.
+        """
+        self._warming = True
+        try:
+            self.preload()
+            for region in PokemonRegions.all():
+                try:
+                    if refresh:
+                        self.client.refresh(f"pokedex/{region.pokedex}")
+                    else:
+                        self.client.get_pokedex(region.pokedex)
+                except (PokeAPIError, PokemonNotFoundError):
+                    continue
+            try:
+                if refresh:
+                    chart = self._load_type_chart(refresh=True)
+                    with self._type_chart_lock:
+                        self.type_chart = chart
+                    with self._compare_lock:
+                        self._forget_matchups()
+                else:
+                    self.get_type_chart()
+            except (PokeAPIError, PokemonNotFoundError):
+                pass
+        finally:
+            self._warming = False
+            self._warmed_at = time.monotonic()
+        status = self.cache_status()
+        self._warmed_once = self._warmed_once or status["warm"]
+        return {**status, "ready": self._warmed_once}
+
+    def after_fork(self) -> None:
+        """Reset per-process state inherited from gunicorn's master after a fork."""
+        self.client.after_fork()
+        # Threads do not survive fork(); drop handles to the master's ones.
+        self._crawler = None
+        self._fetch_executor = None
+        self._rewarm_thread = None
+        self._type_chart_thread = None
+        self._preload_thread = None
+        self._warming = False
+
+    def readiness(self) -> dict:
+        """Cache status of this process; a cold cache starts a background re-warm.
+
+        ``ready`` stays True once a warm-up has succeeded, so entries expiring
+        together in every worker re-warm in the background without taking the
+        host out of rotation. After a re-warm that left the cache cold (PokéAPI
+        down) the worker is reported as not warm for ``READINESS_REWARM_INTERVAL``
+        seconds, so an outage does not take every worker out of rotation.
+        """
+        status = self.cache_status()
+        if status["warm"] or status["warming"]:
+            return status
+        if (
+            self._warmed_at is None
+            or time.monotonic() - self._warmed_at >= self.READINESS_REWARM_INTERVAL
+        ):
+            return self.rewarm()
+        return status
+
+    def rewarm(self, refresh: bool = False) -> dict:
+        """Run warm_up() in a background thread unless one is already running."""
+        with self._rewarm_lock:
+            started = self._rewarm_thread is None or not self._rewarm_thread.is_alive()
+            if started:
+                self._warming = True
+                self._rewarm_thread = threading.Thread(
+                    target=self.warm_up,
+                    kwargs={"refresh": refresh},
+                    name="cache-rewarm",
+                    daemon=True,
+                )
+                self._rewarm_thread.start()
+        return {"started": started, **self.cache_status()}
+
+    def cache_report(self, top: int = 10) -> dict:
+        return {
+            **self.client.cache_report(top),
+            "status": self.cache_status(),
+            "invalidation_epoch": self._invalidation_epoch,
+            "indexes": {
+                "stats": len(self.stat_index),
+                "evolution_chains": len(self.evolution_index),
+                "flavor_texts": len(self._flavor_texts),
+                "comparisons": len(self._compare_memo),
+            },
+        }
+
+    def invalidate_pokemon(self, identifier: str | int) -> dict:
+        key = str(identifier).strip().lower()
+        if not key:
+            raise ValueError("Necesitamos un Pokémon para limpiar su caché.")
+        removed = self.client.invalidate_pokemon(key)
+        aliases = sorted({cache_key.split("/", 1)[1] for cache_key in removed})
+        epoch = self._publish_invalidation({"pokemon": aliases})
+        return {"removed": removed, "epoch": epoch}
+
+    def invalidate_namespace(self, namespace: str) -> dict:
+        namespace = namespace.strip().strip("/").lower()
+        if namespace not in self.CACHE_NAMESPACES:
+            raise ValueError(
+                f"Espacio de caché desconocido. Usa uno de: {', '.join(self.CACHE_NAMESPACES)}."
+            )
+        removed = self.client.invalidate_namespace(namespace)
+        epoch = self._publish_invalidation({"namespace": namespace})
+        return {"removed": removed, "epoch": epoch}
+
+    def sync_invalidations(self, force: bool = False) -> None:
+        """Apply invalidations published by other workers; polled at most every few seconds."""
+        now = time.monotonic()
+        if not force and now - self._invalidation_checked < self.INVALIDATION_POLL_SECONDS:
+            return
+        self._invalidation_checked = now
+        log = self.client.cache.get(self.INVALIDATION_LOG_KEY)
+        if not log or log["epoch"] <= self._invalidation_epoch:
+            return
+        with self._invalidation_lock:
+            for entry in log["entries"]:
+                if entry["epoch"] > self._invalidation_epoch:
+                    self._apply_invalidation(entry)
+            self._invalidation_epoch = max(self._invalidation_epoch, log["epoch"])
+
+    def _publish_invalidation(self, change: dict) -> int:
+        with self._invalidation_lock:
+            # Admin writes are rare, so a read-modify-write of the log is good enough.
+            log = self.client.cache.get(self.INVALIDATION_LOG_KEY) or {"epoch": 0, "entries": []}
+            epoch = max(log["epoch"], self._invalidation_epoch) + 1
+            entries = (log["entries"] + [{"epoch": epoch, **change}])[-self.INVALIDATION_LOG_SIZE :]
+            self.client.cache.set(
+                self.INVALIDATION_LOG_KEY,
+                {"epoch": epoch, "entries": entries},
+                self.INVALIDATION_LOG_TTL,
+            )
+        self.sync_invalidations(force=True)
+        return epoch
+
+    def _apply_invalidation(self, entry: dict) -> None:
+        namespace = entry.get("namespace")
+        self.client.forget_stale(
+            (
+                f"{prefix}/{alias}"
+                for alias in entry.get("pokemon", [])
+                for prefix in ("pokemon", "pokemon-species")
+            ),
+            prefix=f"{namespace}/" if namespace else None,
+        )
+        aliases = entry.get("pokemon", [])
+        with self._compare_lock:
+            remembered = [self._compare_ids.pop(alias, None) for alias in aliases]
+        # A name may be all the log has; the index knows its id even if it was never compared.
+        stale_ids = {
+            int(alias) if alias.isdigit() else (self.stat_index.resolve(alias) or known)
+            for alias, known in zip(aliases, remembered)
+        }
+        stale_ids.discard(None)
+        if namespace == "pokemon":
+            self._reset_stat_index()
+        for identifier in stale_ids:
+            # Re-indexed from fresh data the next time the Pokémon is fetched.
+            self.stat_index.remove(identifier)
+        with self._flavor_lock:
+            if namespace == "pokemon-species":
+                self._flavor_texts.clear()
+            for identifier in stale_ids:
+                self._flavor_texts.pop(identifier, None)
+        with self._compare_lock:
+            if namespace in ("pokemon", "pokemon-species"):
+                self._compare_memo.clear()
+                self._compare_ids.clear()
+            elif namespace == "type":
+                self._forget_matchups()
+            for memo_key in [key for key in self._compare_memo if stale_ids & set(key[:2])]:
+                del self._compare_memo[memo_key]
+        if namespace in ("pokemon-species", "evolution-chain"):
+            self.evolution_index = EvolutionIndex()
+        if namespace == "type":
+            self.type_chart = None
+            self._type_chart_snapshot_valid = False
+
+    def cache_status(self) -> dict:
+        regions = PokemonRegions.all()
+        # Probed on every /readyz call, so count the keys instead of decoding the payloads.
+        cached = self.client.cache.count(f"pokedex/{region.pokedex}" for region in regions)
+        return {
+            "warm": cached == len(regions),
+            "warming": self._warming,
+            "ready": self._warmed_once,
+            "cached_regions": cached,
+            "total_regions": len(regions),
+            "upstream": self.client.breaker.state,
+        }
+
+    def compare_pokemon(
+        self,
+        identifier_a: str | int,
+        identifier_b: str | int,
+        lang: str = DEFAULT_LANGUAGE,
+        mode: str = "stats",
+    ) -> dict:
         first_key = str(identifier_a).strip().lower()
         second_key = str(identifier_b).strip().lower()
 
@@ -81,54 +659,353 @@ class PokemonService:
         if first_key == second_key:
             raise ValueError("Debes elegir dos Pokémon distintos para la comparación.")
 
-        first = self.get_pokemon(first_key)
-        second = self.get_pokemon(second_key)
+        if mode not in ("stats", "matchup"):
+            raise ValueError("El modo de comparación debe ser stats o matchup.")
+
+        memoized = self._memoized_comparison(first_key, second_key, lang, mode)
+        if memoized is not None:
+            return memoized
+
+        stale_before = len(degraded.stale_keys())
+        first = self.get_pokemon(first_key, lang=lang)
+        second = self.get_pokemon(second_key, lang=lang)
 
         score_first = first.total_stats
         score_second = second.total_stats
+        boast = "Sus estadísticas suman"
+        matchup = None
+        notice = None
+        chart = self.ready_type_chart() if mode == "matchup" else None
+        if mode == "matchup" and chart is None:
+            notice = self.TYPE_CHART_PENDING_NOTICE
+        elif mode == "matchup":
+            # Each side's total is scaled by its best type multiplier against the other.
+            multipliers = [
+                chart.effectiveness(first.types, second.types),
+                chart.effectiveness(second.types, first.types),
+            ]
+            score_first = round(score_first * multipliers[0])
+            score_second = round(score_second * multipliers[1])
+            boast = "Con la ventaja de tipo su fuerza llega a"
+            matchup = {"multipliers": multipliers, "scores": [score_first, score_second]}
 
         winner: Pokemon | None
         if score_first > score_second:
             winner = first
-            message = (
-                f"¡{first.name} gana! Sus estadísticas suman {score_first} puntos superando a"
-                f" {second.name}."
-            )
+            message = f"¡{first.name} gana! {boast} {score_first} puntos superando a {second.name}."
         elif score_second > score_first:
             winner = second
-            message = (
-                f"¡{second.name} gana! Sus estadísticas suman {score_second} puntos superando a"
-                f" {first.name}."
-            )
+            message = f"¡{second.name} gana! {boast} {score_second} puntos superando a {first.name}."
         else:
             winner = None
             message = "¡Empate! Ambos Pokémon comparten la misma fuerza total."
 
-        return {
+        result = {
             "winner": winner.name if winner else None,
             "is_tie": winner is None,
             "message": message,
             "difference": abs(score_first - score_second),
             "pokemon": [first.to_dict(), second.to_dict()],
         }
+        if matchup is not None:
+            result["matchup"] = matchup
+        if notice is not None:
+            result["notice"] = notice
+        # Answers built from stale copies must not outlive the outage.
+        if len(degraded.stale_keys()) == stale_before and notice is None:
+            self._memoize_comparison(
+                {first_key: first.identifier, second_key: second.identifier}, lang, mode, result
+            )
+        return result
 
-    def _extract_description(self, species_data: dict) -> str:
-        entries = species_data.get("flavor_text_entries", [])
-        for entry in entries:
-            language = entry.get("language", {}).get("name")
-            if language == "es":
-                return self._clean_description(entry.get("flavor_text", ""))
-        for entry in entries:
+    def _memoized_comparison(
+        self, first_key: str, second_key: str, lang: str, mode: str
+    ) -> dict | None:
+        with self._compare_lock:
+            ids = [
+                int(key) if key.isdigit() else self._compare_ids.get(key)
+                for key in (first_key, second_key)
+            ]
+            if None in ids:
+                return None
+            memo_key = (min(ids), max(ids), lang, mode)
+            entry = self._compare_memo.get(memo_key)
+            if entry is None:
+                return None
+            expires, result = entry
+            if time.monotonic() >= expires:
+                del self._compare_memo[memo_key]
+                return None
+            self._compare_memo.move_to_end(memo_key)
+        return self._flip_comparison(result) if ids[0] > ids[1] else result
+
+    def _memoize_comparison(self, ids: Dict[str, int], lang: str, mode: str, result: dict) -> None:
+        """Keep ``result`` under its unordered pair until the payloads it was built from expire."""
+        first_id, second_id = (pokemon["id"] for pokemon in result["pokemon"])
+        remaining = self.client.cache.remaining_ttl(
+            f"{namespace}/{identifier}"
+            for identifier in (first_id, second_id)
+            for namespace in ("pokemon", "pokemon-species")
+        )
+        if remaining is None:
+            # Not (or no longer) cached: the next comparison has to fetch them anyway.
+            return
+        memo_key = (min(first_id, second_id), max(first_id, second_id), lang, mode)
+        canonical = self._flip_comparison(result) if first_id > second_id else result
+        with self._compare_lock:
+            for key, identifier in ids.items():
+                if not key.isdigit():
+                    self._compare_ids[key] = identifier
+            self._compare_memo[memo_key] = (time.monotonic() + remaining, canonical)
+            self._compare_memo.move_to_end(memo_key)
+            while len(self._compare_memo) > self.COMPARE_MEMO_SIZE:
+                self._compare_memo.popitem(last=False)
+
+    def _forget_matchups(self) -> None:
+        # Callers hold _compare_lock; matchup results depend on the type chart.
+        for memo_key in [key for key in self._compare_memo if key[3] == "matchup"]:
+            del self._compare_memo[memo_key]
+
+    @staticmethod
+    def _flip_comparison(result: dict) -> dict:
+        # Winner, message and difference do not depend on the order; only the pairs do.
+        flipped = {**result, "pokemon": result["pokemon"][::-1]}
+        if "matchup" in result:
+            flipped["matchup"] = {key: values[::-1] for key, values in result["matchup"].items()}
+        return flipped
+
+    def export_snapshot(self, path: str) -> int:
+        """Write every Pokémon in the stat index, with its descriptions, to a binary snapshot."""
+
+        def entries():
+            for identifier in self.stat_index.identifiers():
+                try:
+                    pokemon_data = self.client.get_pokemon(identifier)
+                    species_data = self.client.get_pokemon_species(identifier)
+                except (PokeAPIError, PokemonNotFoundError):
+                    continue
+                yield pokemon_data, self.flavor_texts(identifier, species_data)
+
+        from .snapshot import PokemonSnapshot
+
+        return PokemonSnapshot.write(path, entries())
+
+    def get_evolutions(self, identifier: str | int) -> EvolutionChain:
+        key = str(identifier).strip().lower()
+        if not key:
+            raise ValueError("Necesitamos un Pokémon para buscar su evolución.")
+
+        chain = self.evolution_index.get(key)
+        if chain is not None:
+            return chain
+
+        species_data = self.client.get_pokemon_species(key)
+        chain_url = (species_data.get("evolution_chain") or {}).get("url", "")
+        try:
+            chain_id = int(chain_url.rstrip("/").split("/")[-1])
+        except ValueError as exc:
+            raise PokemonNotFoundError("Este Pokémon no tiene cadena evolutiva.") from exc
+
+        chain = EvolutionChain.from_api(self.client.get_evolution_chain(chain_id))
+        self.evolution_index.add(chain)
+        return chain
+
+    def ready_type_chart(self) -> TypeChart | None:
+        """The type chart if it is loaded or on disk; otherwise start building it and return None.
+
+        Building it takes one PokéAPI call per type, which a user request should not wait for.
+        """
+        if self.type_chart is not None:
+            return self.type_chart
+        thread = self._type_chart_thread
+        if thread is not None and thread.is_alive():
+            return None
+        # Whoever holds the lock is already loading or assigning the chart; do not queue behind it.
+        if not self._type_chart_lock.acquire(blocking=False):
+            return None
+        try:
+            if self.type_chart is None:
+                self.type_chart = self._type_chart_from_disk()
+            if self.type_chart is not None:
+                return self.type_chart
+            if self._type_chart_thread is None or not self._type_chart_thread.is_alive():
+                self._type_chart_thread = threading.Thread(
+                    target=self._build_type_chart, name="type-chart", daemon=True
+                )
+                self._type_chart_thread.start()
+        finally:
+            self._type_chart_lock.release()
+        return None
+
+    def _build_type_chart(self) -> None:
+        try:
+            self.get_type_chart()
+        except (PokeAPIError, PokemonNotFoundError) as exc:
+            logger.warning("Could not build the type chart: %s", exc)
+
+    def get_type_chart(self) -> TypeChart:
+        """Type multipliers, read from the snapshot file or built once from PokéAPI."""
+        if self.type_chart is not None:
+            return self.type_chart
+        # Built without the lock: the 18 PokéAPI calls must not stall ready_type_chart().
+        chart = self._load_type_chart()
+        with self._type_chart_lock:
+            if self.type_chart is None:
+                self.type_chart = chart
+            return self.type_chart
+
+    def _load_type_chart(self, refresh: bool = False) -> TypeChart:
+        from .stat_index import POKEMON_TYPES
+        from .type_chart import TypeChart
+
+        path = Path(self.type_chart_path) if self.type_chart_path else None
+        if refresh:
+            types = {name: self.client.refresh(f"type/{name}") for name in POKEMON_TYPES}
+            return self._save_type_chart(TypeChart.from_type_payloads(types), path)
+        chart = self._type_chart_from_disk()
+        if chart is not None:
+            return chart
+        chart = TypeChart.from_type_payloads(
+            {type_name: self.client.get_type(type_name) for type_name in POKEMON_TYPES}
+        )
+        return self._save_type_chart(chart, path)
+
+    def _type_chart_from_disk(self) -> TypeChart | None:
+        from .type_chart import TypeChart
+
+        path = Path(self.type_chart_path) if self.type_chart_path else None
+        if path is None or not path.exists() or not self._type_chart_snapshot_valid:
+            return None
+        try:
+            return TypeChart.load(path)
+        except (OSError, ValueError, KeyError) as exc:
+            logger.warning("Ignoring type chart snapshot %s: %s", path, exc)
+            return None
+
+    def _save_type_chart(self, chart: TypeChart, path: Path | None) -> TypeChart:
+        if path is not None:
+            try:
+                chart.save(path)
+                self._type_chart_snapshot_valid = True
+            except OSError as exc:
+                logger.warning("Could not write type chart snapshot %s: %s", path, exc)
+        return chart
+
+    def _get_region(self, region_key: str) -> RegionInfo:
+        try:
+            return PokemonRegions.get(region_key)
+        except KeyError as exc:
+            raise ValueError("¡Esa región aún no está en el mapa!") from exc
+
+    @staticmethod
+    def _summary_from_pokedex_entry(entry: dict) -> PokemonSummary:
+        species = entry.get("pokemon_species", {})
+        return PokemonSummary.from_url(name=species.get("name", ""), url=species.get("url", ""))
+
+    def _hydrate_all(self, summaries: List[PokemonSummary]) -> List[PokemonSummary]:
+        # Full Pokédexes belong to the streaming endpoint: past the cap, entries stay as
+        # id and name only (their JSON has no types) rather than being dropped.
+        limit = self.MAX_HYDRATED_RESULTS
+        return list(self.iter_hydrated(summaries[:limit])) + summaries[limit:]
+
+    def _hydrate_summary(self, summary: PokemonSummary) -> PokemonSummary:
+        try:
+            pokemon_data = self.client.get_pokemon(summary.identifier)
+        except PokemonNotFoundError:
+            return summary
+        return self._hydrate_from(summary, pokemon_data)
+
+    def _hydrate_from(self, summary: PokemonSummary, pokemon_data: dict) -> PokemonSummary:
+        self.stat_index.add(pokemon_data)
+        hydrated = PokemonSummary.from_api(pokemon_data)
+        hydrated.name = summary.name or hydrated.name
+        return hydrated
+
+    def run_tournament(self, identifiers: Iterable[str | int]) -> Tournament:
+        keys = list(dict.fromkeys(str(identifier).strip().lower() for identifier in identifiers))
+        keys = [key for key in keys if key]
+        if len(keys) > self.MAX_TOURNAMENT_SIZE:
+            raise ValueError(f"Un torneo admite como máximo {self.MAX_TOURNAMENT_SIZE} Pokémon.")
+
+        payloads = self._get_many_pokemon(keys)
+        entrants: List[Pokemon] = []
+        seen = set()
+        for key in keys:
+            pokemon_data = payloads[key]
+            # "25" and "pikachu" are the same contestant.
+            if pokemon_data.get("id") in seen:
+                continue
+            seen.add(pokemon_data.get("id"))
+            self.stat_index.add(pokemon_data)
+            entrants.append(Pokemon.from_api(pokemon_data, description=""))
+
+        if len(entrants) < 2:
+            raise ValueError("Necesitamos al menos dos Pokémon distintos para un torneo.")
+        from .tournament import Tournament
+
+        return Tournament(entrants)
+
+    def _get_many_pokemon(self, keys: List[str]) -> Dict[str, dict]:
+        payloads = dict(self.client.get_cached_pokemon(keys))
+        misses = [key for key in keys if key not in payloads]
+        fetch = deadline.propagate(self.client.get_pokemon)
+        # Windows keep one tournament from taking the whole shared pool.
+        for start in range(0, len(misses), self.HYDRATION_CONCURRENCY):
+            window = misses[start : start + self.HYDRATION_CONCURRENCY]
+            payloads.update(zip(window, self.fetch_executor().map(fetch, window)))
+        return payloads
+
+    def flavor_texts(self, species_id: object, species_data: dict) -> Dict[str, str]:
+        with self._flavor_lock:
+            texts = self._flavor_texts.get(species_id)
+            if texts is not None:
+                self._flavor_texts.move_to_end(species_id)
+                return texts
+
+        texts = self._index_flavor_texts(species_data)
+        with self._flavor_lock:
+            self._flavor_texts[species_id] = texts
+            while len(self._flavor_texts) > self.FLAVOR_INDEX_SIZE:
+                self._flavor_texts.popitem(last=False)
+        return texts
+
+    def _describe(self, species_id: object, species_data: dict, lang: str) -> str:
+        texts = self.flavor_texts(species_id, species_data)
+        for language in (lang, self.DEFAULT_LANGUAGE, "en"):
+            if language in texts:
+                return texts[language]
+        return self.MYSTERY_DESCRIPTION
+
+    @classmethod
+    def _index_flavor_texts(cls, species_data: dict) -> Dict[str, str]:
+        texts: Dict[str, str] = {}
+        for entry in species_data.get("flavor_text_entries", []):
             language = entry.get("language", {}).get("name")
-            if language == "en":
-                return self._clean_description(entry.get("flavor_text", ""))
-        return "Este Pokémon es todo un misterio. ¡Sigue investigando!"
+            if language and language not in texts:
+                texts[language] = cls._clean_description(entry.get("flavor_text", ""))
+        return texts
 
     @staticmethod
     def _clean_description(text: str) -> str:
         cleaned = text.replace("\n", " ").replace("\f", " ")
         return " ".join(cleaned.split())
 
+    @staticmethod
+    def _stat_column(name: str, allowed: Iterable[str]) -> str:
+        column = name.strip().lower().replace("_", "-")
+        if column not in allowed:
+            raise ValueError("Esa estadística no existe. Prueba con speed, attack o total.")
+        return column
+
+    @staticmethod
+    def _type_key(type_name: str) -> str:
+        from .stat_index import POKEMON_TYPES
+
+        key = type_name.strip().lower()
+        if key not in POKEMON_TYPES:
+            raise ValueError("No encontramos un tipo con ese nombre. ¡Revisa tu ortografía!")
+        return key
+
     @staticmethod
     def _region_to_dict(region: RegionInfo, *, include_featured: bool = False) -> Dict[str, object]:
         payload: Dict[str, object] = {
@@ -1,17 +1,50 @@
 from __future__ import annotations
 
-from flask import Blueprint, Flask, jsonify, render_template, request
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    current_app,
+    g,
+    jsonify,
+    render_template,
+    request,
+    stream_with_context,
+)
 
-from .exceptions import PokeAPIError, PokemonNotFoundError
+from . import deadline, degraded, upstream_calls
+from .exceptions import (
+    DeadlineExceededError,
+    PokeAPIError,
+    PokemonNotFoundError,
+    UpstreamUnavailableError,
+)
 from .pokemon_service import PokemonService
 
 
 class PokemonController:
     """Registers HTTP endpoints that interact with the Pokémon service."""
 
-    def __init__(self, service: PokemonService) -> None:
+    # Streams may legitimately outlive any single request budget.
+    UNBOUNDED_ENDPOINTS = frozenset({"pokemon.region_stream"})
+
+    def __init__(
+        self,
+        service: PokemonService,
+        request_budget: float | None = 8.0,
+        count_upstream_calls: bool = False,
+    ) -> None:
         self.service = service
+        self.request_budget = request_budget
+        self.count_upstream_calls = count_upstream_calls
         self.blueprint = Blueprint("pokemon", __name__)
+        self.blueprint.before_request(self._begin_request_scope)
+        self.blueprint.before_request(self._sync_invalidations)
+        self.blueprint.after_request(self._add_etag)
+        self.blueprint.after_request(self._flag_stale)
+        if count_upstream_calls:
+            self.blueprint.after_request(self._count_upstream_calls)
+        self.blueprint.teardown_request(self._end_request_scope)
         self._register_routes()
 
     def register(self, app: Flask) -> None:
@@ -19,6 +52,9 @@ class PokemonController:
 
     def _register_routes(self) -> None:
         self.blueprint.add_url_rule("/", view_func=self.home, methods=["GET"])
+        self.blueprint.add_url_rule("/sw.js", view_func=self.service_worker, methods=["GET"])
+        self.blueprint.add_url_rule("/healthz", view_func=self.health, methods=["GET"])
+        self.blueprint.add_url_rule("/readyz", view_func=self.readiness, methods=["GET"])
         self.blueprint.add_url_rule("/api/pokemon", view_func=self.search_pokemon, methods=["GET"])
         self.blueprint.add_url_rule(
             "/api/pokemon/random", view_func=self.random_pokemon, methods=["GET"]
@@ -32,14 +68,52 @@ class PokemonController:
         self.blueprint.add_url_rule(
             "/api/regions", view_func=self.regions_catalogue, methods=["GET"]
         )
+        self.blueprint.add_url_rule(
+            "/api/leaderboard", view_func=self.leaderboard, methods=["GET"]
+        )
+        self.blueprint.add_url_rule(
+            "/api/pokemon/<int:pokemon_id>/similar", view_func=self.similar_pokemon, methods=["GET"]
+        )
+        self.blueprint.add_url_rule(
+            "/api/pokemon/<identifier>/evolutions", view_func=self.evolutions, methods=["GET"]
+        )
+        self.blueprint.add_url_rule("/api/search", view_func=self.search, methods=["GET"])
+        self.blueprint.add_url_rule(
+            "/api/tournament", view_func=self.tournament, methods=["GET"]
+        )
         self.blueprint.add_url_rule(
             "/api/regions/<string:region_key>",
             view_func=self.region_details,
             methods=["GET"],
         )
+        self.blueprint.add_url_rule(
+            "/api/regions/<string:region_key>/stream",
+            view_func=self.region_stream,
+            methods=["GET"],
+        )
 
     def home(self):
-        return render_template("index.html")
+        return render_template("index.html", initial_state=self.service.get_initial_state())
+
+    def service_worker(self):
+        # Served from the root so the worker's scope covers the whole site.
+        response = current_app.send_static_file("js/sw.js")
+        response.headers["Cache-Control"] = "no-cache"
+        return response
+
+    def health(self):
+        return jsonify({"status": "ok"})
+
+    def readiness(self):
+        cache = self.service.readiness()
+        # Only the first warm-up keeps a worker out of rotation; later ones run behind it.
+        if cache["warming"] and not cache["ready"]:
+            return jsonify({"status": "warming", "cache": cache}), 503
+        if cache["warm"]:
+            status = "ready"
+        else:
+            status = "rewarming" if cache["warming"] else "degraded"
+        return jsonify({"status": status, "cache": cache})
 
     def search_pokemon(self):
         query = request.args.get("q", "").strip()
@@ -49,28 +123,30 @@ class PokemonController:
                 400,
             )
         try:
-            pokemon = self.service.get_pokemon(query.lower())
+            pokemon = self.service.get_pokemon(query.lower(), lang=self._language())
         except PokemonNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
         except PokeAPIError as exc:
-            return jsonify({"error": str(exc)}), 502
-        return jsonify(pokemon.to_dict())
+            return self._upstream_error(exc)
+        return self._localized(jsonify(pokemon))
 
     def random_pokemon(self):
         try:
-            pokemon = self.service.get_random_pokemon()
+            pokemon = self.service.get_random_pokemon(lang=self._language())
         except PokeAPIError as exc:
-            return jsonify({"error": str(exc)}), 502
-        return jsonify(pokemon.to_dict())
+            return self._upstream_error(exc)
+        return self._localized(jsonify(pokemon))
 
     def pokemon_by_type(self, type_name: str):
         try:
-            summaries = self.service.get_pokemon_by_type(type_name.lower())
+            summaries = self.service.get_pokemon_by_type(
+                type_name.lower(), hydrate=self._flag("hydrate")
+            )
         except PokemonNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
         except PokeAPIError as exc:
-            return jsonify({"error": str(exc)}), 502
-        return jsonify({"type": type_name.title(), "pokemon": [s.to_dict() for s in summaries]})
+            return self._upstream_error(exc)
+        return jsonify({"type": type_name.title(), "pokemon": summaries})
 
     def compare_pokemon(self):
         first = request.args.get("a", "").strip()
@@ -83,13 +159,107 @@ class PokemonController:
             )
 
         try:
-            result = self.service.compare_pokemon(first, second)
+            result = self.service.compare_pokemon(
+                first,
+                second,
+                lang=self._language(),
+                mode=request.args.get("mode", "stats").strip().lower(),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except PokemonNotFoundError as exc:
+            return jsonify({"error": str(exc)}), 404
+        except PokeAPIError as exc:
+            return self._upstream_error(exc)
+
+        return self._localized(jsonify(result))
+
+    def similar_pokemon(self, pokemon_id: int):
+        try:
+            result = self.service.find_similar(
+                pokemon_id, k=self._int_arg("k", 5), shared_types=self._flag("shared_types")
+            )
+        except PokemonNotFoundError as exc:
+            return jsonify({"error": str(exc)}), 404
+
+        return jsonify(result)
+
+    def evolutions(self, identifier: str):
+        try:
+            chain = self.service.get_evolutions(identifier)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except PokemonNotFoundError as exc:
+            return jsonify({"error": str(exc)}), 404
+        except PokeAPIError as exc:
+            return self._upstream_error(exc)
+
+        return jsonify(chain)
+
+    def leaderboard(self):
+        try:
+            payload = self.service.get_leaderboard(
+                stat=request.args.get("stat", "total"),
+                type_name=request.args.get("type"),
+                limit=self._int_arg("limit", 20),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        return jsonify(payload)
+
+    def search(self):
+        # Range filters arrive as <field>_min / <field>_max, e.g. speed_min=100&weight_max=50.
+        ranges = {}
+        for key, value in request.args.items():
+            field, _, bound = key.rpartition("_")
+            if not field or bound not in ("min", "max"):
+                continue
+            try:
+                number = float(value)
+            except ValueError:
+                return jsonify({"error": "Los filtros deben ser números."}), 400
+            low, high = ranges.get(field, (None, None))
+            ranges[field] = (number, high) if bound == "min" else (low, number)
+
+        type_names = [
+            name for value in request.args.getlist("type") for name in value.split(",") if name.strip()
+        ]
+        try:
+            payload = self.service.search_pokemon(
+                ranges,
+                type_names,
+                sort=request.args.get("sort", "total"),
+                order=request.args.get("order", "desc"),
+                page=self._int_arg("page", 1),
+                per_page=self._int_arg("per_page", 20),
+            )
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+
+        return jsonify(payload)
+
+    def tournament(self):
+        identifiers = [
+            name
+            for value in request.args.getlist("pokemon")
+            for name in value.split(",")
+            if name.strip()
+        ]
+        if len(identifiers) < 2:
+            return (
+                jsonify({"error": "Necesitamos al menos dos Pokémon para un torneo."}),
+                400,
+            )
+
+        try:
+            result = self.service.run_tournament(identifiers)
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
         except PokemonNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
         except PokeAPIError as exc:
-            return jsonify({"error": str(exc)}), 502
+            return self._upstream_error(exc)
 
         return jsonify(result)
 
@@ -104,12 +274,133 @@ class PokemonController:
             limit = 12
 
         try:
-            payload = self.service.get_region_details(region_key, limit=limit)
+            payload = self.service.get_region_details(
+                region_key, limit=limit, hydrate=self._flag("hydrate")
+            )
         except ValueError as exc:
             return jsonify({"error": str(exc)}), 400
         except PokemonNotFoundError as exc:
             return jsonify({"error": str(exc)}), 404
         except PokeAPIError as exc:
-            return jsonify({"error": str(exc)}), 502
+            return self._upstream_error(exc)
 
         return jsonify(payload)
+
+    def region_stream(self, region_key: str):
+        try:
+            total, entries = self.service.stream_region_entries(region_key)
+        except ValueError as exc:
+            return jsonify({"error": str(exc)}), 400
+        except PokemonNotFoundError as exc:
+            return jsonify({"error": str(exc)}), 404
+        except PokeAPIError as exc:
+            return self._upstream_error(exc)
+
+        calls_before_body = upstream_calls.count()
+
+        def generate():
+            # The request scope is torn down before the body streams; count in a new one.
+            token = upstream_calls.begin() if self.count_upstream_calls else None
+            try:
+                for summary in entries:
+                    yield current_app.json.dumps(summary) + "\n"
+            except PokeAPIError as exc:
+                yield current_app.json.dumps({"error": str(exc)}) + "\n"
+            finally:
+                calls = calls_before_body + upstream_calls.count()
+                if token is not None:
+                    upstream_calls.end(token)
+            if token is not None:
+                # Headers left before the body was built; the count goes in a last line.
+                yield current_app.json.dumps({"upstream_calls": calls}) + "\n"
+
+        response = Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+        response.headers["X-Total-Count"] = str(total)
+        response.headers["Cache-Control"] = "no-cache"
+        response.headers["X-Accel-Buffering"] = "no"
+        return response
+
+    @staticmethod
+    def _language() -> str:
+        requested = request.args.get("lang", "").strip().lower()
+        if requested in PokemonService.LANGUAGES:
+            return requested
+        return request.accept_languages.best_match(
+            PokemonService.LANGUAGES, default=PokemonService.DEFAULT_LANGUAGE
+        )
+
+    @staticmethod
+    def _localized(response: Response) -> Response:
+        # The body depends on the negotiated language, and so does its ETag.
+        response.vary.add("Accept-Language")
+        return response
+
+    @staticmethod
+    def _int_arg(name: str, default: int) -> int:
+        try:
+            return int(request.args.get(name, default))
+        except ValueError:
+            return default
+
+    @staticmethod
+    def _flag(name: str) -> bool:
+        return request.args.get(name, "").strip().lower() in ("1", "true", "yes")
+
+    def _begin_request_scope(self) -> None:
+        g.stale_token = degraded.begin()
+        if self.count_upstream_calls:
+            g.upstream_token = upstream_calls.begin()
+        if self.request_budget and request.endpoint not in self.UNBOUNDED_ENDPOINTS:
+            g.deadline_token = deadline.start(self.request_budget)
+
+    @staticmethod
+    def _end_request_scope(_exc: BaseException | None = None) -> None:
+        token = g.pop("deadline_token", None)
+        if token is not None:
+            deadline.reset(token)
+        stale_token = g.pop("stale_token", None)
+        if stale_token is not None:
+            degraded.end(stale_token)
+        upstream_token = g.pop("upstream_token", None)
+        if upstream_token is not None:
+            upstream_calls.end(upstream_token)
+
+    @staticmethod
+    def _flag_stale(response: Response) -> Response:
+        # Registered after _add_etag, so it runs first and keeps shared caches off stale data.
+        if degraded.stale_keys():
+            response.headers["X-Pokedex-Stale"] = "1"
+            response.headers["Cache-Control"] = "no-store"
+        return response
+
+    @staticmethod
+    def _count_upstream_calls(response: Response) -> Response:
+        # Lets load tests attribute PokéAPI traffic to the route that caused it.
+        if not response.is_streamed:
+            response.headers["X-Pokedex-Upstream-Calls"] = str(upstream_calls.count())
+        return response
+
+    @staticmethod
+    def _upstream_error(exc: PokeAPIError):
+        if isinstance(exc, DeadlineExceededError):
+            status = 504
+        elif isinstance(exc, UpstreamUnavailableError):
+            status = 503
+        else:
+            status = 502
+        return jsonify({"error": str(exc)}), status
+
+    def _sync_invalidations(self) -> None:
+        self.service.sync_invalidations()
+
+    @staticmethod
+    def _add_etag(response: Response) -> Response:
+        if (
+            request.method == "GET"
+            and response.status_code == 200
+            and response.mimetype == "application/json"
+        ):
+            response.add_etag()
+            response.headers.setdefault("Cache-Control", "no-cache")
+            response.make_conditional(request)
+        return response
@@ -0,0 +1,251 @@
+from __future__ import annotations
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .models import LANGUAGES, Pokemon, PokemonStat, _image_url, _title_case
+from .stat_index import POKEMON_TYPES, TYPE_BITS, StatIndex
+
+NO_TYPE = 255
+
+# Fixed-width, little-endian record; strings are (offset, length) pairs into the string table.
+RECORD_DTYPE = np.dtype(
+    [
+        ("id", "<i4"),
+        ("stats", "<u2", (len(StatIndex.STAT_KEYS),)),
+        ("height", "<u2"),
+        ("weight", "<u4"),
+        ("type_mask", "<u4"),
+        ("types", "u1", (2,)),
+        ("reserved", "<u2"),
+        ("slug", "<u4", (2,)),
+        ("name", "<u4", (2,)),
+        # One description per language the service offers, default first.
+        ("descriptions", "<u4", (len(LANGUAGES), 2)),
+        ("image_url", "<u4", (2,)),
+        ("abilities", "<u4", (2,)),
+    ]
+)
+
+
+class PokemonSnapshot:
+    """Read-only Pokédex snapshot mapped into memory.
+
+    Layout::
+
+        header   magic "PKDX", version, record size, record count, records
+                 offset, name index offset, string table offset and size
+        records  ``RECORD_DTYPE`` rows sorted by id
+        names    uint32 row numbers sorted by PokéAPI name (``slug``)
+        strings  UTF-8 blob addressed by the records
+
+    Every worker that maps the same file shares one page-cache copy; columns
+    are NumPy views over the mapping and ``Pokemon`` objects are only built
+    by ``get()``.
+    """
+
+    MAGIC = b"PKDX"
+    VERSION = 2
+    HEADER = struct.Struct("<4sHHIQQQQ")
+    ABILITY_SEPARATOR = "\x1f"
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        with self.path.open("rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = self.HEADER.unpack_from(self._mmap, 0)
+        except struct.error as exc:
+            self.close()
+            raise ValueError(f"{self.path} is not a Pokédex snapshot") from exc
+        magic, version, record_size, count, records_offset, names_offset, strings_offset, _ = header
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a Pokédex snapshot")
+        if version != self.VERSION or record_size != RECORD_DTYPE.itemsize:
+            self.close()
+            raise ValueError(
+                f"{self.path} uses snapshot version {version}, expected {self.VERSION}"
+            )
+        self.records = np.frombuffer(
+            self._mmap, dtype=RECORD_DTYPE, count=count, offset=records_offset
+        )
+        self._name_order = np.frombuffer(self._mmap, dtype="<u4", count=count, offset=names_offset)
+        self._strings_offset = strings_offset
+
+    @classmethod
+    def write(cls, path: str | Path, entries: Iterable[Tuple[dict, Dict[str, str]]]) -> int:
+        """Write ``(pokemon payload, descriptions by language)`` pairs; returns the record count."""
+        unique = {
+            payload["id"]: (payload, descriptions)
+            for payload, descriptions in entries
+            if payload.get("id")
+        }
+        records = np.zeros(len(unique), dtype=RECORD_DTYPE)
+        strings = bytearray()
+
+        def add_string(text: str) -> Tuple[int, int]:
+            data = text.encode("utf-8")
+            offset = len(strings)
+            strings.extend(data)
+            return offset, len(data)
+
+        slugs: List[str] = []
+        for row, identifier in enumerate(sorted(unique)):
+            payload, descriptions = unique[identifier]
+            base_stats = {
+                entry["stat"]["name"]: entry.get("base_stat", 0) for entry in payload.get("stats", [])
+            }
+            type_names = [entry["type"]["name"] for entry in payload.get("types", [])]
+            positions = [POKEMON_TYPES.index(name) for name in type_names if name in TYPE_BITS]
+            positions = positions[:2]
+            abilities = [
+                _title_case(entry["ability"]["name"]) for entry in payload.get("abilities", [])
+            ]
+
+            record = records[row]
+            record["id"] = identifier
+            record["stats"] = [base_stats.get(key, 0) for key in StatIndex.STAT_KEYS]
+            record["height"] = payload.get("height") or 0
+            record["weight"] = payload.get("weight") or 0
+            record["type_mask"] = sum(TYPE_BITS[POKEMON_TYPES[position]] for position in positions)
+            record["types"] = (positions + [NO_TYPE, NO_TYPE])[:2]
+            slugs.append(payload.get("name", "").lower())
+            record["slug"] = add_string(slugs[-1])
+            record["name"] = add_string(_title_case(payload.get("name", "")))
+            record["descriptions"] = [
+                add_string(descriptions.get(language, "")) for language in LANGUAGES
+            ]
+            record["image_url"] = add_string(_image_url(payload.get("sprites", {})))
+            record["abilities"] = add_string(cls.ABILITY_SEPARATOR.join(abilities))
+
+        name_order = np.array(sorted(range(len(slugs)), key=slugs.__getitem__), dtype="<u4")
+
+        records_offset = cls.HEADER.size
+        names_offset = records_offset + records.nbytes
+        strings_offset = names_offset + name_order.nbytes
+        header = cls.HEADER.pack(
+            cls.MAGIC,
+            cls.VERSION,
+            RECORD_DTYPE.itemsize,
+            len(records),
+            records_offset,
+            names_offset,
+            strings_offset,
+            len(strings),
+        )
+        # Write beside the target and rename, so running workers never map a half-written file.
+        target = Path(path)
+        partial = target.with_name(target.name + ".tmp")
+        partial.write_bytes(header + records.tobytes() + name_order.tobytes() + bytes(strings))
+        partial.replace(target)
+        return len(records)
+
+    def __len__(self) -> int:
+        return int(self.records.shape[0])
+
+    def __contains__(self, identifier: object) -> bool:
+        return self._row(identifier) is not None
+
+    @property
+    def ids(self) -> np.ndarray:
+        return self.records["id"]
+
+    def get(self, identifier: str | int, lang: str = LANGUAGES[0]) -> Pokemon | None:
+        """Build the Pokémon with id or PokéAPI name ``identifier``, described in ``lang``.
+
+        Like the live service, a missing translation falls back to the default
+        language and then English; with none of them the description is empty.
+        """
+        row = self._row(identifier)
+        if row is None:
+            return None
+        record = self.records[row]
+        abilities = self._string(record["abilities"])
+        return Pokemon(
+            identifier=int(record["id"]),
+            name=self._string(record["name"]),
+            description=self.description(row, lang),
+            height_m=round(int(record["height"]) / 10, 2),
+            weight_kg=round(int(record["weight"]) / 10, 2),
+            types=self.type_names(row),
+            abilities=abilities.split(self.ABILITY_SEPARATOR) if abilities else [],
+            stats=[
+                PokemonStat(name=_title_case(key), value=int(value))
+                for key, value in zip(StatIndex.STAT_KEYS, record["stats"])
+            ],
+            image_url=self._string(record["image_url"]),
+        )
+
+    def resolve(self, identifier: str | int) -> int | None:
+        """Return the id of the record with id or PokéAPI name ``identifier``."""
+        row = self._row(identifier)
+        return None if row is None else int(self.records[row]["id"])
+
+    def name(self, row: int) -> str:
+        return self._string(self.records[row]["name"])
+
+    def slug(self, row: int) -> str:
+        return self._string(self.records[row]["slug"])
+
+    def description(self, row: int, lang: str = LANGUAGES[0]) -> str:
+        descriptions = self.records[row]["descriptions"]
+        for language in (lang, LANGUAGES[0], "en"):
+            if language in LANGUAGES:
+                text = self._string(descriptions[LANGUAGES.index(language)])
+                if text:
+                    return text
+        return ""
+
+    def image_url(self, row: int) -> str:
+        return self._string(self.records[row]["image_url"])
+
+    def type_names(self, row: int) -> List[str]:
+        return [
+            _title_case(POKEMON_TYPES[position])
+            for position in self.records[row]["types"]
+            if position != NO_TYPE
+        ]
+
+    def close(self) -> None:
+        self.records = np.zeros(0, dtype=RECORD_DTYPE)
+        self._name_order = np.zeros(0, dtype="<u4")
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Column views handed out earlier still reference the mapping; GC releases it.
+            pass
+
+    def _row(self, identifier: object) -> int | None:
+        try:
+            key = int(identifier)
+        except (TypeError, ValueError):
+            return self._row_by_name(str(identifier).strip().lower())
+        ids = self.records["id"]
+        row = int(np.searchsorted(ids, key))
+        if row < ids.shape[0] and ids[row] == key:
+            return row
+        return None
+
+    def _row_by_name(self, slug: str) -> int | None:
+        # Binary search over the name index; only ~10 strings are decoded per lookup.
+        low, high = 0, self._name_order.shape[0]
+        while low < high:
+            middle = (low + high) // 2
+            if self.slug(int(self._name_order[middle])) < slug:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._name_order.shape[0]:
+            row = int(self._name_order[low])
+            if self.slug(row) == slug:
+                return row
+        return None
+
+    def _string(self, reference: np.ndarray) -> str:
+        start = self._strings_offset + int(reference[0])
+        return self._mmap[start : start + int(reference[1])].decode("utf-8")
@@ -0,0 +1,383 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from .exceptions import PokeAPIError, PokemonNotFoundError
+from .models import _image_url, _title_case
+
+
+POKEMON_TYPES = (
+    "normal",
+    "fire",
+    "water",
+    "electric",
+    "grass",
+    "ice",
+    "fighting",
+    "poison",
+    "ground",
+    "flying",
+    "psychic",
+    "bug",
+    "rock",
+    "ghost",
+    "dragon",
+    "dark",
+    "steel",
+    "fairy",
+)
+TYPE_BITS = {name: 1 << position for position, name in enumerate(POKEMON_TYPES)}
+
+
+class StatIndex:
+    """Columnar base-stat matrix plus a type bitmask for every indexed Pokémon."""
+
+    STAT_KEYS = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+    # Height and weight keep PokéAPI units: decimetres and hectograms.
+    COLUMNS = ("id", "total", "height", "weight") + STAT_KEYS
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self._lock = threading.Lock()
+        self._rows: Dict[int, int] = {}
+        self.size = 0
+        self.ids = np.zeros(capacity, dtype=np.int32)
+        self.stats = np.zeros((capacity, len(self.STAT_KEYS)), dtype=np.int16)
+        self.totals = np.zeros(capacity, dtype=np.int32)
+        self.type_masks = np.zeros(capacity, dtype=np.uint32)
+        self.heights = np.zeros(capacity, dtype=np.int32)
+        self.weights = np.zeros(capacity, dtype=np.int32)
+        # Running per-stat sums keep the normalization current without rescanning.
+        self._stat_sums = np.zeros(len(self.STAT_KEYS), dtype=np.float64)
+        self._stat_squares = np.zeros(len(self.STAT_KEYS), dtype=np.float64)
+        # Labels of rows added from payloads; rows loaded from a snapshot read theirs
+        # from the memory-mapped file on demand (``_snapshot_rows`` holds -1 otherwise).
+        self._labels: Dict[int, Tuple[str, List[str], str]] = {}
+        self._slugs: Dict[str, int] = {}
+        self._snapshot = None
+        self._snapshot_rows = np.full(capacity, -1, dtype=np.int32)
+
+    @classmethod
+    def from_snapshot(cls, snapshot) -> "StatIndex":
+        """Bulk-load every record of a PokemonSnapshot in one pass over its columns."""
+        count = len(snapshot)
+        index = cls(capacity=max(count, 1))
+        records = snapshot.records
+        index.ids[:count] = records["id"]
+        index.stats[:count] = records["stats"]
+        index.totals[:count] = index.stats[:count].sum(axis=1)
+        index.type_masks[:count] = records["type_mask"]
+        index.heights[:count] = records["height"]
+        index.weights[:count] = records["weight"]
+        index._stat_sums = index.stats[:count].sum(axis=0, dtype=np.float64)
+        index._stat_squares = (index.stats[:count].astype(np.float64) ** 2).sum(axis=0)
+        index._snapshot = snapshot
+        index._snapshot_rows[:count] = np.arange(count, dtype=np.int32)
+        index._rows = {int(identifier): row for row, identifier in enumerate(index.ids[:count])}
+        index.size = count
+        return index
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __contains__(self, identifier: int) -> bool:
+        return identifier in self._rows
+
+    def add(self, payload: dict) -> None:
+        identifier = payload.get("id")
+        if not identifier or identifier in self._rows:
+            return
+
+        base_stats = {
+            entry["stat"]["name"]: entry.get("base_stat", 0) for entry in payload.get("stats", [])
+        }
+        type_names = [entry["type"]["name"] for entry in payload.get("types", [])]
+        mask = 0
+        for type_name in type_names:
+            mask |= TYPE_BITS.get(type_name, 0)
+
+        with self._lock:
+            if identifier in self._rows:
+                return
+            if self.size == len(self.ids):
+                self._grow()
+            row = self.size
+            self.ids[row] = identifier
+            self.stats[row] = [base_stats.get(key, 0) for key in self.STAT_KEYS]
+            self.totals[row] = int(self.stats[row].sum())
+            self._stat_sums += self.stats[row]
+            self._stat_squares += self.stats[row].astype(np.float64) ** 2
+            self.type_masks[row] = mask
+            self.heights[row] = payload.get("height") or 0
+            self.weights[row] = payload.get("weight") or 0
+            self._snapshot_rows[row] = -1
+            self._labels[row] = (
+                _title_case(payload.get("name", "")),
+                [_title_case(name) for name in type_names],
+                _image_url(payload.get("sprites", {})),
+            )
+            self._slugs[payload.get("name", "").lower()] = identifier
+            self._rows[identifier] = row
+            self.size = row + 1
+
+    def remove(self, identifier: int) -> bool:
+        """Drop one Pokémon; the last row moves into its place. False if it was not indexed."""
+        with self._lock:
+            row = self._rows.pop(identifier, None)
+            if row is None:
+                return False
+            self._stat_sums -= self.stats[row]
+            self._stat_squares -= self.stats[row].astype(np.float64) ** 2
+            self._labels.pop(row, None)
+            self._slugs = {slug: value for slug, value in self._slugs.items() if value != identifier}
+            last = self.size - 1
+            if row != last:
+                for column in (
+                    self.ids,
+                    self.stats,
+                    self.totals,
+                    self.type_masks,
+                    self.heights,
+                    self.weights,
+                    self._snapshot_rows,
+                ):
+                    column[row] = column[last]
+                if last in self._labels:
+                    self._labels[row] = self._labels.pop(last)
+                self._rows[int(self.ids[row])] = row
+            self.size = last
+            return True
+
+    def resolve(self, alias: str | int) -> int | None:
+        """Return the id of an indexed Pokémon given its id or PokéAPI name."""
+        key = str(alias).strip().lower()
+        if key.isdigit():
+            identifier = int(key)
+        else:
+            identifier = self._slugs.get(key)
+            if identifier is None and self._snapshot is not None:
+                identifier = self._snapshot.resolve(key)
+        return identifier if identifier in self._rows else None
+
+    def identifiers(self) -> List[int]:
+        with self._lock:
+            return self.ids[: self.size].tolist()
+
+    def column(self, stat: str) -> np.ndarray:
+        if stat == "total":
+            return self.totals[: self.size]
+        if stat == "id":
+            return self.ids[: self.size]
+        if stat == "height":
+            return self.heights[: self.size]
+        if stat == "weight":
+            return self.weights[: self.size]
+        return self.stats[: self.size, self.STAT_KEYS.index(stat)]
+
+    def type_filter(self, type_name: str | None) -> np.ndarray | None:
+        if not type_name:
+            return None
+        return (self.type_masks[: self.size] & TYPE_BITS[type_name]) != 0
+
+    def top(self, stat: str, type_name: str | None = None, limit: int = 20) -> List[dict]:
+        # Held briefly so a concurrent add() cannot swap the arrays mid-query.
+        with self._lock:
+            values = self.column(stat)
+            mask = self.type_filter(type_name)
+            candidates = np.flatnonzero(mask) if mask is not None else np.arange(values.shape[0])
+            scores = values[candidates].astype(np.int32)
+            if limit < scores.shape[0]:
+                best = np.argpartition(-scores, limit - 1)[:limit]
+            else:
+                best = np.arange(scores.shape[0])
+            ordered = best[np.lexsort((self.ids[candidates[best]], -scores[best]))]
+            return [self.row_to_dict(int(candidates[position]), stat) for position in ordered]
+
+    def search(
+        self,
+        ranges: Dict[str, Tuple[float | None, float | None]] | None = None,
+        type_names: Iterable[str] = (),
+        sort: str = "total",
+        descending: bool = True,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> Tuple[int, List[dict]]:
+        """Return the number of matches and one page of them, sorted by ``sort``.
+
+        Every criterion is an inclusive range over a column; Pokémon must have
+        all of ``type_names``.
+        """
+        with self._lock:
+            matches = np.ones(self.size, dtype=bool)
+            for column, (low, high) in (ranges or {}).items():
+                values = self.column(column)
+                if low is not None:
+                    matches &= values >= low
+                if high is not None:
+                    matches &= values <= high
+
+            required = 0
+            for type_name in type_names:
+                required |= TYPE_BITS[type_name]
+            if required:
+                matches &= (self.type_masks[: self.size] & required) == required
+
+            rows = np.flatnonzero(matches)
+            keys = self.column(sort)[rows].astype(np.int64)
+            ordered = rows[np.lexsort((self.ids[rows], -keys if descending else keys))]
+            page = ordered[offset : offset + limit]
+            value = sort if sort in ("total",) + self.STAT_KEYS else None
+            return int(rows.shape[0]), [self.row_to_dict(int(row), value) for row in page]
+
+    def nearest(
+        self, identifier: int, k: int = 5, shared_types: bool = False
+    ) -> Tuple[dict, List[dict]] | None:
+        """Return a Pokémon and the ``k`` closest stat profiles, or None if it is not indexed.
+
+        Distances are Euclidean over per-stat z-scores, so a stat with a wide
+        spread (attack) does not drown out a narrow one (hp).
+        """
+        with self._lock:
+            target = self._rows.get(identifier)
+            if target is None:
+                return None
+            mean = self._stat_sums / self.size
+            spread = np.sqrt(np.maximum(self._stat_squares / self.size - mean**2, 0.0))
+            scale = np.where(spread > 0, spread, 1.0)
+            deltas = (self.stats[: self.size] - self.stats[target]) / scale
+            distances = np.sqrt((deltas**2).sum(axis=1))
+
+            candidates = np.ones(self.size, dtype=bool)
+            candidates[target] = False
+            if shared_types:
+                candidates &= (self.type_masks[: self.size] & self.type_masks[target]) != 0
+            rows = np.flatnonzero(candidates)
+            scores = distances[rows]
+            if k < rows.shape[0]:
+                rows = rows[np.argpartition(scores, k - 1)[:k]]
+            ordered = rows[np.lexsort((self.ids[rows], distances[rows]))]
+
+            neighbours = []
+            for row in ordered:
+                entry = self.row_to_dict(int(row))
+                entry["distance"] = round(float(distances[row]), 4)
+                neighbours.append(entry)
+            return self.row_to_dict(target), neighbours
+
+    def labels(self, row: int) -> Tuple[str, List[str], str]:
+        """Return the display name, type names and image URL of ``row``."""
+        snapshot_row = int(self._snapshot_rows[row])
+        if snapshot_row >= 0:
+            snapshot = self._snapshot
+            return (
+                snapshot.name(snapshot_row),
+                snapshot.type_names(snapshot_row),
+                snapshot.image_url(snapshot_row),
+            )
+        return self._labels[row]
+
+    def row_to_dict(self, row: int, stat: str | None = None) -> dict:
+        name, types, image_url = self.labels(row)
+        payload = {
+            "id": int(self.ids[row]),
+            "name": name,
+            "types": types,
+            "total_stats": int(self.totals[row]),
+            "image_url": image_url,
+            "height_m": round(int(self.heights[row]) / 10, 2),
+            "weight_kg": round(int(self.weights[row]) / 10, 2),
+        }
+        if stat is not None:
+            payload["value"] = int(self.column(stat)[row])
+        return payload
+
+    def _grow(self) -> None:
+        capacity = len(self.ids) * 2
+        self.ids = np.resize(self.ids, capacity)
+        self.stats = np.resize(self.stats, (capacity, len(self.STAT_KEYS)))
+        self.totals = np.resize(self.totals, capacity)
+        self.type_masks = np.resize(self.type_masks, capacity)
+        self.heights = np.resize(self.heights, capacity)
+        self.weights = np.resize(self.weights, capacity)
+        self._snapshot_rows = np.resize(self._snapshot_rows, capacity)
+
+
+class StatIndexCrawler:
+    """Background thread that fills a StatIndex by walking Pokédex numbers.
+
+    Each batch is first read from the cache in one call, so with a shared
+    cache a recycled worker, or one walking a stretch another worker already
+    covered, indexes it without calling PokéAPI. Failed fetches are retried
+    after a growing pause; ``done`` is only set once every number has been
+    indexed or reported missing.
+    """
+
+    BATCH_SIZE = 100
+    MAX_RETRY_DELAY = 60.0
+
+    def __init__(
+        self,
+        index: StatIndex,
+        fetch: Callable[[int], dict],
+        identifiers: Iterable[int],
+        delay: float = 0.05,
+        cached: Callable[[Iterable[int]], Dict[int, dict]] | None = None,
+        retry_delay: float = 1.0,
+    ) -> None:
+        self.index = index
+        self.fetch = fetch
+        self.identifiers = identifiers
+        self.delay = delay
+        self.cached = cached
+        self.retry_delay = retry_delay
+        self.done = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stat-index-crawler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop before the next fetch; ``done`` stays False."""
+        self._stopped.set()
+
+    def join(self, timeout: float | None = None) -> None:
+        self._thread.join(timeout)
+
+    def _run(self) -> None:
+        pending = list(self.identifiers)
+        failures = 0
+        while pending:
+            retry: List[int] = []
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                batch = [
+                    identifier
+                    for identifier in pending[start : start + self.BATCH_SIZE]
+                    if identifier not in self.index
+                ]
+                if self.cached is not None and batch:
+                    for payload in self.cached(batch).values():
+                        self.index.add(payload)
+                for identifier in batch:
+                    if self._stopped.is_set():
+                        return
+                    if identifier in self.index:
+                        continue
+                    try:
+                        self.index.add(self.fetch(identifier))
+                    except PokemonNotFoundError:
+                        pass
+                    except PokeAPIError:
+                        # Back off while PokéAPI struggles and come back to this one later.
+                        retry.append(identifier)
+                        failures += 1
+                        time.sleep(min(self.retry_delay * 2 ** (failures - 1), self.MAX_RETRY_DELAY))
+                        continue
+                    failures = 0
+                    # Space the requests out to stay polite with PokéAPI.
+                    time.sleep(self.delay)
+            pending = retry
+        self.done = True
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+from typing import Dict, List
+
+import numpy as np
+
+from .models import Pokemon, _title_case
+from .stat_index import StatIndex
+
+
+class Tournament:
+    """Round-robin and knockout results for a group of Pokémon.
+
+    As in ``compare_pokemon``, a duel is won by the higher stat total. Unlike
+    it, equal totals are not a draw yet: they go to whoever wins more of the
+    six individual stats, so brackets rarely need the entry-order fallback.
+    """
+
+    STAT_NAMES = tuple(_title_case(key) for key in StatIndex.STAT_KEYS)
+
+    def __init__(self, entrants: List[Pokemon]) -> None:
+        self.entrants = entrants
+        self.stats = np.array(
+            [self._stat_vector(pokemon) for pokemon in entrants], dtype=np.int32
+        ).reshape(len(entrants), len(self.STAT_NAMES))
+        self.totals = np.array([pokemon.total_stats for pokemon in entrants], dtype=np.int32)
+        self.results = self._win_matrix()
+
+    def _win_matrix(self) -> np.ndarray:
+        # results[i, j] is 1 when i beats j, -1 when j beats i and 0 for a draw.
+        by_total = np.sign(self.totals[:, None] - self.totals[None, :])
+        stats_won = (self.stats[:, None, :] > self.stats[None, :, :]).sum(axis=2)
+        by_stats = np.sign(stats_won - stats_won.T)
+        return np.where(by_total != 0, by_total, by_stats).astype(np.int8)
+
+    def standings(self) -> List[dict]:
+        wins = (self.results == 1).sum(axis=1)
+        losses = (self.results == -1).sum(axis=1)
+        draws = len(self.entrants) - 1 - wins - losses
+        ids = np.array([pokemon.identifier for pokemon in self.entrants])
+        order = np.lexsort((ids, -self.totals, -draws, -wins))
+        return [
+            {
+                "rank": rank,
+                **self._entrant(int(position)),
+                "wins": int(wins[position]),
+                "draws": int(draws[position]),
+                "losses": int(losses[position]),
+            }
+            for rank, position in enumerate(order, start=1)
+        ]
+
+    def bracket(self) -> List[dict]:
+        """Single elimination in entry order; an odd entrant out gets a bye."""
+        rounds: List[dict] = []
+        alive = list(range(len(self.entrants)))
+        while len(alive) > 1:
+            matches = []
+            advancing = []
+            for position in range(0, len(alive), 2):
+                first = alive[position]
+                second = alive[position + 1] if position + 1 < len(alive) else None
+                # A draw sends the entrant listed first through.
+                if second is not None and self.results[first, second] < 0:
+                    winner = second
+                else:
+                    winner = first
+                matches.append(
+                    {
+                        "a": self._entrant_id(first),
+                        "b": None if second is None else self._entrant_id(second),
+                        "winner": self._entrant_id(winner),
+                    }
+                )
+                advancing.append(winner)
+            rounds.append({"round": len(rounds) + 1, "matches": matches})
+            alive = advancing
+        return rounds
+
+    def to_dict(self) -> dict:
+        bracket = self.bracket()
+        champion = bracket[-1]["matches"][0]["winner"] if bracket else None
+        return {
+            "pokemon": [self._entrant(position) for position in range(len(self.entrants))],
+            "standings": self.standings(),
+            "results": self.results.tolist(),
+            "bracket": bracket,
+            "champion": champion,
+        }
+
+    def _entrant(self, position: int) -> Dict[str, object]:
+        pokemon = self.entrants[position]
+        return {
+            "id": pokemon.identifier,
+            "name": pokemon.name,
+            "types": pokemon.types,
+            "total_stats": pokemon.total_stats,
+            "image_url": pokemon.image_url,
+        }
+
+    def _entrant_id(self, position: int) -> int:
+        return self.entrants[position].identifier
+
+    @classmethod
+    def _stat_vector(cls, pokemon: Pokemon) -> List[int]:
+        values = {stat.name: stat.value for stat in pokemon.stats}
+        return [values.get(name, 0) for name in cls.STAT_NAMES]
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Dict, Iterable
+
+import numpy as np
+
+from .stat_index import POKEMON_TYPES
+
+
+class TypeChart:
+    """Damage multipliers between every attacking and defending type.
+
+    ``matrix[a, d]`` is the multiplier a move of type ``a`` deals to a Pokémon
+    of type ``d``; rows and columns follow ``POKEMON_TYPES``.
+    """
+
+    POSITIONS = {name: position for position, name in enumerate(POKEMON_TYPES)}
+    RELATIONS = (("double_damage_to", 2.0), ("half_damage_to", 0.5), ("no_damage_to", 0.0))
+
+    def __init__(self, matrix: np.ndarray | None = None) -> None:
+        size = len(POKEMON_TYPES)
+        self.matrix = (
+            np.ones((size, size), dtype=np.float32)
+            if matrix is None
+            else np.asarray(matrix, dtype=np.float32)
+        )
+
+    @classmethod
+    def from_type_payloads(cls, payloads: Dict[str, dict]) -> "TypeChart":
+        """Build the chart from ``type/{name}`` payloads keyed by type name."""
+        chart = cls()
+        for attacker, payload in payloads.items():
+            row = cls.POSITIONS.get(attacker)
+            if row is None:
+                continue
+            relations = payload.get("damage_relations", {})
+            for relation, multiplier in cls.RELATIONS:
+                for entry in relations.get(relation, []):
+                    column = cls.POSITIONS.get(entry.get("name"))
+                    if column is not None:
+                        chart.matrix[row, column] = multiplier
+        return chart
+
+    @classmethod
+    def load(cls, path: str | Path) -> "TypeChart":
+        snapshot = json.loads(Path(path).read_text(encoding="utf-8"))
+        if tuple(snapshot.get("types", ())) != POKEMON_TYPES:
+            raise ValueError(f"{path} was saved for a different list of types")
+        return cls(np.array(snapshot["matrix"], dtype=np.float32))
+
+    def save(self, path: str | Path) -> None:
+        snapshot = {"types": list(POKEMON_TYPES), "matrix": self.matrix.tolist()}
+        Path(path).write_text(json.dumps(snapshot), encoding="utf-8")
+
+    def effectiveness(self, attacking: Iterable[str], defending: Iterable[str]) -> float:
+        """Best multiplier any attacking type achieves against the defender's type combination."""
+        rows = self._positions(attacking)
+        columns = self._positions(defending)
+        if not rows:
+            return 1.0
+        return float(self.matrix[np.ix_(rows, columns)].prod(axis=1).max())
+
+    def _positions(self, type_names: Iterable[str]) -> list:
+        positions = (self.POSITIONS.get(name.strip().lower()) for name in type_names)
+        return [position for position in positions if position is not None]
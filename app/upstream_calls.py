@@ -0,0 +1,26 @@
+from __future__ import annotations
+
+from contextvars import ContextVar, Token
+from typing import List
+
+# PokéAPI URLs requested on behalf of the current request, hedged copies
+# included. Shared with pool workers in the same way as degraded._stale_keys.
+_calls: ContextVar[List[str] | None] = ContextVar("pokedex_upstream_calls", default=None)
+
+
+def begin() -> Token:
+    return _calls.set([])
+
+
+def end(token: Token) -> None:
+    _calls.reset(token)
+
+
+def record(url: str) -> None:
+    calls = _calls.get()
+    if calls is not None:
+        calls.append(url)
+
+
+def count() -> int:
+    return len(_calls.get() or ())
@@ -0,0 +1,127 @@
+"""Compare response throughput of the stdlib and orjson JSON providers.
+
+Every PokéAPI payload is placed in the client cache beforehand, so the numbers
+measure the cached hot path (routing, model building and serialization) only.
+
+    python benchmarks/bench_json.py [--requests 2000]
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app import create_app  # noqa: E402
+from app.json_provider import FastJSONProvider, orjson  # noqa: E402
+from app.regions import PokemonRegions  # noqa: E402
+
+STAT_NAMES = ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+TYPE_NAMES = ("grass", "poison", "fire", "flying", "water", "bug", "normal", "electric")
+
+ENDPOINTS = (
+    "/api/pokemon?q=25",
+    "/api/pokemon/compare?a=1&b=4",
+    "/api/regions/kanto?limit=60&hydrate=true",
+    "/api/types/electric",
+)
+
+
+def fake_pokemon(identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "name": f"pokemon-{identifier}",
+        "height": 7 + identifier % 10,
+        "weight": 60 + identifier,
+        "types": [
+            {"slot": 1, "type": {"name": TYPE_NAMES[identifier % len(TYPE_NAMES)]}},
+            {"slot": 2, "type": {"name": TYPE_NAMES[(identifier + 3) % len(TYPE_NAMES)]}},
+        ],
+        "abilities": [{"ability": {"name": "overgrow"}}, {"ability": {"name": "chlorophyll"}}],
+        "stats": [
+            {"stat": {"name": name}, "base_stat": 40 + (identifier * (index + 3)) % 90}
+            for index, name in enumerate(STAT_NAMES)
+        ],
+        "sprites": {
+            "front_default": f"https://example.com/{identifier}.png",
+            "other": {"official-artwork": {"front_default": f"https://example.com/art/{identifier}.png"}},
+        },
+    }
+
+
+def fake_species(identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "flavor_text_entries": [
+            {"language": {"name": "en"}, "flavor_text": "A strange seed was\nplanted on its back."},
+            {"language": {"name": "es"}, "flavor_text": "Una rara semilla le fue\nplantada en el lomo."},
+        ],
+    }
+
+
+def warm_cache(app) -> None:
+    client = app.extensions["pokemon_service"].client
+    items = {}
+    for identifier in range(1, 152):
+        items[f"pokemon/{identifier}"] = fake_pokemon(identifier)
+        items[f"pokemon-species/{identifier}"] = fake_species(identifier)
+    entries = [
+        {
+            "entry_number": identifier,
+            "pokemon_species": {
+                "name": f"pokemon-{identifier}",
+                "url": f"https://pokeapi.co/api/v2/pokemon-species/{identifier}/",
+            },
+        }
+        for identifier in range(1, 152)
+    ]
+    items[f"pokedex/{PokemonRegions.get('kanto').pokedex}"] = {"pokemon_entries": entries}
+    items["type/electric"] = {
+        "pokemon": [
+            {"pokemon": {"name": f"pokemon-{i}", "url": f"https://pokeapi.co/api/v2/pokemon/{i}/"}}
+            for i in range(1, 80)
+        ]
+    }
+    client.cache.set_many(items, ttl=3600)
+
+
+def run(use_orjson: bool, requests_per_endpoint: int) -> dict:
+    app = create_app()
+    app.json = FastJSONProvider(app, use_orjson=use_orjson)
+    warm_cache(app)
+    client = app.test_client()
+    results = {}
+    for endpoint in ENDPOINTS:
+        assert client.get(endpoint).status_code == 200, endpoint
+        started = time.perf_counter()
+        for _ in range(requests_per_endpoint):
+            client.get(endpoint)
+        elapsed = time.perf_counter() - started
+        results[endpoint] = requests_per_endpoint / elapsed
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per endpoint")
+    args = parser.parse_args()
+
+    if orjson is None:
+        print("orjson is not installed; only the stdlib provider can be measured.")
+        return
+
+    stdlib = run(use_orjson=False, requests_per_endpoint=args.requests)
+    fast = run(use_orjson=True, requests_per_endpoint=args.requests)
+
+    print(f"{'endpoint':48} {'stdlib req/s':>13} {'orjson req/s':>13} {'speedup':>8}")
+    for endpoint in ENDPOINTS:
+        print(
+            f"{endpoint:48} {stdlib[endpoint]:13.0f} {fast[endpoint]:13.0f}"
+            f" {fast[endpoint] / stdlib[endpoint]:7.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
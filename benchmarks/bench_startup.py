@@ -0,0 +1,124 @@
+"""Measure cold-start time: importing the app, create_app() and the first responses.
+
+Every run happens in a fresh interpreter. PokéAPI payloads are placed in the
+cache before the first Pokémon request, so no network is involved. The script
+exits with status 1 when the median time to the first Pokémon response goes
+over the budget.
+
+    python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1000]
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+PHASES = ("import", "create_app", "first_healthz", "first_pokemon")
+
+
+def fake_pokemon(identifier: int) -> dict:
+    return {
+        "id": identifier,
+        "name": f"pokemon-{identifier}",
+        "height": 7,
+        "weight": 69,
+        "types": [{"slot": 1, "type": {"name": "grass"}}],
+        "abilities": [{"ability": {"name": "overgrow"}}],
+        "stats": [
+            {"stat": {"name": name}, "base_stat": 45}
+            for name in ("hp", "attack", "defense", "special-attack", "special-defense", "speed")
+        ],
+        "sprites": {"front_default": f"https://example.com/{identifier}.png"},
+    }
+
+
+def measure() -> dict:
+    """Run inside the child interpreter; returns milliseconds since each phase started."""
+    timings = {}
+    started = time.perf_counter()
+    from app import create_app
+
+    timings["import"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    app = create_app(background_init=os.environ.get("POKEDEX_BACKGROUND_INIT") == "1")
+    timings["create_app"] = time.perf_counter() - started
+
+    client = app.test_client()
+    started = time.perf_counter()
+    assert client.get("/healthz").status_code == 200
+    timings["first_healthz"] = time.perf_counter() - started
+
+    app.extensions["pokemon_service"].client.cache.set_many(
+        {
+            "pokemon/1": fake_pokemon(1),
+            "pokemon-species/1": {"id": 1, "flavor_text_entries": []},
+        },
+        ttl=3600,
+    )
+    started = time.perf_counter()
+    assert client.get("/api/pokemon?q=1").status_code == 200
+    timings["first_pokemon"] = time.perf_counter() - started
+    return {phase: seconds * 1000 for phase, seconds in timings.items()}
+
+
+def run_child(background_init: bool) -> dict:
+    env = dict(os.environ, POKEDEX_BACKGROUND_INIT="1" if background_init else "0")
+    env.pop("POKEDEX_SNAPSHOT", None)
+    output = subprocess.run(
+        [sys.executable, __file__, "--child"],
+        cwd=ROOT,
+        env=env,
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per mode")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=1000,
+        help="maximum median time from import to the first Pokémon response",
+    )
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(measure()))
+        return
+
+    print(f"{'mode':12} " + " ".join(f"{phase:>14}" for phase in PHASES) + f" {'total':>10}")
+    over_budget = False
+    for background_init in (False, True):
+        samples = [run_child(background_init) for _ in range(args.runs)]
+        medians = {phase: statistics.median(sample[phase] for sample in samples) for phase in PHASES}
+        total = statistics.median(sum(sample.values()) for sample in samples)
+        mode = "background" if background_init else "lazy"
+        print(
+            f"{mode:12} "
+            + " ".join(f"{medians[phase]:12.1f}ms" for phase in PHASES)
+            + f" {total:8.1f}ms"
+        )
+        over_budget = over_budget or total > args.budget_ms
+
+    if over_budget:
+        print(f"Startup is over the {args.budget_ms:.0f} ms budget.")
+        sys.exit(1)
+    print(f"Startup is within the {args.budget_ms:.0f} ms budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+"""Replay a recorded access log against a running Pokédex instance.
+
+Reads Common or Combined Log Format lines (gunicorn's default access log),
+keeps the GET/HEAD requests and sends them again with their original spacing
+divided by ``--speedup`` (0 sends them as fast as the workers allow). The
+report groups requests by Flask route and shows latency percentiles, error
+counts and how many PokéAPI calls each route caused, read from the
+``X-Pokedex-Upstream-Calls`` response header or, for NDJSON streams, from the
+trailing ``{"upstream_calls": N}`` line.
+
+    python benchmarks/replay_access_log.py access.log --base-url http://localhost:8000 \\
+        [--speedup 10] [--concurrency 16] [--limit 5000] [--json]
+
+Pair it with POKEDEX_CASSETTE on the target to replay without touching PokéAPI;
+otherwise start the target with POKEDEX_COUNT_UPSTREAM_CALLS=1 to get the counts.
+"""
+from __future__ import annotations
+
+import argparse
+import http.client
+import json
+import re
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List
+from urllib.parse import urlsplit
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+LINE = re.compile(
+    r'^\S+ \S+ \S+ \[(?P<time>[^\]]+)\] "(?P<method>[A-Z]+) (?P<target>\S+)[^"]*" (?P<status>\d{3}) '
+)
+TIME_FORMAT = "%d/%b/%Y:%H:%M:%S %z"
+REPLAYED_METHODS = ("GET", "HEAD")
+# Admin calls need a token and change server state; they are never replayed.
+SKIPPED_PREFIXES = ("/api/admin",)
+UPSTREAM_HEADER = "X-Pokedex-Upstream-Calls"
+UPSTREAM_TRAILER = "upstream_calls"
+
+
+@dataclass
+class LogEntry:
+    offset: float
+    method: str
+    target: str
+    route: str
+
+
+@dataclass
+class Result:
+    route: str
+    status: int | None
+    latency: float
+    upstream_calls: int
+    lag: float
+
+
+def parse_log(lines: Iterable[str], route_for) -> Iterator[LogEntry]:
+    first: datetime | None = None
+    for line in lines:
+        match = LINE.match(line)
+        if match is None or match["method"] not in REPLAYED_METHODS:
+            continue
+        target = match["target"]
+        if target.startswith(SKIPPED_PREFIXES):
+            continue
+        try:
+            timestamp = datetime.strptime(match["time"], TIME_FORMAT)
+        except ValueError:
+            continue
+        first = first or timestamp
+        yield LogEntry(
+            offset=max(0.0, (timestamp - first).total_seconds()),
+            method=match["method"],
+            target=target,
+            route=route_for(target, match["method"]),
+        )
+
+
+def route_matcher():
+    """Map request targets to Flask endpoint names using the app's own URL map."""
+    from werkzeug.exceptions import HTTPException
+
+    from app import create_app
+
+    adapter = create_app().url_map.bind("localhost")
+
+    def route_for(target: str, method: str) -> str:
+        try:
+            endpoint, _ = adapter.match(urlsplit(target).path, method=method)
+        except HTTPException:
+            return "(unmatched)"
+        return endpoint
+
+    return route_for
+
+
+class Replayer:
+    def __init__(self, base_url: str, concurrency: int, timeout: float) -> None:
+        parsed = urlsplit(base_url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
+        self.https = parsed.scheme == "https"
+        self.prefix = parsed.path.rstrip("/")
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def run(self, entries: List[LogEntry], speedup: float) -> List[Result]:
+        results: List[Result] = []
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            futures = []
+            for entry in entries:
+                due = started + (entry.offset / speedup if speedup > 0 else 0.0)
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                futures.append(executor.submit(self._send, entry, due))
+            results = [future.result() for future in futures]
+        return results
+
+    def _connection(self) -> http.client.HTTPConnection:
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            factory = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            connection = factory(self.host, self.port, timeout=self.timeout)
+            self._local.connection = connection
+        return connection
+
+    def _send(self, entry: LogEntry, due: float) -> Result:
+        sent = time.perf_counter()
+        status: int | None = None
+        upstream = 0
+        try:
+            connection = self._connection()
+            connection.request(entry.method, self.prefix + entry.target)
+            response = connection.getresponse()
+            body = response.read()
+            status = response.status
+            upstream = int(response.getheader(UPSTREAM_HEADER) or upstream_trailer(body))
+        except (OSError, http.client.HTTPException):
+            # Drop the connection so the next request on this worker reconnects.
+            self._local.connection = None
+        return Result(
+            route=entry.route,
+            status=status,
+            latency=time.perf_counter() - sent,
+            upstream_calls=upstream,
+            lag=max(0.0, sent - due),
+        )
+
+
+def upstream_trailer(body: bytes) -> int:
+    """Upstream call count from the last line of a streamed NDJSON body, or 0."""
+    last_line = body.rstrip().rpartition(b"\n")[2]
+    if UPSTREAM_TRAILER.encode() not in last_line:
+        return 0
+    try:
+        return int(json.loads(last_line)[UPSTREAM_TRAILER])
+    except (ValueError, TypeError, KeyError):
+        return 0
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(results: List[Result], elapsed: float) -> dict:
+    by_route: Dict[str, List[Result]] = defaultdict(list)
+    for result in results:
+        by_route[result.route].append(result)
+
+    routes = {}
+    for route, group in sorted(by_route.items(), key=lambda item: -len(item[1])):
+        latencies = sorted(result.latency * 1000 for result in group)
+        errors = sum(1 for result in group if result.status is None or result.status >= 500)
+        client_errors = sum(
+            1 for result in group if result.status is not None and 400 <= result.status < 500
+        )
+        upstream = sum(result.upstream_calls for result in group)
+        routes[route] = {
+            "requests": len(group),
+            "p50_ms": round(percentile(latencies, 0.50), 2),
+            "p90_ms": round(percentile(latencies, 0.90), 2),
+            "p99_ms": round(percentile(latencies, 0.99), 2),
+            "max_ms": round(latencies[-1], 2),
+            "error_rate": round(errors / len(group), 4),
+            "client_error_rate": round(client_errors / len(group), 4),
+            "upstream_calls": upstream,
+            "upstream_per_request": round(upstream / len(group), 3),
+        }
+    return {
+        "requests": len(results),
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(results) / elapsed, 1) if elapsed else 0.0,
+        "max_lag_ms": round(max((result.lag for result in results), default=0.0) * 1000, 2),
+        "upstream_calls": sum(result.upstream_calls for result in results),
+        "routes": routes,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['requests']} requests in {report['elapsed_s']} s"
+        f" ({report['throughput_rps']} req/s, max scheduling lag {report['max_lag_ms']} ms,"
+        f" {report['upstream_calls']} PokéAPI calls)"
+    )
+    print(
+        f"{'route':32} {'reqs':>6} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8}"
+        f" {'5xx':>6} {'4xx':>6} {'upstream':>9} {'/req':>6}"
+    )
+    for route, row in report["routes"].items():
+        print(
+            f"{route:32} {row['requests']:6d} {row['p50_ms']:8.1f} {row['p90_ms']:8.1f}"
+            f" {row['p99_ms']:8.1f} {row['max_ms']:8.1f} {row['error_rate']:6.1%}"
+            f" {row['client_error_rate']:6.1%} {row['upstream_calls']:9d}"
+            f" {row['upstream_per_request']:6.2f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", type=argparse.FileType("r", encoding="utf-8"), help="access log ('-' for stdin)")
+    parser.add_argument("--base-url", default="http://localhost:8000", help="instance to replay against")
+    parser.add_argument("--speedup", type=float, default=1.0, help="time compression; 0 = no pauses")
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous connections")
+    parser.add_argument("--timeout", type=float, default=30.0, help="per-request timeout in seconds")
+    parser.add_argument("--limit", type=int, default=0, help="replay only the first N requests")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    entries = list(parse_log(args.log, route_matcher()))
+    if args.limit:
+        entries = entries[: args.limit]
+    if not entries:
+        parser.error("no replayable GET/HEAD requests found in the log")
+
+    replayer = Replayer(args.base_url, concurrency=max(1, args.concurrency), timeout=args.timeout)
+    started = time.perf_counter()
+    results = replayer.run(entries, speedup=args.speedup)
+    report = summarize(results, time.perf_counter() - started)
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+import gc
+import multiprocessing
+import os
+
+bind = os.environ.get("POKEDEX_BIND", "0.0.0.0:8000")
+wsgi_app = "wsgi:app"
+
+# Load the application (and warm its caches) in the master before forking.
+preload_app = True
+
+# Requests spend most of their time waiting on PokéAPI, so threaded workers pay off.
+worker_class = "gthread"
+workers = int(os.environ.get("POKEDEX_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("POKEDEX_THREADS", 4))
+
+timeout = int(os.environ.get("POKEDEX_TIMEOUT", 30))
+graceful_timeout = int(os.environ.get("POKEDEX_GRACEFUL_TIMEOUT", 30))
+keepalive = 5
+
+# Recycle workers now and then; the jitter keeps them from restarting together.
+max_requests = int(os.environ.get("POKEDEX_MAX_REQUESTS", 2000))
+max_requests_jitter = max_requests // 10
+
+accesslog = "-"
+errorlog = "-"
+
+
+def when_ready(server):
+    # Move everything allocated during preload to the permanent generation so the
+    # workers' garbage collector never writes to (and un-shares) those pages.
+    gc.freeze()
+    server.log.info("Pokédex preloaded; %d objects frozen for copy-on-write", gc.get_freeze_count())
+
+
+def post_fork(server, worker):
+    # The master's requests session and cache connections hold pooled sockets;
+    # sharing them between workers would interleave their traffic.
+    server.app.wsgi().extensions["pokemon_service"].after_fork()
+    server.log.info("Worker %s started", worker.pid)
@@ -1,7 +1,11 @@
+import os
+
 from app import create_app
 
 app = create_app()
 
 
 if __name__ == "__main__":
+    if os.environ.get("POKEDEX_BACKGROUND_INIT", "1") != "0":
+        app.extensions["pokemon_service"].preload_in_background()
     app.run(host="0.0.0.0", port=5000, debug=True)
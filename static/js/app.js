@@ -49,6 +49,26 @@ const compareElements = {
 let regionsCatalogue = [];
 let currentRegionKey = '';
 
+const REGION_LIST_LIMIT = 12;
+const initialState = readInitialState();
+
+const RESPONSE_CACHE_LIMIT = 60;
+const RESPONSE_CACHE_FRESH_MS = 5 * 60 * 1000;
+const responseCache = new Map();
+const inflightRequests = new Map();
+const activeControllers = {};
+
+const PREFETCH_INTENT_DELAY_MS = 80;
+const PREFETCH_VISIBLE_DELAY_MS = 600;
+const PREFETCH_MAX_CONCURRENT = 2;
+const PREFETCH_VISIBLE_BUDGET = 6;
+const prefetchQueue = [];
+const visibilityTimers = new WeakMap();
+let prefetchActive = 0;
+let visiblePrefetchBudget = PREFETCH_VISIBLE_BUDGET;
+const visibilityObserver =
+  'IntersectionObserver' in window ? new IntersectionObserver(handleResultVisibility) : null;
+
 if (searchForm) {
   searchForm.addEventListener('submit', async (event) => {
     event.preventDefault();
@@ -63,13 +83,15 @@ if (searchForm) {
 
 if (randomButton) {
   randomButton.addEventListener('click', async () => {
-    await loadPokemon('/api/pokemon/random');
+    await loadPokemon('/api/pokemon/random', { useCache: false });
   });
 }
 
 if (typeSelect) {
   typeSelect.addEventListener('change', async () => {
     const value = typeSelect.value;
+    const controller = beginRequest('type');
+    stopObservingResults(typeResults);
     typeResults.innerHTML = '';
     if (!value) {
       return;
@@ -77,14 +99,16 @@ if (typeSelect) {
 
     renderTypeLoading();
     try {
-      const response = await fetch(`/api/types/${value}`);
-      const payload = await response.json();
-      if (!response.ok) {
-        throw new Error(payload.error || 'Ocurrio un problema al cargar el tipo.');
-      }
+      const payload = await fetchJson(
+        `/api/types/${value}`,
+        'Ocurrio un problema al cargar el tipo.',
+        { signal: controller.signal }
+      );
       renderTypeResults(payload.pokemon);
     } catch (error) {
-      renderTypeError(error.message);
+      if (!isAbortError(error)) {
+        renderTypeError(error.message);
+      }
     }
   });
 }
@@ -100,15 +124,15 @@ if (compareForm) {
       return;
     }
 
+    const controller = beginRequest('compare');
     showCompareMessage('Preparando el combate...');
     try {
-      const response = await fetch(
-        `/api/pokemon/compare?a=${encodeURIComponent(first)}&b=${encodeURIComponent(second)}`
+      const payload = await fetchJson(
+        `/api/pokemon/compare?a=${encodeURIComponent(first)}&b=${encodeURIComponent(second)}`,
+        'No pudimos comparar a esos Pokémon.',
+        { signal: controller.signal }
       );
-      const payload = await response.json();
-      if (!response.ok) {
-        throw new Error(payload.error || 'No pudimos comparar a esos Pokémon.');
-      }
+      (payload.pokemon || []).forEach(rememberPokemon);
       renderComparison(payload);
       showCompareMessage('');
       if (compareResultsBox) {
@@ -116,6 +140,9 @@ if (compareForm) {
         compareResultsBox.scrollIntoView({ behavior: 'smooth', block: 'center' });
       }
     } catch (error) {
+      if (isAbortError(error)) {
+        return;
+      }
       showCompareMessage(error.message || 'Algo salió mal en la comparación.');
       if (compareResultsBox) {
         compareResultsBox.hidden = true;
@@ -148,24 +175,227 @@ if (regionTravelButton) {
 }
 
 initRegionExplorer();
-loadPokemon('/api/pokemon/random');
+loadPokemon('/api/pokemon/random', { useCache: false });
+registerServiceWorker();
 
-async function loadPokemon(endpoint) {
+async function loadPokemon(endpoint, options = {}) {
+  const controller = beginRequest('pokemon');
   showMessage('Cargando tu Pokemon...');
   try {
-    const response = await fetch(endpoint);
-    const payload = await response.json();
-    if (!response.ok) {
-      throw new Error(payload.error || 'No pudimos encontrar ese Pokemon.');
-    }
+    const payload = await fetchJson(endpoint, 'No pudimos encontrar ese Pokemon.', {
+      ...options,
+      signal: controller.signal,
+    });
+    rememberPokemon(payload);
     renderPokemon(payload);
     showMessage('');
   } catch (error) {
+    if (isAbortError(error)) {
+      return;
+    }
     showMessage(error.message || 'Vaya, algo salio mal.');
     card.hidden = true;
   }
 }
 
+async function fetchJson(url, errorMessage, { useCache = true, signal } = {}) {
+  const cached = responseCache.get(url);
+  if (useCache && isFresh(cached)) {
+    touchCacheEntry(url, cached);
+    return cached.payload;
+  }
+  const inflight = useCache ? inflightRequests.get(url) : null;
+  if (inflight && !inflight.signal?.aborted) {
+    return abortable(inflight.request, signal).catch((error) => {
+      // The request we joined was cancelled by its owner; ours is still wanted.
+      if (isAbortError(error) && !signal?.aborted) {
+        return fetchJson(url, errorMessage, { useCache, signal });
+      }
+      throw error;
+    });
+  }
+
+  const request = requestJson(url, errorMessage, { useCache, signal, cached });
+  if (useCache) {
+    const entry = { request, signal };
+    const release = () => {
+      if (inflightRequests.get(url) === entry) {
+        inflightRequests.delete(url);
+      }
+    };
+    inflightRequests.set(url, entry);
+    request.then(release, release);
+    // Forget aborted requests right away so a repeat of the same URL starts afresh.
+    signal?.addEventListener('abort', release, { once: true });
+  }
+  return request;
+}
+
+async function requestJson(url, errorMessage, { useCache, signal, cached }) {
+  const headers = {};
+  if (useCache && cached?.etag) {
+    headers['If-None-Match'] = cached.etag;
+  }
+  const response = await fetch(url, { headers, signal });
+  if (response.status === 304 && cached) {
+    touchCacheEntry(url, { ...cached, storedAt: Date.now() });
+    return cached.payload;
+  }
+
+  const payload = await response.json();
+  if (!response.ok) {
+    throw new Error(payload.error || errorMessage);
+  }
+  if (useCache) {
+    storeCacheEntry(url, payload, response.headers.get('ETag'));
+  }
+  return payload;
+}
+
+function isFresh(entry) {
+  return Boolean(entry) && Date.now() - entry.storedAt < RESPONSE_CACHE_FRESH_MS;
+}
+
+function abortable(promise, signal) {
+  if (!signal) {
+    return promise;
+  }
+  return new Promise((resolve, reject) => {
+    const onAbort = () => reject(new DOMException('Petición cancelada', 'AbortError'));
+    if (signal.aborted) {
+      onAbort();
+      return;
+    }
+    signal.addEventListener('abort', onAbort, { once: true });
+    promise.then(resolve, reject).then(() => signal.removeEventListener('abort', onAbort));
+  });
+}
+
+function beginRequest(channel) {
+  // Only the latest request per channel matters; superseded ones are cancelled on the wire.
+  activeControllers[channel]?.abort();
+  const controller = new AbortController();
+  activeControllers[channel] = controller;
+  return controller;
+}
+
+function isAbortError(error) {
+  return Boolean(error) && error.name === 'AbortError';
+}
+
+function pokemonUrl(id) {
+  return `/api/pokemon?q=${encodeURIComponent(id)}`;
+}
+
+function rememberPokemon(payload) {
+  if (payload && payload.id) {
+    storeCacheEntry(pokemonUrl(payload.id), payload, null);
+  }
+}
+
+function enablePrefetch(button, id) {
+  let intentTimer = null;
+  const startIntent = () => {
+    clearTimeout(intentTimer);
+    intentTimer = setTimeout(() => prefetchPokemon(id), PREFETCH_INTENT_DELAY_MS);
+  };
+  const cancelIntent = () => clearTimeout(intentTimer);
+  button.addEventListener('pointerenter', startIntent);
+  button.addEventListener('focus', startIntent);
+  button.addEventListener('pointerleave', cancelIntent);
+  button.addEventListener('blur', cancelIntent);
+
+  if (visibilityObserver) {
+    button.dataset.pokemonId = id;
+    visibilityObserver.observe(button);
+  }
+}
+
+function handleResultVisibility(entries) {
+  entries.forEach((entry) => {
+    const button = entry.target;
+    clearTimeout(visibilityTimers.get(button));
+    if (!entry.isIntersecting) {
+      return;
+    }
+    const timer = setTimeout(() => {
+      visibilityObserver.unobserve(button);
+      if (visiblePrefetchBudget > 0) {
+        visiblePrefetchBudget -= 1;
+        prefetchPokemon(button.dataset.pokemonId);
+      }
+    }, PREFETCH_VISIBLE_DELAY_MS);
+    visibilityTimers.set(button, timer);
+  });
+}
+
+function stopObservingResults(container) {
+  if (!visibilityObserver || !container) {
+    return;
+  }
+  container.querySelectorAll('button[data-pokemon-id]').forEach((button) => {
+    clearTimeout(visibilityTimers.get(button));
+    visibilityObserver.unobserve(button);
+  });
+  visiblePrefetchBudget = PREFETCH_VISIBLE_BUDGET;
+}
+
+function prefetchPokemon(id) {
+  if (!id || navigator.connection?.saveData) {
+    return;
+  }
+  const url = pokemonUrl(id);
+  if (isFresh(responseCache.get(url)) || inflightRequests.has(url) || prefetchQueue.includes(url)) {
+    return;
+  }
+  prefetchQueue.push(url);
+  drainPrefetchQueue();
+}
+
+function drainPrefetchQueue() {
+  while (prefetchActive < PREFETCH_MAX_CONCURRENT && prefetchQueue.length) {
+    const url = prefetchQueue.shift();
+    prefetchActive += 1;
+    fetchJson(url, '')
+      .catch(() => {})
+      .then(() => {
+        prefetchActive -= 1;
+        drainPrefetchQueue();
+      });
+  }
+}
+
+function storeCacheEntry(url, payload, etag) {
+  touchCacheEntry(url, { payload, etag, storedAt: Date.now() });
+  while (responseCache.size > RESPONSE_CACHE_LIMIT) {
+    responseCache.delete(responseCache.keys().next().value);
+  }
+}
+
+function touchCacheEntry(url, entry) {
+  // A Map iterates in insertion order, so re-inserting keeps the oldest entry first.
+  responseCache.delete(url);
+  responseCache.set(url, entry);
+}
+
+function registerServiceWorker() {
+  if (!('serviceWorker' in navigator)) {
+    return;
+  }
+  navigator.serviceWorker
+    .register('/sw.js')
+    .then((registration) => {
+      const shell = Array.from(
+        document.querySelectorAll('link[rel="stylesheet"][href^="/static/"], script[src^="/static/"]')
+      ).map((element) => element.getAttribute('href') || element.getAttribute('src'));
+      const worker = registration.active || registration.waiting || registration.installing;
+      if (worker) {
+        worker.postMessage({ type: 'cache-shell', urls: ['/', ...shell] });
+      }
+    })
+    .catch(() => {});
+}
+
 function renderPokemon(data) {
   nameEl.textContent = data.name;
   descEl.textContent = data.description;
@@ -236,9 +466,10 @@ function renderTypeResults(list) {
     button.type = 'button';
     button.textContent = item.name;
     button.addEventListener('click', () => {
-      loadPokemon(`/api/pokemon?q=${encodeURIComponent(item.id)}`);
+      loadPokemon(pokemonUrl(item.id));
       typeSelect.value = '';
     });
+    enablePrefetch(button, item.id);
     typeResults.appendChild(button);
   });
 }
@@ -299,24 +530,42 @@ async function initRegionExplorer() {
 
   showRegionMessage('Cargando el mapa del mundo Pokémon...');
   try {
-    const catalogue = await fetchRegionsCatalogue();
+    const catalogue = initialState.regions?.length
+      ? initialState.regions
+      : await fetchRegionsCatalogue();
     regionsCatalogue = catalogue;
     populateRegionSelect(catalogue);
     const initial = catalogue[0]?.key;
-    if (initial) {
-      await loadRegion(initial, { announce: '¡Bienvenido al modo explorador!' });
+    const announce = '¡Bienvenido al modo explorador!';
+    if (initial && initialState.region?.region?.key === initial) {
+      storeCacheEntry(regionUrl(initial), initialState.region, null);
+      renderRegion(initialState.region, announce);
+    } else if (initial) {
+      await loadRegion(initial, { announce });
     }
   } catch (error) {
     showRegionMessage(error.message || 'No pudimos cargar las regiones.');
   }
 }
 
-async function fetchRegionsCatalogue() {
-  const response = await fetch('/api/regions');
-  const payload = await response.json();
-  if (!response.ok) {
-    throw new Error(payload.error || 'No pudimos conseguir el mapa de regiones.');
+function readInitialState() {
+  const element = document.getElementById('initial-state');
+  if (!element) {
+    return {};
   }
+  try {
+    return JSON.parse(element.textContent) || {};
+  } catch (error) {
+    return {};
+  }
+}
+
+function regionUrl(regionKey) {
+  return `/api/regions/${regionKey}?limit=${REGION_LIST_LIMIT}`;
+}
+
+async function fetchRegionsCatalogue() {
+  const payload = await fetchJson('/api/regions', 'No pudimos conseguir el mapa de regiones.');
   return payload.regions || [];
 }
 
@@ -335,16 +584,20 @@ async function loadRegion(regionKey, options = {}) {
   if (!regionKey) {
     return;
   }
+  const controller = beginRequest('region');
   showRegionMessage('Preparando la mochila para viajar...');
   try {
-    const response = await fetch(`/api/regions/${regionKey}?limit=12`);
-    const payload = await response.json();
-    if (!response.ok) {
-      throw new Error(payload.error || 'No pudimos visitar esa región.');
-    }
+    const payload = await fetchJson(
+      regionUrl(regionKey),
+      'No pudimos visitar esa región.',
+      { signal: controller.signal }
+    );
     renderRegion(payload, options.announce);
     showRegionMessage('');
   } catch (error) {
+    if (isAbortError(error)) {
+      return;
+    }
     showRegionMessage(error.message || 'Hubo un problema al explorar la región.');
   }
 }
@@ -396,6 +649,7 @@ function renderRegionPokemon(list) {
   if (!regionPokemonList) {
     return;
   }
+  stopObservingResults(regionPokemonList);
   regionPokemonList.innerHTML = '';
   if (!Array.isArray(list) || !list.length) {
     regionPokemonList.innerHTML = '<p class="empty">Aún no hay Pokémon registrados en esta región.</p>';
@@ -407,8 +661,9 @@ function renderRegionPokemon(list) {
     button.type = 'button';
     button.innerHTML = `<span>#${String(item.id).padStart(3, '0')}</span><span>${item.name}</span>`;
     button.addEventListener('click', () => {
-      loadPokemon(`/api/pokemon?q=${encodeURIComponent(item.id)}`);
+      loadPokemon(pokemonUrl(item.id));
     });
+    enablePrefetch(button, item.id);
     regionPokemonList.appendChild(button);
   });
 }
@@ -0,0 +1,112 @@
+const SHELL_CACHE = 'pokedex-shell-v2';
+const POKEMON_CACHE = 'pokedex-pokemon-v2';
+const API_CACHE = 'pokedex-api-v2';
+const POKEMON_CACHE_LIMIT = 40;
+const API_CACHE_LIMIT = 60;
+const KNOWN_CACHES = [SHELL_CACHE, POKEMON_CACHE, API_CACHE];
+
+self.addEventListener('install', (event) => {
+  event.waitUntil(caches.open(SHELL_CACHE).then((cache) => cache.add('/')));
+  self.skipWaiting();
+});
+
+self.addEventListener('activate', (event) => {
+  event.waitUntil(
+    caches
+      .keys()
+      .then((names) =>
+        Promise.all(names.filter((name) => !KNOWN_CACHES.includes(name)).map((name) => caches.delete(name)))
+      )
+      .then(() => self.clients.claim())
+  );
+});
+
+self.addEventListener('message', (event) => {
+  const data = event.data || {};
+  if (data.type === 'cache-shell' && Array.isArray(data.urls)) {
+    event.waitUntil(caches.open(SHELL_CACHE).then((cache) => cache.addAll(data.urls)));
+  }
+});
+
+self.addEventListener('fetch', (event) => {
+  const { request } = event;
+  if (request.method !== 'GET') {
+    return;
+  }
+  const url = new URL(request.url);
+  if (url.origin !== self.location.origin) {
+    return;
+  }
+
+  if (request.mode === 'navigate') {
+    event.respondWith(networkFirst(request, SHELL_CACHE, '/'));
+  } else if (url.pathname.startsWith('/static/dist/')) {
+    // Hashed file names never change content, so the cached copy is always right.
+    event.respondWith(cacheFirst(request, SHELL_CACHE));
+  } else if (url.pathname.startsWith('/static/')) {
+    // Unhashed files (no asset manifest) keep their URL across deploys; refresh them behind the cache.
+    event.respondWith(staleWhileRevalidate(request, SHELL_CACHE));
+  } else if (url.pathname === '/api/pokemon' && url.searchParams.has('q')) {
+    event.respondWith(staleWhileRevalidate(request, POKEMON_CACHE, POKEMON_CACHE_LIMIT));
+  } else if (url.pathname.startsWith('/api/') && url.pathname !== '/api/pokemon/random') {
+    event.respondWith(networkFirst(request, API_CACHE, null, API_CACHE_LIMIT));
+  }
+});
+
+async function cacheFirst(request, cacheName) {
+  const cached = await caches.match(request);
+  if (cached) {
+    return cached;
+  }
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(cacheName);
+    cache.put(request, response.clone());
+  }
+  return response;
+}
+
+async function networkFirst(request, cacheName, fallbackUrl, limit) {
+  const cache = await caches.open(cacheName);
+  try {
+    const response = await fetch(request);
+    if (response.ok && isCacheable(response)) {
+      cache.put(fallbackUrl || request, response.clone()).then(() => limit && trimCache(cache, limit));
+    }
+    return response;
+  } catch (error) {
+    const cached = await cache.match(fallbackUrl || request);
+    if (cached) {
+      return cached;
+    }
+    throw error;
+  }
+}
+
+async function staleWhileRevalidate(request, cacheName, limit) {
+  const cache = await caches.open(cacheName);
+  const cached = await cache.match(request);
+  const network = fetch(request)
+    .then(async (response) => {
+      if (response.ok) {
+        await cache.put(request, response.clone());
+        if (limit) {
+          await trimCache(cache, limit);
+        }
+      }
+      return response;
+    })
+    .catch(() => cached);
+  return cached || network;
+}
+
+function isCacheable(response) {
+  // NDJSON streams are consumed as they arrive; keeping a copy would only buffer them.
+  return !(response.headers.get('Content-Type') || '').startsWith('application/x-ndjson');
+}
+
+async function trimCache(cache, limit) {
+  const keys = await cache.keys();
+  // Cache keys come back in insertion order, so the oldest responses are dropped first.
+  await Promise.all(keys.slice(0, Math.max(0, keys.length - limit)).map((key) => cache.delete(key)));
+}
@@ -0,0 +1,105 @@
+import pytest
+from flask import Flask
+
+from app.admin import AdminController
+
+
+class ServiceStub:
+    def __init__(self):
+        self.invalidated = []
+
+    def cache_report(self, top=10):
+        return {"entries": 3, "top": top}
+
+    def invalidate_pokemon(self, identifier):
+        self.invalidated.append(("pokemon", identifier))
+        return {"removed": [f"pokemon/{identifier}"], "epoch": 1}
+
+    def invalidate_namespace(self, namespace):
+        if namespace == "admin":
+            raise ValueError("Espacio de caché desconocido.")
+        self.invalidated.append(("namespace", namespace))
+        return {"removed": 4, "epoch": 2}
+
+    def rewarm(self, refresh=False):
+        self.invalidated.append(("rewarm", refresh))
+        return {"started": True}
+
+    def warm_up(self, refresh=False):
+        return {"warm": True}
+
+    def ensure_stat_crawl(self, wait=False, timeout=None):
+        self.invalidated.append(("crawl", timeout))
+        return False
+
+    def export_snapshot(self, path):
+        return 42
+
+
+def make_app(token):
+    app = Flask(__name__)
+    service = ServiceStub()
+    AdminController(service=service, token=token).register(app)
+    return app, service
+
+
+@pytest.fixture
+def admin_client():
+    app, service = make_app("s3cret")
+    return app.test_client(), service
+
+
+def test_admin_endpoints_are_hidden_without_token():
+    app, _ = make_app(None)
+    assert app.test_client().get("/api/admin/cache").status_code == 404
+
+
+def test_admin_endpoints_require_the_token(admin_client):
+    client, _ = admin_client
+
+    assert client.get("/api/admin/cache").status_code == 401
+    assert client.get("/api/admin/cache", headers={"X-Admin-Token": "nope"}).status_code == 401
+    response = client.get("/api/admin/cache?top=3", headers={"Authorization": "Bearer s3cret"})
+    assert response.status_code == 200
+    assert response.get_json() == {"entries": 3, "top": 3}
+    assert response.headers["Cache-Control"] == "no-store"
+
+
+def test_admin_invalidate_and_rewarm(admin_client):
+    client, service = admin_client
+    headers = {"X-Admin-Token": "s3cret"}
+
+    def invalidate(body):
+        return client.post("/api/admin/cache/invalidate", json=body, headers=headers).status_code
+
+    assert invalidate({"pokemon": "25"}) == 200
+    assert invalidate({"namespace": "type"}) == 200
+    assert invalidate({"namespace": "admin"}) == 400
+    assert invalidate({}) == 400
+    assert client.post("/api/admin/cache/rewarm", headers=headers).status_code == 202
+    assert service.invalidated == [("pokemon", "25"), ("namespace", "type"), ("rewarm", True)]
+
+
+def test_cache_cli_invalidates_a_pokemon():
+    app, service = make_app(None)
+    runner = app.test_cli_runner()
+
+    result = runner.invoke(args=["cache", "invalidate", "--pokemon", "pikachu"])
+    usage = runner.invoke(args=["cache", "invalidate"])
+
+    assert result.exit_code == 0
+    assert '"epoch": 1' in result.output
+    assert usage.exit_code != 0
+    assert service.invalidated == [("pokemon", "pikachu")]
+
+
+def test_cache_cli_writes_a_partial_snapshot_when_the_crawl_times_out(tmp_path):
+    app, service = make_app(None)
+    path = str(tmp_path / "pokedex.bin")
+
+    result = app.test_cli_runner().invoke(args=["cache", "snapshot", path, "--timeout", "5"])
+
+    assert result.exit_code == 0
+    assert f"42 Pokémon -> {path}" in result.output
+    assert "partial" in result.output
+    assert service.invalidated == [("crawl", 5.0)]
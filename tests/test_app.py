@@ -0,0 +1,24 @@
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def test_create_app_defers_heavy_imports():
+    script = (
+        "import sys\n"
+        "from app import create_app\n"
+        "create_app()\n"
+        "print(sorted(name for name in ('numpy', 'requests') if name in sys.modules))\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script],
+        cwd=ROOT,
+        env={"PATH": ""},
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+
+    assert output.strip() == "[]"
@@ -0,0 +1,104 @@
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Loads static/js/app.js into a bare VM context (no DOM elements) with a fake
+# fetch that honours AbortSignal, then runs the scenario passed on stdin.
+HARNESS = r"""
+const fs = require('fs');
+const vm = require('vm');
+
+const calls = [];
+function fakeFetch(url, { signal } = {}) {
+  calls.push(url);
+  return new Promise((resolve, reject) => {
+    signal?.addEventListener('abort', () => reject(new DOMException('aborted', 'AbortError')));
+    if (!url.startsWith('/api/pokemon?q=')) {
+      return;
+    }
+    setTimeout(() => resolve({
+      status: 200,
+      ok: true,
+      headers: { get: () => null },
+      json: async () => ({ id: 25, name: 'Pikachu' }),
+    }), 5);
+  });
+}
+
+const context = {
+  document: { getElementById: () => null, querySelectorAll: () => [] },
+  navigator: {},
+  fetch: fakeFetch,
+  AbortController,
+  DOMException,
+  setTimeout,
+  clearTimeout,
+  console,
+};
+context.window = context;
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(process.argv[1], 'utf8'), context);
+
+const scenario = fs.readFileSync(0, 'utf8');
+vm.runInContext(scenario, context)(calls).then(
+  (result) => console.log(JSON.stringify(result)),
+  (error) => console.log(JSON.stringify({ error: String(error) }))
+);
+"""
+
+
+def run_scenario(scenario: str) -> dict:
+    output = subprocess.run(
+        ["node", "-e", HARNESS, str(ROOT / "static" / "js" / "app.js")],
+        input=scenario,
+        check=True,
+        capture_output=True,
+        text=True,
+        timeout=20,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_repeating_a_superseded_request_fetches_again():
+    result = run_scenario(
+        """
+        (async (calls) => {
+          const url = '/api/pokemon?q=25';
+          const first = beginRequest('pokemon');
+          const superseded = fetchJson(url, 'error', { signal: first.signal }).then(
+            () => false,
+            (error) => isAbortError(error)
+          );
+          const second = beginRequest('pokemon');
+          const payload = await fetchJson(url, 'error', { signal: second.signal });
+          const aborted = await superseded;
+          return { payload, aborted, fetches: calls.filter((call) => call === url).length };
+        })
+        """
+    )
+
+    assert result == {"payload": {"id": 25, "name": "Pikachu"}, "aborted": True, "fetches": 2}
+
+
+@pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+def test_joined_request_survives_its_owner_being_cancelled():
+    result = run_scenario(
+        """
+        (async (calls) => {
+          const url = '/api/pokemon?q=25';
+          const owner = new AbortController();
+          fetchJson(url, 'error', { signal: owner.signal }).catch(() => null);
+          const click = fetchJson(url, 'error', { signal: beginRequest('pokemon').signal });
+          owner.abort();
+          return { payload: await click };
+        })
+        """
+    )
+
+    assert result == {"payload": {"id": 25, "name": "Pikachu"}}
@@ -0,0 +1,73 @@
+import json
+
+import pytest
+from flask import Flask, render_template_string
+
+from app.assets import AssetPipeline, minify_css, minify_js
+
+
+@pytest.fixture
+def pipeline_app(tmp_path):
+    static_dir = tmp_path / "static"
+    (static_dir / "js").mkdir(parents=True)
+    (static_dir / "css").mkdir()
+    (static_dir / "js" / "app.js").write_text(
+        "// comentario\nconst url = 'https://pokeapi.co';\n\n  loadPokemon(url);\n"
+    )
+    (static_dir / "css" / "style.css").write_text(
+        "/* tema */\nbody {\n  margin: 0;\n  color: red;\n}\n"
+    )
+    app = Flask(__name__, static_folder=str(static_dir))
+    pipeline = AssetPipeline(static_dir)
+    pipeline.register(app)
+    app.testing = True
+    return app, pipeline, static_dir
+
+
+def test_minifiers_strip_comments_and_whitespace():
+    assert minify_css("/* x */ a , b {\n color: red ;\n}") == "a,b{color:red}"
+    assert minify_js("// x\n  const a = 'http://x';\n\n") == "const a = 'http://x';\n"
+
+
+def test_build_writes_hashed_files_and_manifest(pipeline_app):
+    _, pipeline, static_dir = pipeline_app
+
+    manifest = pipeline.build()
+
+    js_output = manifest["js/app.js"]
+    assert js_output.startswith("dist/app.") and js_output.endswith(".js")
+    assert (static_dir / js_output).read_text().startswith("const url")
+    assert (static_dir / (js_output + ".gz")).is_file()
+    assert json.loads(pipeline.manifest_path.read_text()) == manifest
+
+
+def test_build_assets_command_reports_each_bundle(pipeline_app):
+    app, pipeline, _ = pipeline_app
+
+    result = app.test_cli_runner().invoke(args=["build-assets"])
+
+    assert result.exit_code == 0
+    assert f"js/app.js -> {pipeline.manifest()['js/app.js']}" in result.output
+
+
+def test_asset_url_uses_manifest_and_falls_back(pipeline_app):
+    app, pipeline, _ = pipeline_app
+    with app.test_request_context():
+        assert render_template_string("{{ asset_url('js/app.js') }}") == "/static/js/app.js"
+        manifest = pipeline.build()
+        rendered = render_template_string("{{ asset_url('css/style.css') }}")
+    assert rendered == f"/static/{manifest['css/style.css']}"
+
+
+def test_hashed_assets_are_served_immutable(pipeline_app):
+    app, pipeline, _ = pipeline_app
+    manifest = pipeline.build()
+    client = app.test_client()
+
+    hashed = client.get(f"/static/{manifest['js/app.js']}")
+    source = client.get("/static/js/app.js")
+
+    assert "immutable" in hashed.headers["Cache-Control"]
+    assert "immutable" not in source.headers.get("Cache-Control", "")
+    hashed.close()
+    source.close()
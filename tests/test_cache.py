@@ -0,0 +1,272 @@
+import fnmatch
+import socketserver
+import threading
+import time
+
+import pytest
+
+from app.cache import (
+    CacheStats,
+    MemoryCache,
+    RedisCache,
+    SQLiteCache,
+    create_cache,
+    deserialize,
+    encoded_size,
+    serialize,
+)
+
+
+class FakeRedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            command = self._read_command()
+            if command is None:
+                return
+            self.server.commands.append(command[0].upper())
+            self.wfile.write(self._dispatch(command))
+
+    def _read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        arguments = []
+        for _ in range(int(header[1:-2])):
+            length = int(self.rfile.readline()[1:-2])
+            arguments.append(self.rfile.read(length + 2)[:-2])
+        arguments[0] = arguments[0].decode()
+        return arguments
+
+    def _dispatch(self, command):
+        name, args = command[0].upper(), command[1:]
+        store = self.server.store
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in store.items() if expires and expires < now]:
+            del store[key]
+        if name in ("PING", "SELECT"):
+            return b"+OK\r\n"
+        if name == "SET":
+            expires = now + int(args[3]) / 1000 if len(args) > 3 else None
+            store[args[0]] = (args[1], expires)
+            return b"+OK\r\n"
+        if name == "MGET":
+            return self._array([store.get(key, (None,))[0] for key in args])
+        if name == "EXISTS":
+            return b":%d\r\n" % sum(key in store for key in args)
+        if name == "PTTL":
+            if args[0] not in store:
+                return b":-2\r\n"
+            expires = store[args[0]][1]
+            return b":%d\r\n" % (int((expires - now) * 1000) if expires else -1)
+        if name == "STRLEN":
+            return b":%d\r\n" % len(store.get(args[0], (b"",))[0])
+        if name == "DEL":
+            removed = sum(store.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % removed
+        if name == "SCAN":
+            pattern = args[2].decode()
+            keys = [key for key in store if fnmatch.fnmatchcase(key.decode(), pattern)]
+            return b"*2\r\n$1\r\n0\r\n" + self._array(keys)
+        return b"-ERR unknown command\r\n"
+
+    @staticmethod
+    def _array(items):
+        parts = [b"*%d\r\n" % len(items)]
+        for item in items:
+            parts.append(b"$-1\r\n" if item is None else b"$%d\r\n%s\r\n" % (len(item), item))
+        return b"".join(parts)
+
+
+@pytest.fixture
+def fake_redis():
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeRedisHandler)
+    server.daemon_threads = True
+    server.store = {}
+    server.commands = []
+    thread = threading.Thread(target=server.serve_forever, args=(0.01,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(params=["memory", "sqlite", "redis"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        return MemoryCache()
+    if request.param == "sqlite":
+        return SQLiteCache(str(tmp_path / "cache.db"))
+    host, port = request.getfixturevalue("fake_redis").server_address
+    return RedisCache(host=host, port=port)
+
+
+def test_serialization_round_trip_is_compact():
+    payload = {"name": "pikachu", "moves": [{"move": {"name": "thunderbolt"}}] * 50}
+    blob = serialize(payload)
+
+    assert deserialize(blob) == payload
+    assert len(blob) < len(str(payload)) / 4
+
+
+def test_backend_get_set_delete(backend):
+    backend.set("pokemon/25", {"name": "pikachu"}, ttl=60)
+
+    assert backend.get("pokemon/25") == {"name": "pikachu"}
+    backend.delete("pokemon/25")
+    assert backend.get("pokemon/25") is None
+
+
+def test_backend_multi_get_returns_only_hits(backend):
+    backend.set_many({"pokemon/1": {"id": 1}, "pokemon/4": {"id": 4}}, ttl=60)
+
+    found = backend.get_many(["pokemon/1", "pokemon/2", "pokemon/4"])
+
+    assert found == {"pokemon/1": {"id": 1}, "pokemon/4": {"id": 4}}
+
+
+def test_backend_expires_entries(backend):
+    backend.set("type/fire", {"name": "fire"}, ttl=0.01)
+    time.sleep(0.05)
+
+    assert backend.get("type/fire") is None
+
+
+def test_backend_clear(backend):
+    backend.set("pokemon/7", {"id": 7}, ttl=60)
+    backend.clear()
+
+    assert backend.get("pokemon/7") is None
+
+
+def test_backend_delete_prefix_and_size(backend):
+    backend.set_many({"type/fire": {"n": 1}, "type/water": {"n": 2}, "pokemon/7": {"id": 7}}, ttl=60)
+
+    assert backend.size()["entries"] == 3
+    assert backend.delete_prefix("type/") == 2
+    assert backend.get("pokemon/7") == {"id": 7}
+    size = backend.size()
+    assert size["entries"] == 1
+    measure = encoded_size if isinstance(backend, MemoryCache) else (lambda value: len(serialize(value)))
+    assert size["bytes"] == measure({"id": 7})
+
+
+def test_memory_cache_measures_entries_when_they_are_stored(monkeypatch):
+    cache = MemoryCache(max_entries=2)
+    payload = {"id": 25, "name": "pikachu"}
+    cache.set_many({"pokemon/25": payload, "pokemon/pikachu": payload}, ttl=60)
+    cache.set("pokemon/25", payload, ttl=60)
+    cache.set("type/fire", {"n": 1}, ttl=60)
+
+    expected = encoded_size(payload) + encoded_size({"n": 1})
+
+    def fail(_value):
+        raise AssertionError("size() must not measure entries again")
+
+    monkeypatch.setattr("app.cache.encoded_size", fail)
+    # The oldest alias was evicted; the survivors' sizes were measured on set.
+    assert cache.size() == {"entries": 2, "bytes": expected}
+    cache.delete("type/fire")
+    assert cache.size()["bytes"] == expected - len('{"n":1}')
+    cache.clear()
+    assert cache.size() == {"entries": 0, "bytes": 0}
+
+
+def test_backend_counts_live_keys_without_reading_them(backend):
+    backend.set_many({"pokedex/kanto": {"n": 1}, "pokedex/johto": {"n": 2}}, ttl=60)
+    backend.set("pokedex/hoenn", {"n": 3}, ttl=0.01)
+    time.sleep(0.05)
+
+    assert backend.count(["pokedex/kanto", "pokedex/johto", "pokedex/hoenn", "pokedex/sinnoh"]) == 2
+    assert backend.count([]) == 0
+    backend.after_fork()
+    assert backend.get("pokedex/kanto") == {"n": 1}
+
+
+def test_backend_reports_the_earliest_expiry(backend):
+    backend.set("pokemon/25", {"id": 25}, ttl=60)
+    backend.set("pokemon-species/25", {"id": 25}, ttl=30)
+
+    assert 25 < backend.remaining_ttl(["pokemon/25", "pokemon-species/25"]) <= 30
+    assert 55 < backend.remaining_ttl(["pokemon/25"]) <= 60
+    assert backend.remaining_ttl(["pokemon/25", "pokemon/26"]) is None
+    assert backend.remaining_ttl([]) is None
+
+
+def test_cache_stats_reports_hit_rates_and_hot_keys():
+    stats = CacheStats()
+    for hit in (True, True, False):
+        stats.record("pokemon/25", hit=hit)
+    stats.record("type/fire", hit=False)
+
+    report = stats.snapshot(top=1)
+
+    assert report["namespaces"]["pokemon"] == {"hits": 2, "misses": 1, "hit_rate": 0.6667}
+    assert report["namespaces"]["type"]["hit_rate"] == 0.0
+    assert report["hottest"] == [{"key": "pokemon/25", "hits": 2}]
+
+
+def test_memory_cache_evicts_by_json_size():
+    cache = MemoryCache(max_bytes=2 * encoded_size({"v": "x" * 100}))
+    for key in "abc":
+        cache.set(key, {"v": "x" * 100}, ttl=60)
+
+    assert cache.get("a") is None
+    assert cache.size() == {"entries": 2, "bytes": 2 * encoded_size({"v": "x" * 100})}
+    assert create_cache("memory://?max_mb=0.5").max_bytes == 512 * 1024
+
+
+def test_sqlite_purges_expired_rows_at_most_once_per_interval(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.db"))
+    cache.set("type/fire", {"n": 1}, ttl=0.01)
+    time.sleep(0.05)
+    cache.set("type/water", {"n": 2}, ttl=60)
+    rows = cache._connection().execute("SELECT key FROM cache ORDER BY key").fetchall()
+
+    cache._purged_at -= SQLiteCache.PURGE_INTERVAL
+    cache.set("type/grass", {"n": 3}, ttl=60)
+    purged = cache._connection().execute("SELECT key FROM cache ORDER BY key").fetchall()
+
+    assert rows == [("type/fire",), ("type/water",)]
+    assert purged == [("type/grass",), ("type/water",)]
+    plan = cache._connection().execute(
+        "EXPLAIN QUERY PLAN DELETE FROM cache WHERE expires_at < 0"
+    ).fetchall()
+    assert "cache_expires_at" in str(plan)
+
+
+def test_memory_cache_evicts_least_recently_used():
+    cache = MemoryCache(max_entries=2)
+    cache.set("a", {"v": 1}, ttl=60)
+    cache.set("b", {"v": 2}, ttl=60)
+    cache.get("a")
+    cache.set("c", {"v": 3}, ttl=60)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"v": 1}
+
+
+def test_redis_multi_get_is_a_single_command(fake_redis):
+    host, port = fake_redis.server_address
+    cache = RedisCache(host=host, port=port)
+    cache.set_many({"pokemon/1": {"id": 1}, "pokemon/2": {"id": 2}}, ttl=60)
+    fake_redis.commands.clear()
+
+    cache.get_many(["pokemon/1", "pokemon/2", "pokemon/3"])
+
+    assert fake_redis.commands == ["MGET"]
+
+
+def test_redis_outage_is_treated_as_miss():
+    cache = RedisCache(host="127.0.0.1", port=1, socket_timeout=0.2)
+
+    cache.set("pokemon/25", {"id": 25}, ttl=60)
+    assert cache.get("pokemon/25") is None
+
+
+def test_create_cache_parses_urls(tmp_path):
+    assert isinstance(create_cache(None), MemoryCache)
+    assert isinstance(create_cache(f"sqlite:///{tmp_path}/pokedex.db"), SQLiteCache)
+    redis = create_cache("redis://cache.local:6380/2")
+    assert (redis.host, redis.port, redis.db) == ("cache.local", 6380, 2)
+    with pytest.raises(ValueError):
+        create_cache("ftp://nope")
@@ -0,0 +1,84 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+from app.cassette import CassetteSession
+from app.exceptions import PokeAPIError, PokemonNotFoundError
+from app.pokeapi_client import PokeAPIClient
+
+
+class RecordingSourceResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.ok = status_code < 400
+        self.text = json.dumps(payload or {})
+
+    def json(self):
+        return json.loads(self.text)
+
+
+class SourceSession:
+    def __init__(self, responses):
+        self.responses = responses
+        self.calls = []
+
+    def get(self, url, timeout):
+        self.calls.append(url)
+        return self.responses[url]
+
+
+BASE = PokeAPIClient.BASE_URL
+
+
+def test_record_then_replay_offline(tmp_path):
+    source = SourceSession(
+        {
+            f"{BASE}/pokemon/pikachu": RecordingSourceResponse(200, {"id": 25, "name": "pikachu"}),
+            f"{BASE}/pokemon/missingno": RecordingSourceResponse(404),
+        }
+    )
+    recorder = CassetteSession(tmp_path, mode="record", session=source)
+    PokeAPIClient(session=recorder).get_pokemon("pikachu")
+    with pytest.raises(PokemonNotFoundError):
+        PokeAPIClient(session=recorder).get_pokemon("missingno")
+
+    path = tmp_path / "pokemon" / "pikachu.json.gz"
+    assert json.loads(gzip.decompress(path.read_bytes()))["status"] == 200
+    assert recorder.recorded == 2 and len(recorder) == 2
+
+    replayer = CassetteSession(tmp_path)
+    client = PokeAPIClient(session=replayer)
+    assert client.get_pokemon("pikachu") == {"id": 25, "name": "pikachu"}
+    with pytest.raises(PokemonNotFoundError):
+        client.get_pokemon("missingno")
+    with pytest.raises(PokeAPIError):
+        client.get_pokemon("eevee")
+    assert replayer.replayed == 2
+    assert len(source.calls) == 2
+
+
+def test_record_skips_server_errors(tmp_path):
+    source = SourceSession({f"{BASE}/type/fire": RecordingSourceResponse(503)})
+    recorder = CassetteSession(tmp_path, mode="record", session=source)
+
+    assert recorder.get(f"{BASE}/type/fire", timeout=1).status_code == 503
+    assert len(recorder) == 0
+
+
+def test_replay_simulates_latency_and_timeouts(tmp_path):
+    source = SourceSession({f"{BASE}/type/fire": RecordingSourceResponse(200, {"name": "fire"})})
+    CassetteSession(tmp_path, mode="record", session=source).get(f"{BASE}/type/fire", timeout=1)
+    waits = []
+    replayer = CassetteSession(tmp_path, latency=0.2, sleep=waits.append)
+
+    assert replayer.get(f"{BASE}/type/fire", timeout=1).json() == {"name": "fire"}
+    with pytest.raises(requests.Timeout):
+        replayer.get(f"{BASE}/type/fire", timeout=0.1)
+    assert waits == [0.2, 0.1]
+
+
+def test_rejects_unknown_mode(tmp_path):
+    with pytest.raises(ValueError):
+        CassetteSession(tmp_path, mode="rewind")
@@ -0,0 +1,103 @@
+import gzip
+
+import pytest
+from flask import Flask, jsonify, request
+
+from app.compression import ResponseCompressor
+
+
+@pytest.fixture
+def compressed_app(tmp_path):
+    static_dir = tmp_path / "static"
+    (static_dir / "js").mkdir(parents=True)
+    (static_dir / "js" / "app.js").write_text("console.log('hola');\n" * 100)
+
+    app = Flask(__name__, static_folder=str(static_dir))
+    compressor = ResponseCompressor(min_size=100)
+    compressor.register(app)
+
+    @app.route("/big")
+    def big():
+        return jsonify({"pokemon": [{"id": i, "name": "Pikachu"} for i in range(50)]})
+
+    @app.route("/small")
+    def small():
+        return jsonify({"ok": True})
+
+    app.testing = True
+    return app, compressor, static_dir
+
+
+def test_large_json_is_gzipped_when_accepted(compressed_app):
+    app, _, _ = compressed_app
+    response = app.test_client().get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in response.headers["Vary"]
+    assert b"Pikachu" in gzip.decompress(response.get_data())
+
+
+def test_small_or_unaccepted_responses_stay_plain(compressed_app):
+    app, _, _ = compressed_app
+    client = app.test_client()
+
+    small = client.get("/small", headers={"Accept-Encoding": "gzip"})
+    identity = client.get("/big")
+
+    assert "Content-Encoding" not in small.headers
+    assert "Content-Encoding" not in identity.headers
+    assert identity.get_json()["pokemon"][0]["name"] == "Pikachu"
+
+
+def test_repeated_bodies_reuse_compressed_cache(compressed_app, monkeypatch):
+    app, compressor, _ = compressed_app
+    client = app.test_client()
+    calls = []
+    original = compressor.compress
+
+    def counting_compress(body, encoding, **kwargs):
+        calls.append(encoding)
+        return original(body, encoding, **kwargs)
+
+    monkeypatch.setattr(compressor, "compress", counting_compress)
+    client.get("/big", headers={"Accept-Encoding": "gzip"})
+    client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+    assert calls == ["gzip"]
+
+
+def test_static_assets_use_precompressed_variants(compressed_app):
+    app, compressor, static_dir = compressed_app
+    written = compressor.precompress_directory(static_dir)
+    client = app.test_client()
+
+    response = client.get("/static/js/app.js", headers={"Accept-Encoding": "gzip"})
+    plain = client.get("/static/js/app.js")
+
+    assert "app.js.gz" in written[str(static_dir / "js" / "app.js")]
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert "javascript" in response.mimetype
+    assert b"console.log" in gzip.decompress(response.get_data())
+    assert "Content-Encoding" not in plain.headers
+    response.close()
+    plain.close()
+
+
+def test_compressed_etag_is_weak_and_still_validates(compressed_app):
+    app, _, _ = compressed_app
+
+    @app.route("/tagged")
+    def tagged():
+        response = jsonify({"pokemon": ["Pikachu"] * 100})
+        response.add_etag()
+        return response.make_conditional(request)
+
+    client = app.test_client()
+    first = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+    second = client.get(
+        "/tagged",
+        headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["ETag"]},
+    )
+
+    assert first.headers["ETag"].startswith('W/"')
+    assert second.status_code == 304
@@ -0,0 +1,37 @@
+import json
+
+import pytest
+from flask import Flask, jsonify
+
+from app.json_provider import FastJSONProvider
+from app.models import PokemonStat, PokemonSummary
+
+
+@pytest.fixture(params=[True, False], ids=["orjson", "stdlib"])
+def app(request):
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app, use_orjson=request.param)
+    return app
+
+
+def test_models_serialize_through_their_wire_format(app):
+    summary = PokemonSummary(identifier=25, name="Pikachu")
+    with app.app_context():
+        encoded = app.json.dumps({"pokemon": [summary], "stat": PokemonStat("Hp", 35)})
+
+    assert json.loads(encoded) == {
+        "pokemon": [{"id": 25, "name": "Pikachu"}],
+        "stat": {"name": "Hp", "value": 35},
+    }
+
+
+def test_jsonify_builds_json_response(app):
+    with app.test_request_context():
+        response = jsonify(PokemonSummary(identifier=4, name="Charmander"))
+
+    assert response.mimetype == "application/json"
+    assert response.get_json() == {"id": 4, "name": "Charmander"}
+
+
+def test_loads_round_trip(app):
+    assert app.json.loads('{"nombre": "Pikachu ⚡"}') == {"nombre": "Pikachu ⚡"}
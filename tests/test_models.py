@@ -1,6 +1,6 @@
 import pytest
 
-from app.models import Pokemon, PokemonStat, PokemonSummary
+from app.models import EvolutionChain, Pokemon, PokemonStat, PokemonSummary
 
 
 @pytest.fixture
@@ -87,3 +87,49 @@ def test_pokemon_summary_handles_invalid_url_gracefully():
     summary = PokemonSummary.from_url("missing", "not-a-valid-url")
     assert summary.identifier == 0
     assert summary.name == "Missing"
+
+
+def test_pokemon_summary_from_api_is_hydrated(pokemon_payload):
+    summary = PokemonSummary.from_api(pokemon_payload)
+
+    assert summary.is_hydrated
+    assert summary.to_dict() == {
+        "id": 25,
+        "name": "Pikachu",
+        "types": ["Electric"],
+        "total_stats": 90,
+        "image_url": "https://img.pokemondb.net/artwork/pikachu.jpg",
+    }
+
+
+def test_evolution_chain_from_api_keeps_branches():
+    chain = EvolutionChain.from_api(
+        {
+            "id": 67,
+            "chain": {
+                "species": {"name": "eevee", "url": "https://pokeapi.co/api/v2/pokemon-species/133/"},
+                "evolution_details": [],
+                "evolves_to": [
+                    {
+                        "species": {"name": "vaporeon", "url": "https://pokeapi.co/api/v2/pokemon-species/134/"},
+                        "evolution_details": [
+                            {"trigger": {"name": "use-item"}, "item": {"name": "water-stone"}, "min_level": None}
+                        ],
+                        "evolves_to": [],
+                    },
+                    {
+                        "species": {"name": "jolteon", "url": "https://pokeapi.co/api/v2/pokemon-species/135/"},
+                        "evolution_details": [{"trigger": {"name": "use-item"}, "item": {"name": "thunder-stone"}}],
+                        "evolves_to": [],
+                    },
+                ],
+            },
+        }
+    )
+
+    payload = chain.to_dict()
+
+    assert [member.identifier for member in chain.members] == [133, 134, 135]
+    assert payload["chain"]["trigger"] is None
+    assert payload["chain"]["evolves_to"][0]["item"] == "Water Stone"
+    assert payload["species"][2] == {"id": 135, "name": "Jolteon"}
@@ -1,9 +1,20 @@
 from types import SimpleNamespace
 
+import threading
+import time
+
 import pytest
 import requests
 
-from app.exceptions import PokeAPIError, PokemonNotFoundError
+from app import deadline, degraded, upstream_calls
+from app.cache import MemoryCache
+from app.circuit_breaker import CircuitBreaker
+from app.exceptions import (
+    DeadlineExceededError,
+    PokeAPIError,
+    PokemonNotFoundError,
+    UpstreamUnavailableError,
+)
 from app.pokeapi_client import PokeAPIClient
 
 
@@ -85,3 +96,293 @@ def test_get_pokedex_fetches_entries():
 
     assert result == payload
     assert session.calls[0].url.endswith("pokedex/kanto")
+
+
+def test_get_evolution_chain_uses_chain_endpoint():
+    session = DummySession(response=DummyResponse(200, {"id": 10}, ok=True))
+    client = PokeAPIClient(session=session)
+
+    assert client.get_evolution_chain(10) == {"id": 10}
+    assert session.calls[0].url.endswith("evolution-chain/10")
+
+
+def test_successful_responses_are_cached():
+    payload = {"name": "pikachu"}
+    session = DummySession(response=DummyResponse(200, payload, ok=True))
+    client = PokeAPIClient(session=session)
+
+    client.get_pokemon("pikachu")
+    result = client.get_pokemon("pikachu")
+
+    assert result == payload
+    assert len(session.calls) == 1
+
+
+def test_get_pokedex_cached_only_never_hits_network():
+    payload = {"pokemon_entries": []}
+    session = DummySession(response=DummyResponse(200, payload, ok=True))
+    client = PokeAPIClient(session=session)
+
+    assert client.get_pokedex("kanto", cached_only=True) is None
+    client.get_pokedex("kanto")
+
+    assert client.get_pokedex("kanto", cached_only=True) == payload
+    assert len(session.calls) == 1
+
+
+def test_invalidate_pokemon_drops_every_alias():
+    payload = {"id": 25, "name": "pikachu", "species": {"name": "pikachu"}}
+    session = DummySession(response=DummyResponse(200, payload, ok=True))
+    client = PokeAPIClient(session=session)
+    client.get_pokemon("pikachu")
+    client.get_pokemon(25)
+
+    removed = client.invalidate_pokemon("PIKACHU")
+    client.get_pokemon(25)
+
+    assert removed == ["pokemon-species/25", "pokemon-species/pikachu", "pokemon/25", "pokemon/pikachu"]
+    assert len(session.calls) == 2
+    report = client.cache_report()
+    assert report["namespaces"]["pokemon"] == {"hits": 1, "misses": 2, "hit_rate": 0.3333}
+    assert report["entries"] == 2
+    assert report["stale_entries"] == 2
+
+
+def test_refresh_replaces_the_cached_copy_only_on_success():
+    session = DummySession(response=DummyResponse(200, {"name": "kanto", "v": 1}, ok=True))
+    client = PokeAPIClient(session=session)
+    client.get_pokedex("kanto")
+    session.response = DummyResponse(200, {"name": "kanto", "v": 2}, ok=True)
+
+    assert client.get_pokedex("kanto")["v"] == 1
+    assert client.refresh("pokedex/kanto")["v"] == 2
+    assert client.get_pokedex("kanto")["v"] == 2
+    session.error = requests.ConnectionError("down")
+    with pytest.raises(PokeAPIError):
+        client.refresh("pokedex/kanto")
+    assert client.get_pokedex("kanto")["v"] == 2
+
+
+def test_calls_only_use_the_remaining_deadline():
+    session = DummySession(response=DummyResponse(200, {"id": 1}, ok=True))
+    client = PokeAPIClient(session=session, timeout=10)
+
+    with deadline.deadline(2):
+        client.get_pokemon(1)
+
+    assert session.calls[0].timeout <= 2
+
+
+def test_exhausted_deadline_skips_the_upstream_call():
+    session = DummySession()
+    client = PokeAPIClient(session=session)
+
+    with deadline.deadline(0):
+        with pytest.raises(DeadlineExceededError):
+            client.get_pokemon(1)
+
+    assert session.calls == []
+
+
+def test_timeout_after_the_deadline_is_reported_as_deadline_exceeded():
+    class TimingOutSession:
+        def get(self, url, timeout):
+            time.sleep(timeout)
+            raise requests.Timeout("slow")
+
+    client = PokeAPIClient(session=TimingOutSession())
+
+    with deadline.deadline(0.01):
+        with pytest.raises(DeadlineExceededError):
+            client.get_pokemon(1)
+
+
+class SlowFirstSession:
+    def __init__(self, delay, fail_first=False):
+        self.delay = delay
+        self.fail_first = fail_first
+        self.calls = 0
+        self.threads = []
+        self._lock = threading.Lock()
+
+    def get(self, url, timeout):
+        with self._lock:
+            self.calls += 1
+            call = self.calls
+            self.threads.append(threading.current_thread().name)
+        if call == 1:
+            time.sleep(self.delay)
+            if self.fail_first:
+                raise requests.Timeout("stuck")
+        return DummyResponse(200, {"id": 1, "attempt": call}, ok=True)
+
+
+def test_hedged_request_sends_a_copy_after_p95_from_the_pool():
+    session = SlowFirstSession(delay=0.2)
+    client = PokeAPIClient(session=session, hedge=True, cache_ttl=0)
+    client._latencies.extend([0.01] * client.HEDGE_MIN_SAMPLES)
+
+    payload = client.get_pokemon(1)
+
+    # The first attempt runs on the caller's thread and keeps its own answer.
+    assert payload["attempt"] == 1
+    assert session.threads[0] == threading.current_thread().name
+    assert session.threads[1].startswith("hedge")
+    assert client.hedged_requests == 1
+
+
+def test_hedge_answers_when_the_first_attempt_fails():
+    session = SlowFirstSession(delay=0.1, fail_first=True)
+    client = PokeAPIClient(session=session, hedge=True, cache_ttl=0)
+    client._latencies.extend([0.01] * client.HEDGE_MIN_SAMPLES)
+
+    assert client.get_pokemon(1)["attempt"] == 2
+    assert client.hedged_requests == 1
+
+
+def test_fast_first_attempts_never_hedge_even_with_a_busy_pool():
+    session = DummySession(response=DummyResponse(200, {"id": 1}, ok=True))
+    client = PokeAPIClient(session=session, hedge=True, cache_ttl=0)
+    client._latencies.extend([0.05] * client.HEDGE_MIN_SAMPLES)
+    results = []
+
+    def call():
+        results.append(client.get_pokemon(1))
+
+    threads = [threading.Thread(target=call) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(results) == 32
+    assert len(session.calls) == 32
+    assert client.hedged_requests == 0
+
+
+def test_no_hedging_until_latencies_are_known():
+    session = DummySession(response=DummyResponse(200, {"id": 1}, ok=True))
+    client = PokeAPIClient(session=session, hedge=True)
+
+    client.get_pokemon(1)
+
+    assert client.latency_p95() is None
+    assert client.hedged_requests == 0
+
+
+def test_outage_serves_the_last_good_copy_and_marks_it_stale():
+    session = DummySession(response=DummyResponse(200, {"id": 25, "name": "pikachu"}, ok=True))
+    client = PokeAPIClient(session=session, cache_ttl=0.01)
+    client.get_pokemon(25)
+    time.sleep(0.02)
+    session.error = requests.ConnectionError("down")
+
+    token = degraded.begin()
+    try:
+        payload = client.get_pokemon(25)
+        marked = degraded.stale_keys()
+    finally:
+        degraded.end(token)
+
+    assert payload["name"] == "pikachu"
+    assert marked == ["pokemon/25"]
+    with pytest.raises(PokeAPIError):
+        client.get_pokemon(26)
+
+
+def test_open_breaker_stops_upstream_calls():
+    session = DummySession(error=requests.ConnectionError("down"))
+    client = PokeAPIClient(session=session, breaker=CircuitBreaker(failure_threshold=2))
+
+    for _ in range(2):
+        with pytest.raises(PokeAPIError):
+            client.get_pokemon(1)
+    with pytest.raises(UpstreamUnavailableError):
+        client.get_pokemon(1)
+
+    assert len(session.calls) == 2
+    assert not client.upstream_available()
+
+
+def test_deadline_timeouts_do_not_open_the_breaker():
+    class TimingOutSession:
+        def __init__(self):
+            self.calls = 0
+
+        def get(self, url, timeout):
+            self.calls += 1
+            time.sleep(timeout)
+            raise requests.Timeout("slow")
+
+    session = TimingOutSession()
+    client = PokeAPIClient(session=session, breaker=CircuitBreaker(failure_threshold=2))
+
+    for _ in range(5):
+        with deadline.deadline(0.01):
+            with pytest.raises(DeadlineExceededError):
+                client.get_pokemon(1)
+
+    assert session.calls == 5
+    assert client.upstream_available()
+
+
+def test_cache_hits_store_the_stale_copy_once():
+    class CountingStaleCache(MemoryCache):
+        def __init__(self):
+            super().__init__()
+            self.writes = 0
+
+        def set_many(self, items, ttl):
+            self.writes += 1
+            super().set_many(items, ttl)
+
+    shared = MemoryCache()
+    shared.set("pokemon/25", {"id": 25, "name": "pikachu"}, ttl=60)
+    stale = CountingStaleCache()
+    client = PokeAPIClient(session=DummySession(), cache=shared, stale_cache=stale)
+
+    for _ in range(3):
+        client.get_pokemon(25)
+
+    assert stale.writes == 1
+    assert stale.get("pokemon/25")["name"] == "pikachu"
+
+
+def test_get_pokemon_without_store_leaves_the_caches_alone():
+    session = DummySession(response=DummyResponse(200, {"id": 25, "name": "pikachu"}, ok=True))
+    client = PokeAPIClient(session=session)
+
+    assert client.get_pokemon(25, store=False)["name"] == "pikachu"
+
+    assert len(client.cache) == 0 and len(client.stale_cache) == 0
+
+
+def test_upstream_calls_are_counted_per_scope():
+    session = DummySession(response=DummyResponse(200, {"id": 25, "name": "pikachu"}, ok=True))
+    client = PokeAPIClient(session=session)
+
+    token = upstream_calls.begin()
+    try:
+        client.get_pokemon(25)
+        client.get_pokemon(25)
+        calls = upstream_calls.count()
+    finally:
+        upstream_calls.end(token)
+
+    assert calls == 1
+    assert upstream_calls.count() == 0
+
+
+def test_stale_copies_live_outside_the_main_cache():
+    session = DummySession(response=DummyResponse(200, {"id": 7, "name": "squirtle"}, ok=True))
+    cache = MemoryCache(max_entries=1)
+    client = PokeAPIClient(session=session, cache=cache)
+    client.get_pokemon(7)
+    cache.set("type/fire", {"name": "fire"}, ttl=60)
+    session.error = requests.ConnectionError("down")
+
+    assert len(cache) == 1 and cache.get("pokemon/7") is None
+    assert client.get_pokemon(7)["name"] == "squirtle"
+    client.invalidate_namespace("pokemon")
+    with pytest.raises(PokeAPIError):
+        client.get_pokemon(7)
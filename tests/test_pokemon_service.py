@@ -1,12 +1,36 @@
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
-from app.exceptions import PokemonNotFoundError
+from app.exceptions import PokeAPIError, PokemonNotFoundError
 from app.models import PokemonSummary
+from app import deadline, degraded
+from app.cache import MemoryCache
+from app.circuit_breaker import CircuitBreaker
+from app.pokeapi_client import PokeAPIClient
 from app.pokemon_service import PokemonService
+from app.regions import PokemonRegions
+from app.snapshot import PokemonSnapshot
+from app.type_chart import TypeChart
+
+
+class FakePokedexCache:
+    def __init__(self, client):
+        self.client = client
+
+    def count(self, keys):
+        return sum(key.split("/", 1)[1] in self.client.cached_pokedexes for key in keys)
+
+    def remaining_ttl(self, keys):
+        return None
 
 
 class FakeClient:
     MAX_POKEMON_ID = 1010
+    cache_ttl = 3600
+    breaker = CircuitBreaker()
 
     def __init__(self, pokemon_payload=None, species_payload=None, type_payload=None):
         self._pokemon_payload = pokemon_payload or {}
@@ -15,7 +39,10 @@ class FakeClient:
         self.requested_ids = []
         self.pokemon_overrides = {}
         self.pokedex_payloads = {}
+        self.cached_pokedexes = set()
+        self.cached_pokemon = {}
         self.last_pokedex = None
+        self.cache = FakePokedexCache(self)
 
     def get_pokemon(self, identifier):
         self.requested_ids.append(identifier)
@@ -24,6 +51,16 @@ class FakeClient:
             return self.pokemon_overrides[key]
         return self._pokemon_payload
 
+    def upstream_available(self):
+        return self.breaker.state == CircuitBreaker.CLOSED
+
+    def get_cached_pokemon(self, identifiers):
+        return {
+            identifier: self.cached_pokemon[identifier]
+            for identifier in identifiers
+            if identifier in self.cached_pokemon
+        }
+
     def get_pokemon_species(self, identifier):
         return self._species_payload
 
@@ -32,7 +69,9 @@ class FakeClient:
             raise PokemonNotFoundError("No type")
         return self._type_payload
 
-    def get_pokedex(self, pokedex_name):
+    def get_pokedex(self, pokedex_name, *, cached_only=False):
+        if cached_only and pokedex_name not in self.cached_pokedexes:
+            return None
         self.last_pokedex = pokedex_name
         return self.pokedex_payloads.get(pokedex_name, {"pokemon_entries": []})
 
@@ -253,3 +292,698 @@ def test_get_region_details_invalid_region():
 
     with pytest.raises(ValueError):
         service.get_region_details("ultra-space")
+
+
+def test_get_initial_state_only_inlines_cached_region():
+    client = FakeClient()
+    service = PokemonService(client=client)
+
+    cold = service.get_initial_state()
+    client.cached_pokedexes.add("kanto")
+    warm = service.get_initial_state()
+
+    assert cold["regions"][0]["key"] == "kanto"
+    assert cold["region"] is None
+    assert client.last_pokedex == "kanto"
+    assert warm["region"]["region"]["key"] == "kanto"
+
+
+def _pokedex_entries(count):
+    return {
+        "pokemon_entries": [
+            {
+                "pokemon_species": {
+                    "name": f"species-{index}",
+                    "url": f"https://pokeapi.co/api/v2/pokemon-species/{index}/",
+                }
+            }
+            for index in range(1, count + 1)
+        ]
+    }
+
+
+def test_stream_region_entries_yields_hydrated_entries_in_order(sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload)
+    client.pokedex_payloads = {"kanto": _pokedex_entries(20)}
+    service = PokemonService(client=client)
+
+    total, entries = service.stream_region_entries("kanto", concurrency=4)
+    results = list(entries)
+
+    assert total == 20
+    assert [summary.name for summary in results[:2]] == ["Species 1", "Species 2"]
+    assert all(summary.types == ["Water"] for summary in results)
+    assert sorted(client.requested_ids) == list(range(1, 21))
+
+
+def test_iter_hydrated_keeps_bounded_window(sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload)
+    service = PokemonService(client=client)
+    consumed = []
+
+    def summaries():
+        for index in range(1, 50):
+            consumed.append(index)
+            yield PokemonSummary(identifier=index, name=str(index))
+
+    iterator = service.iter_hydrated(summaries(), concurrency=3)
+    next(iterator)
+    iterator.close()
+
+    assert len(consumed) == 3
+
+
+def test_stream_region_entries_validates_region_before_streaming():
+    service = PokemonService(client=FakeClient())
+
+    with pytest.raises(ValueError):
+        service.stream_region_entries("ultra-space")
+
+
+def test_get_pokemon_by_type_hydrates_summaries(sample_type_payload, sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload, type_payload=sample_type_payload)
+    service = PokemonService(client=client)
+
+    results = service.get_pokemon_by_type("water", hydrate=True)
+
+    assert [summary.name for summary in results] == ["Squirtle", "Psyduck"]
+    assert results[1].to_dict()["types"] == ["Water"]
+    assert sorted(client.requested_ids) == [7, 54]
+
+
+def test_get_region_details_hydrates_up_to_the_cap(sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload)
+    client.pokedex_payloads = {"kanto": _pokedex_entries(100)}
+    service = PokemonService(client=client)
+
+    details = service.get_region_details("kanto", limit=100, hydrate=True)
+    cap = PokemonService.MAX_HYDRATED_RESULTS
+
+    # Entries past the cap are still listed, just without the hydrated fields.
+    assert len(details["pokemon"]) == 100
+    assert details["pokemon"][0]["total_stats"] == 44
+    assert all("types" in entry for entry in details["pokemon"][:cap])
+    assert not any("types" in entry for entry in details["pokemon"][cap:])
+    assert details["pokemon"][cap]["id"] == cap + 1
+    assert len(client.requested_ids) == cap
+    assert details["total_available"] == 100
+
+
+def test_hydration_reuses_one_thread_pool_across_calls(sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload)
+    service = PokemonService(client=client)
+    threads = set()
+    original = client.get_pokemon
+
+    def tracking_get_pokemon(identifier):
+        threads.add(threading.current_thread().name)
+        return original(identifier)
+
+    client.get_pokemon = tracking_get_pokemon
+    for _ in range(3):
+        list(service.iter_hydrated([PokemonSummary(identifier=index, name="") for index in range(1, 9)]))
+
+    assert len(threads) <= PokemonService.HYDRATION_CONCURRENCY
+    assert all(name.startswith("pokemon-fetch") for name in threads)
+
+
+def test_iter_hydrated_uses_cached_payloads_before_fetching(sample_pokemon_payload):
+    client = FakeClient(pokemon_payload=sample_pokemon_payload)
+    client.cached_pokemon = {2: {**sample_pokemon_payload, "id": 2, "name": "ivysaur"}}
+    service = PokemonService(client=client)
+    summaries = [PokemonSummary(identifier=index, name="") for index in (1, 2, 3)]
+
+    results = list(service.iter_hydrated(summaries, concurrency=2))
+
+    assert [summary.identifier for summary in results] == [7, 2, 7]
+    assert results[1].name == "Ivysaur"
+    assert sorted(client.requested_ids) == [1, 3]
+
+
+def test_warm_up_fetches_every_region_pokedex():
+    client = FakeClient()
+    fetched = []
+    original = client.get_pokedex
+
+    def tracking_get_pokedex(name, *, cached_only=False):
+        if not cached_only:
+            fetched.append(name)
+            client.cached_pokedexes.add(name)
+        return original(name, cached_only=cached_only)
+
+    client.get_pokedex = tracking_get_pokedex
+    service = PokemonService(client=client)
+
+    assert service.cache_status()["warm"] is False
+    status = service.warm_up()
+
+    assert status["warm"] is True
+    assert status["cached_regions"] == status["total_regions"] == len(fetched)
+
+
+class RecordingSession:
+    def __init__(self):
+        self.urls = []
+
+    def get(self, url, timeout):
+        self.urls.append(url)
+        return SimpleNamespace(status_code=200, ok=True, json=lambda: {"pokemon_entries": []})
+
+
+def test_warm_up_refresh_fetches_cached_entries_again():
+    session = RecordingSession()
+    service = PokemonService(client=PokeAPIClient(session=session))
+    service.warm_up()
+    first_pass = len(session.urls)
+
+    service.warm_up()
+    assert len(session.urls) == first_pass
+    service.warm_up(refresh=True)
+
+    assert len(session.urls) == 2 * first_pass
+    assert sum("/type/" in url for url in session.urls) == 2 * 18
+    assert service.cache_status()["warm"] is True
+
+
+def test_get_pokemon_picks_description_by_language(sample_pokemon_payload):
+    species = {
+        "flavor_text_entries": [
+            {"language": {"name": "en"}, "flavor_text": "Loves\nswimming."},
+            {"language": {"name": "fr"}, "flavor_text": "Adore nager."},
+            {"language": {"name": "es"}, "flavor_text": "Le encanta nadar."},
+            {"language": {"name": "es"}, "flavor_text": "Otra entrada."},
+        ]
+    }
+    client = FakeClient(sample_pokemon_payload, species)
+    service = PokemonService(client=client)
+
+    assert service.get_pokemon("squirtle").description == "Le encanta nadar."
+    assert service.get_pokemon("squirtle", lang="fr").description == "Adore nager."
+    assert service.get_pokemon("squirtle", lang="en").description == "Loves swimming."
+    assert service.get_pokemon("squirtle", lang="ja").description == "Le encanta nadar."
+
+
+def test_flavor_texts_are_indexed_once_per_species(sample_pokemon_payload, monkeypatch):
+    client = FakeClient(sample_pokemon_payload, {"flavor_text_entries": []})
+    service = PokemonService(client=client)
+    calls = []
+    original = PokemonService._index_flavor_texts
+
+    def counting_index(species_data):
+        calls.append(species_data)
+        return original(species_data)
+
+    monkeypatch.setattr(PokemonService, "_index_flavor_texts", staticmethod(counting_index))
+    service.get_pokemon("squirtle", lang="es")
+    service.get_pokemon("squirtle", lang="en")
+
+    assert len(calls) == 1
+
+
+def test_get_leaderboard_uses_pokemon_seen_by_the_service(sample_pokemon_payload, sample_species_payload):
+    client = FakeClient(sample_pokemon_payload, sample_species_payload)
+    service = PokemonService(client=client)
+    service.get_pokemon("squirtle")
+
+    board = service.get_leaderboard(stat="HP", type_name="Water", limit=5)
+
+    assert board["pokemon"][0]["id"] == 7
+    assert board["pokemon"][0]["value"] == 44
+    assert board["indexed"] == 1
+    assert not board["complete"]
+
+
+def test_get_leaderboard_validates_arguments():
+    service = PokemonService(client=FakeClient())
+
+    with pytest.raises(ValueError):
+        service.get_leaderboard(stat="luck")
+    with pytest.raises(ValueError):
+        service.get_leaderboard(type_name="cosmic")
+
+
+def test_search_pokemon_converts_units_and_validates(sample_pokemon_payload, sample_species_payload):
+    client = FakeClient(sample_pokemon_payload, sample_species_payload)
+    service = PokemonService(client=client)
+    service.get_pokemon("squirtle")
+
+    weight_kg = sample_pokemon_payload["weight"] / 10
+    found = service.search_pokemon({"weight": (None, weight_kg)}, ["water"], sort="special_attack")
+    missed = service.search_pokemon({"weight": (None, weight_kg - 0.1)})
+
+    assert found["total"] == 1
+    assert found["sort"] == "special-attack"
+    assert missed["total"] == 0
+    with pytest.raises(ValueError):
+        service.search_pokemon({"luck": (1, None)})
+    with pytest.raises(ValueError):
+        service.search_pokemon(order="sideways")
+
+
+def test_run_tournament_deduplicates_entrants(sample_pokemon_payload, sample_species_payload):
+    client = FakeClient(sample_pokemon_payload, sample_species_payload)
+    service = PokemonService(client=client)
+
+    with pytest.raises(ValueError):
+        service.run_tournament(["squirtle", "Squirtle", "7"])
+
+
+def test_run_tournament_fetches_each_pokemon_once(sample_pokemon_payload):
+    client = FakeClient(sample_pokemon_payload)
+    stronger = dict(sample_pokemon_payload, id=9, name="blastoise")
+    stronger["stats"] = [dict(entry, base_stat=entry["base_stat"] * 2) for entry in stronger["stats"]]
+    client.pokemon_overrides["blastoise"] = stronger
+    client.cached_pokemon["squirtle"] = sample_pokemon_payload
+    service = PokemonService(client=client)
+
+    tournament = service.run_tournament(["squirtle", "blastoise", "BLASTOISE"])
+
+    assert client.requested_ids == ["blastoise"]
+    assert tournament.to_dict()["champion"] == 9
+    assert 9 in service.stat_index
+
+
+def test_find_similar_uses_cached_payloads_only(sample_pokemon_payload):
+    client = FakeClient(sample_pokemon_payload)
+    client.cached_pokemon[7] = sample_pokemon_payload
+    client.cached_pokemon[9] = dict(sample_pokemon_payload, id=9, name="blastoise")
+    service = PokemonService(client=client)
+    service.find_similar(9)
+
+    result = service.find_similar(7, k=3, shared_types=True)
+
+    assert client.requested_ids == []
+    assert [entry["id"] for entry in result["similar"]] == [9]
+    with pytest.raises(PokemonNotFoundError):
+        service.find_similar(151)
+
+
+def _duelist(identifier, name, type_name, base_stat):
+    return {
+        "id": identifier,
+        "name": name,
+        "types": [{"type": {"name": type_name}}],
+        "stats": [{"stat": {"name": "hp"}, "base_stat": base_stat}],
+        "sprites": {},
+    }
+
+
+def test_compare_pokemon_matchup_mode_uses_type_chart(sample_species_payload):
+    client = FakeClient(species_payload=sample_species_payload)
+    client.pokemon_overrides = {
+        "pikachu": _duelist(25, "pikachu", "electric", 180),
+        "diglett": _duelist(50, "diglett", "ground", 100),
+    }
+    chart = TypeChart.from_type_payloads(
+        {
+            "electric": {"damage_relations": {"no_damage_to": [{"name": "ground"}]}},
+            "ground": {"damage_relations": {"double_damage_to": [{"name": "electric"}]}},
+        }
+    )
+    service = PokemonService(client=client, type_chart=chart)
+
+    by_stats = service.compare_pokemon("pikachu", "diglett")
+    by_matchup = service.compare_pokemon("pikachu", "diglett", mode="matchup")
+
+    assert by_stats["winner"] == "Pikachu"
+    assert by_matchup["winner"] == "Diglett"
+    assert by_matchup["matchup"] == {"multipliers": [0.0, 2.0], "scores": [0, 200]}
+    with pytest.raises(ValueError):
+        service.compare_pokemon("pikachu", "diglett", mode="vibes")
+
+
+def test_matchup_falls_back_to_stats_until_the_type_chart_is_ready(sample_species_payload):
+    client = FakeClient(species_payload=sample_species_payload)
+    client.pokemon_overrides = {
+        "pikachu": _duelist(25, "pikachu", "electric", 180),
+        "diglett": _duelist(50, "diglett", "ground", 100),
+    }
+    requested = []
+    client.get_type = lambda name: requested.append(name) or {
+        "damage_relations": {"no_damage_to": [{"name": "ground"}]} if name == "electric" else {}
+    }
+    service = PokemonService(client=client)
+
+    pending = service.compare_pokemon("pikachu", "diglett", mode="matchup")
+    service._type_chart_thread.join(timeout=2)
+    ready = service.compare_pokemon("pikachu", "diglett", mode="matchup")
+
+    assert pending["notice"] == PokemonService.TYPE_CHART_PENDING_NOTICE
+    assert "matchup" not in pending and pending["winner"] == "Pikachu"
+    assert len(requested) == 18
+    assert "notice" not in ready
+    assert ready["matchup"]["multipliers"] == [0.0, 1.0]
+
+
+def test_ready_type_chart_does_not_wait_for_the_build():
+    client = FakeClient()
+    building = threading.Event()
+    release = threading.Event()
+
+    def slow_get_type(name):
+        building.set()
+        release.wait(timeout=5)
+        return {"damage_relations": {}}
+
+    client.get_type = slow_get_type
+    service = PokemonService(client=client)
+
+    assert service.ready_type_chart() is None
+    assert building.wait(timeout=2)
+    started = time.perf_counter()
+    assert service.ready_type_chart() is None
+    with service._type_chart_lock:
+        pass
+    waited = time.perf_counter() - started
+    release.set()
+    service._type_chart_thread.join(timeout=2)
+
+    assert waited < 0.5
+    assert service.ready_type_chart() is not None
+
+
+def test_type_chart_is_built_once_and_snapshotted(tmp_path):
+    client = FakeClient()
+    requested = []
+    client.get_type = lambda name: requested.append(name) or {"damage_relations": {}}
+    path = tmp_path / "types.json"
+
+    PokemonService(client=client, type_chart_path=str(path)).get_type_chart()
+    first_run = len(requested)
+    chart = PokemonService(client=client, type_chart_path=str(path)).get_type_chart()
+
+    assert first_run == 18
+    assert len(requested) == 18
+    assert chart.matrix.shape == (18, 18)
+
+
+def test_get_evolutions_resolves_family_members_without_upstream_calls():
+    client = FakeClient()
+    calls = []
+    client.get_pokemon_species = lambda key: calls.append(key) or {
+        "evolution_chain": {"url": "https://pokeapi.co/api/v2/evolution-chain/1/"}
+    }
+    client.get_evolution_chain = lambda chain_id: calls.append(chain_id) or {
+        "id": chain_id,
+        "chain": {
+            "species": {"name": "bulbasaur", "url": "https://pokeapi.co/api/v2/pokemon-species/1/"},
+            "evolves_to": [
+                {
+                    "species": {"name": "ivysaur", "url": "https://pokeapi.co/api/v2/pokemon-species/2/"},
+                    "evolution_details": [{"trigger": {"name": "level-up"}, "min_level": 16}],
+                    "evolves_to": [],
+                }
+            ],
+        },
+    }
+    service = PokemonService(client=client)
+
+    first = service.get_evolutions("bulbasaur")
+    second = service.get_evolutions(2)
+    by_name = service.get_evolutions("Ivysaur")
+
+    assert calls == ["bulbasaur", 1]
+    assert first is second is by_name
+    assert first.root.evolves_to[0].min_level == 16
+
+
+def test_invalidation_reaches_other_workers_through_the_shared_cache():
+    shared = MemoryCache()
+    first = PokemonService(client=PokeAPIClient(cache=shared))
+    second = PokemonService(client=PokeAPIClient(cache=shared))
+    species = {"flavor_text_entries": [{"language": {"name": "es"}, "flavor_text": "Hola"}]}
+    pikachu = {"id": 25, "name": "pikachu"}
+    shared.set_many({"pokemon/25": pikachu, "pokemon/pikachu": pikachu}, ttl=60)
+    second.flavor_texts(25, species)
+    second.type_chart = TypeChart()
+    for payload in (pikachu, {"id": 26, "name": "raichu"}, {"id": 133, "name": "eevee"}):
+        second.stat_index.add(payload)
+
+    first.invalidate_pokemon("pikachu")
+    result = first.invalidate_namespace("type")
+    second.sync_invalidations(force=True)
+
+    assert result["epoch"] == 2
+    assert shared.get("pokemon/25") is None
+    assert len(second._flavor_texts) == 0
+    assert second.type_chart is None
+    assert second.stat_index.identifiers() == [133, 26]
+
+    # Only the name is known when the payload was never cached; the index resolves it.
+    first.invalidate_pokemon("eevee")
+    second.sync_invalidations(force=True)
+    assert second.stat_index.identifiers() == [26]
+    with pytest.raises(ValueError):
+        first.invalidate_namespace("admin")
+
+
+def test_pokemon_namespace_invalidation_resets_the_stat_index():
+    shared = MemoryCache()
+    service = PokemonService(client=PokeAPIClient(cache=shared))
+    weak = {"id": 25, "name": "pikachu", "stats": [{"stat": {"name": "hp"}, "base_stat": 35}]}
+    service.stat_index.add(weak)
+    crawler = service._crawler = SimpleNamespace(stopped=False)
+    crawler.stop = lambda: setattr(crawler, "stopped", True)
+
+    service.invalidate_namespace("pokemon")
+    service.stat_index.add({**weak, "stats": [{"stat": {"name": "hp"}, "base_stat": 90}]})
+
+    assert crawler.stopped and service._crawler is None
+    assert service.stat_index.top("hp")[0]["value"] == 90
+
+
+def test_hydration_workers_inherit_the_request_deadline(sample_pokemon_payload):
+    client = FakeClient(sample_pokemon_payload)
+    budgets = []
+    original = client.get_pokemon
+
+    def tracking_get_pokemon(identifier):
+        budgets.append(deadline.remaining())
+        return original(identifier)
+
+    client.get_pokemon = tracking_get_pokemon
+    service = PokemonService(client=client)
+    summaries = [PokemonSummary(identifier=i, name=f"Pokemon {i}") for i in range(1, 4)]
+
+    with deadline.deadline(5):
+        list(service.iter_hydrated(summaries))
+
+    assert len(budgets) == 3
+    assert all(budget is not None and budget <= 5 for budget in budgets)
+
+
+def test_random_pokemon_comes_from_local_data_while_upstream_is_down(sample_pokemon_payload):
+    client = FakeClient(sample_pokemon_payload)
+    client.breaker = CircuitBreaker(failure_threshold=1)
+    service = PokemonService(client=client, rng=FixedRandom(0))
+    service.stat_index.add(sample_pokemon_payload)
+    client.breaker.record_failure()
+
+    pokemon = service.get_random_pokemon()
+
+    assert pokemon.identifier == 7
+    assert client.requested_ids == [7]
+
+
+def test_get_pokemon_survives_a_species_outage(sample_pokemon_payload):
+    client = FakeClient(sample_pokemon_payload)
+
+    def failing_species(_identifier):
+        raise PokeAPIError("down")
+
+    client.get_pokemon_species = failing_species
+    service = PokemonService(client=client)
+
+    token = degraded.begin()
+    try:
+        pokemon = service.get_pokemon(7)
+        marked = degraded.stale_keys()
+    finally:
+        degraded.end(token)
+
+    assert pokemon.description == PokemonService.MYSTERY_DESCRIPTION
+    assert marked == ["pokemon-species/7"]
+
+
+def test_snapshot_answers_when_upstream_fails(tmp_path, sample_pokemon_payload, sample_species_payload):
+    path = tmp_path / "pokedex.bin"
+    PokemonSnapshot.write(
+        path, [(sample_pokemon_payload, {"es": "Desde la instantánea.", "en": "From the snapshot."})]
+    )
+    client = FakeClient()
+
+    def failing_get_pokemon(_identifier):
+        raise PokeAPIError("down")
+
+    client.get_pokemon = failing_get_pokemon
+    service = PokemonService(client=client, snapshot=PokemonSnapshot(path))
+
+    token = degraded.begin()
+    try:
+        pokemon = service.get_pokemon(7)
+        marked = degraded.stale_keys()
+    finally:
+        degraded.end(token)
+
+    assert pokemon.description == "Desde la instantánea."
+    assert marked == ["snapshot/pokemon/7"]
+    assert service.get_pokemon(sample_pokemon_payload["name"], lang="en").description == "From the snapshot."
+    with pytest.raises(PokeAPIError):
+        service.get_pokemon(8)
+
+
+def test_export_snapshot_round_trips_indexed_pokemon(tmp_path, sample_pokemon_payload, sample_species_payload):
+    service = PokemonService(client=FakeClient(sample_pokemon_payload, sample_species_payload))
+    expected = service.get_pokemon(7)
+    path = tmp_path / "pokedex.bin"
+
+    assert service.export_snapshot(str(path)) == 1
+    restored = PokemonSnapshot(path).get(sample_pokemon_payload["name"])
+    assert (restored.name, restored.description, restored.types, restored.abilities) == (
+        expected.name,
+        expected.description,
+        expected.types,
+        expected.abilities,
+    )
+    assert restored.total_stats == expected.total_stats
+
+
+def test_snapshot_path_is_mapped_on_first_use(tmp_path, sample_pokemon_payload):
+    path = tmp_path / "pokedex.bin"
+    service = PokemonService(client=FakeClient(), snapshot_path=str(path))
+
+    assert service.snapshot is None
+    PokemonSnapshot.write(path, [(sample_pokemon_payload, {})])
+    service.preload()
+
+    assert service.snapshot.ids.tolist() == [7]
+    assert service.stat_index.identifiers() == [7]
+
+
+def test_compare_memo_shares_unordered_pairs_until_invalidated():
+    cache = MemoryCache()
+    service = PokemonService(client=PokeAPIClient(cache=cache))
+    pokemon = {
+        "pikachu": {"id": 25, "name": "pikachu", "stats": [{"stat": {"name": "hp"}, "base_stat": 90}]},
+        "bulbasaur": {"id": 1, "name": "bulbasaur", "stats": [{"stat": {"name": "hp"}, "base_stat": 45}]},
+    }
+    for name, payload in pokemon.items():
+        cache.set_many(
+            {
+                f"pokemon/{name}": payload,
+                f"pokemon/{payload['id']}": payload,
+                f"pokemon-species/{payload['id']}": {"flavor_text_entries": []},
+            },
+            ttl=60,
+        )
+    fetched = []
+    original = service.get_pokemon
+    service.get_pokemon = lambda key, lang: fetched.append(key) or original(key, lang=lang)
+
+    forward = service.compare_pokemon("pikachu", "bulbasaur")
+    backward = service.compare_pokemon("bulbasaur", "pikachu")
+    by_id = service.compare_pokemon("1", "25")
+
+    assert fetched == ["pikachu", "bulbasaur"]
+    assert [entry["name"] for entry in forward["pokemon"]] == ["Pikachu", "Bulbasaur"]
+    assert [entry["name"] for entry in backward["pokemon"]] == ["Bulbasaur", "Pikachu"]
+    assert by_id == backward
+    assert backward["winner"] == forward["winner"] == "Pikachu"
+    assert service.cache_report()["indexes"]["comparisons"] == 1
+
+    service.invalidate_pokemon("bulbasaur")
+    cache.set_many({"pokemon/bulbasaur": pokemon["bulbasaur"], "pokemon/1": pokemon["bulbasaur"]}, ttl=60)
+    service.compare_pokemon("bulbasaur", "pikachu")
+
+    assert fetched[2:] == ["bulbasaur", "pikachu"]
+
+
+def cache_pokemon(cache, payloads, ttl=60):
+    for payload in payloads:
+        cache.set_many(
+            {
+                f"pokemon/{payload['id']}": payload,
+                f"pokemon-species/{payload['id']}": {"flavor_text_entries": []},
+            },
+            ttl=ttl,
+        )
+
+
+def test_compare_memo_is_dropped_when_a_name_is_invalidated_elsewhere():
+    shared = MemoryCache()
+    worker = PokemonService(client=PokeAPIClient(cache=shared))
+    admin = PokemonService(client=PokeAPIClient(cache=shared))
+    pikachu = {"id": 25, "name": "pikachu", "stats": [{"stat": {"name": "hp"}, "base_stat": 90}]}
+    bulbasaur = {"id": 1, "name": "bulbasaur", "stats": [{"stat": {"name": "hp"}, "base_stat": 45}]}
+    cache_pokemon(shared, [pikachu, bulbasaur])
+    worker.compare_pokemon("1", "25")
+
+    # Only the name reaches the log: nothing cached under pokemon/bulbasaur.
+    admin.invalidate_pokemon("bulbasaur")
+    worker.sync_invalidations(force=True)
+
+    assert worker.cache_report()["indexes"]["comparisons"] == 0
+    assert 1 not in worker.stat_index and 25 in worker.stat_index
+
+
+def test_compare_memo_expires_with_the_cached_payloads():
+    cache = MemoryCache()
+    service = PokemonService(client=PokeAPIClient(cache=cache))
+    pikachu = {"id": 25, "name": "pikachu", "stats": [{"stat": {"name": "hp"}, "base_stat": 90}]}
+    bulbasaur = {"id": 1, "name": "bulbasaur", "stats": [{"stat": {"name": "hp"}, "base_stat": 45}]}
+    cache_pokemon(cache, [pikachu])
+    cache_pokemon(cache, [bulbasaur], ttl=0.05)
+    assert service.compare_pokemon("1", "25")["winner"] == "Pikachu"
+
+    time.sleep(0.1)
+    # PokéAPI now has a stronger Bulbasaur; the memo must not outlive the old copy.
+    stronger = {**bulbasaur, "stats": [{"stat": {"name": "hp"}, "base_stat": 200}]}
+    cache_pokemon(cache, [stronger])
+
+    assert service.compare_pokemon("1", "25")["winner"] == "Bulbasaur"
+
+
+def test_readiness_rewarms_a_cold_worker_once_per_interval():
+    client = FakeClient()
+    service = PokemonService(client=client)
+    rewarms = []
+    service.rewarm = lambda: rewarms.append(1) or {**service.cache_status(), "warming": True}
+
+    assert service.readiness()["warming"] is True
+    service.warm_up()
+    client.cached_pokedexes.clear()
+    cold = service.readiness()
+
+    assert rewarms == [1]
+    assert cold["warm"] is False and cold["warming"] is False
+    service._warmed_at -= service.READINESS_REWARM_INTERVAL
+    service.readiness()
+    assert rewarms == [1, 1]
+
+
+def test_readiness_is_kept_after_the_first_successful_warm_up():
+    client = FakeClient()
+    service = PokemonService(client=client)
+    rewarms = []
+    service.rewarm = lambda: rewarms.append(1) or {**service.cache_status(), "warming": True}
+    client.cached_pokedexes.update(region.pokedex for region in PokemonRegions.all())
+
+    assert service.warm_up()["ready"] is True
+    # An hour later every pokedex entry expires at once.
+    client.cached_pokedexes.clear()
+    service._warmed_at -= 3600
+    status = service.readiness()
+
+    assert rewarms == [1]
+    assert status["ready"] is True and status["warming"] is True
+
+
+def test_after_fork_drops_inherited_connections():
+    client = PokeAPIClient(session=object())
+    service = PokemonService(client=client)
+    service._warming = True
+
+    service.after_fork()
+
+    assert client._session is None
+    assert service._warming is False
@@ -0,0 +1,73 @@
+from benchmarks.replay_access_log import Result, parse_log, percentile, summarize, upstream_trailer
+
+COMMON = '10.0.0.1 - - [19/Oct/2026:16:40:19 +0000] "GET /api/pokemon?q=pikachu HTTP/1.1" 200 512'
+COMBINED = (
+    '10.0.0.2 - - [19/Oct/2026:16:40:21 +0000] "HEAD /healthz HTTP/1.1" 200 0 '
+    '"-" "kube-probe/1.29"'
+)
+
+
+def route_for(target, method):
+    return f"{method} {target.split('?')[0]}"
+
+
+def test_parse_log_reads_common_and_combined_lines():
+    entries = list(parse_log([COMMON, COMBINED], route_for))
+
+    assert [(entry.method, entry.target, entry.offset) for entry in entries] == [
+        ("GET", "/api/pokemon?q=pikachu", 0.0),
+        ("HEAD", "/healthz", 2.0),
+    ]
+    assert entries[0].route == "GET /api/pokemon"
+
+
+def test_parse_log_skips_writes_admin_calls_and_bad_lines():
+    lines = [
+        '10.0.0.1 - - [19/Oct/2026:16:40:19 +0000] "POST /api/admin/cache/rewarm HTTP/1.1" 202 10',
+        '10.0.0.1 - - [19/Oct/2026:16:40:19 +0000] "GET /api/admin/cache HTTP/1.1" 200 10',
+        '10.0.0.1 - - [31/Foo/2026:99:40:19 +0000] "GET /api/regions HTTP/1.1" 200 10',
+        "not an access log line",
+        COMMON,
+    ]
+
+    entries = list(parse_log(lines, route_for))
+
+    # The first replayable line sets the zero offset, not the skipped ones before it.
+    assert [(entry.target, entry.offset) for entry in entries] == [("/api/pokemon?q=pikachu", 0.0)]
+
+
+def test_percentile_picks_the_nearest_rank():
+    values = [float(value) for value in range(1, 101)]
+
+    assert percentile([], 0.5) == 0.0
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([7.0], 0.9) == 7.0
+
+
+def test_upstream_trailer_reads_the_last_ndjson_line():
+    body = b'{"id": 1}\n{"id": 4}\n{"upstream_calls": 3}\n'
+
+    assert upstream_trailer(body) == 3
+    assert upstream_trailer(b'{"id": 1}\n') == 0
+    assert upstream_trailer(b'{"upstream_calls": "many"}') == 0
+    assert upstream_trailer(b"") == 0
+
+
+def test_summarize_groups_results_by_route():
+    results = [
+        Result(route="search", status=200, latency=0.010, upstream_calls=2, lag=0.0),
+        Result(route="search", status=None, latency=0.030, upstream_calls=0, lag=0.005),
+        Result(route="random", status=404, latency=0.020, upstream_calls=1, lag=0.0),
+    ]
+
+    report = summarize(results, elapsed=2.0)
+
+    assert list(report["routes"]) == ["search", "random"]
+    assert report["requests"] == 3
+    assert report["throughput_rps"] == 1.5
+    assert report["max_lag_ms"] == 5.0
+    assert report["upstream_calls"] == 3
+    assert report["routes"]["search"]["error_rate"] == 0.5
+    assert report["routes"]["search"]["max_ms"] == 30.0
+    assert report["routes"]["random"]["client_error_rate"] == 1.0
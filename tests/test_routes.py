@@ -1,9 +1,13 @@
+import json
 from pathlib import Path
 
 import pytest
 from flask import Flask
 
-from app.exceptions import PokeAPIError, PokemonNotFoundError
+from app.assets import AssetPipeline
+from app import deadline, degraded, upstream_calls
+from app.exceptions import DeadlineExceededError, PokeAPIError, PokemonNotFoundError
+from app.json_provider import FastJSONProvider
 from app.models import PokemonSummary
 from app.routes import PokemonController
 
@@ -52,6 +56,15 @@ class ServiceStub:
         self.last_type = None
         self.last_compare = None
         self.last_region_request = None
+        self.last_hydrate = None
+        self.last_lang = None
+        self.cache_state = {
+            "warm": True,
+            "warming": False,
+            "ready": False,
+            "cached_regions": 1,
+            "total_regions": 1,
+        }
         self.compare_payload = {
             "winner": "Pikachu",
             "is_tie": False,
@@ -76,34 +89,90 @@ class ServiceStub:
             }
         }
 
-    def get_pokemon(self, identifier):
+    def get_pokemon(self, identifier, lang="es"):
         self.last_query = identifier
+        self.last_lang = lang
         if self.raise_on_get:
             raise self.raise_on_get
         return DummyPokemon(self.pokemon_payload)
 
-    def get_random_pokemon(self):
+    def get_random_pokemon(self, lang="es"):
+        self.last_lang = lang
         if self.raise_on_random:
             raise self.raise_on_random
         return DummyPokemon(self.random_payload)
 
-    def get_pokemon_by_type(self, type_name):
+    def get_pokemon_by_type(self, type_name, hydrate=False):
         self.last_type = type_name
+        self.last_hydrate = hydrate
         if self.raise_on_type:
             raise self.raise_on_type
         return self.type_payload
 
-    def compare_pokemon(self, first, second):
+    def compare_pokemon(self, first, second, lang="es", mode="stats"):
         self.last_compare = (first, second)
+        self.last_mode = mode
+        self.last_lang = lang
         if self.raise_on_compare:
             raise self.raise_on_compare
         return self.compare_payload
 
+    def get_leaderboard(self, stat="total", type_name=None, limit=20):
+        self.last_leaderboard = (stat, type_name, limit)
+        if stat == "luck":
+            raise ValueError("Esa estadística no existe.")
+        return {"stat": stat, "type": type_name, "pokemon": [], "indexed": 0, "complete": False}
+
+    def search_pokemon(self, ranges=None, type_names=(), sort="total", order="desc", page=1, per_page=20):
+        self.last_search = (ranges, type_names, sort, order, page, per_page)
+        return {"total": 0, "page": page, "per_page": per_page, "pokemon": []}
+
+    def run_tournament(self, identifiers):
+        self.last_tournament = identifiers
+        if "missingno" in identifiers:
+            raise PokemonNotFoundError("No encontramos ese Pokémon.")
+        return {"pokemon": [], "standings": [], "bracket": [], "champion": None}
+
+    def find_similar(self, pokemon_id, k=5, *, shared_types=False):
+        self.last_similar = (pokemon_id, k, shared_types)
+        if pokemon_id == 0:
+            raise PokemonNotFoundError("Todavía no conocemos a ese Pokémon.")
+        return {"pokemon": {"id": pokemon_id}, "similar": []}
+
+    def get_evolutions(self, identifier):
+        self.last_evolutions = identifier
+        if identifier == "missingno":
+            raise PokemonNotFoundError("Este Pokémon no tiene cadena evolutiva.")
+        return {"id": 1, "species": [], "chain": {}}
+
+    def sync_invalidations(self):
+        self.invalidation_syncs = getattr(self, "invalidation_syncs", 0) + 1
+
     def get_regions_catalogue(self):
         return self.region_catalogue
 
-    def get_region_details(self, region_key, limit=12):
+    def cache_status(self):
+        return self.cache_state
+
+    def readiness(self):
+        return self.cache_state
+
+    def get_initial_state(self):
+        return {"regions": self.region_catalogue, "region": self.region_detail_payloads["kanto"]}
+
+    def stream_region_entries(self, region_key):
+        self.last_region_request = (region_key, None)
+        if self.raise_on_region_details:
+            raise self.raise_on_region_details
+        summaries = [
+            PokemonSummary(identifier=1, name="Bulbasaur", types=["Grass"], total_stats=318),
+            PokemonSummary(identifier=4, name="Charmander", types=["Fire"], total_stats=309),
+        ]
+        return len(summaries), iter(summaries)
+
+    def get_region_details(self, region_key, limit=12, hydrate=False):
         self.last_region_request = (region_key, limit)
+        self.last_hydrate = hydrate
         if self.raise_on_region_details:
             raise self.raise_on_region_details
         if region_key not in self.region_detail_payloads:
@@ -120,7 +189,9 @@ def flask_client():
         template_folder=str(base_dir / "templates"),
         static_folder=str(base_dir / "static"),
     )
+    app.json = FastJSONProvider(app)
     PokemonController(service).register(app)
+    AssetPipeline(app.static_folder).register(app)
     app.testing = True
     return app.test_client(), service
 
@@ -132,6 +203,18 @@ def test_home_route_renders_template(flask_client):
     assert "Mini Pokedex Aventurera" in response.get_data(as_text=True)
 
 
+def test_home_route_inlines_initial_state(flask_client):
+    client, _ = flask_client
+    html = client.get("/").get_data(as_text=True)
+
+    opening = '<script id="initial-state" type="application/json">'
+    assert opening in html
+    state = json.loads(html.split(opening, 1)[1].split("</script>", 1)[0])
+
+    assert state["region"]["region"]["key"] == "kanto"
+    assert state["region"]["pokemon"] == [{"id": 25, "name": "Pikachu"}]
+
+
 def test_search_pokemon_returns_json(flask_client):
     client, service = flask_client
     response = client.get("/api/pokemon", query_string={"q": "pikachu"})
@@ -294,3 +377,272 @@ def test_region_details_endpoint_handles_api_error(flask_client):
 
     response = client.get("/api/regions/kalos")
     assert response.status_code == 502
+
+
+def test_json_responses_carry_etag_and_honor_if_none_match(flask_client):
+    client, _ = flask_client
+    first = client.get("/api/pokemon", query_string={"q": "pikachu"})
+    etag = first.headers["ETag"]
+
+    second = client.get(
+        "/api/pokemon", query_string={"q": "pikachu"}, headers={"If-None-Match": etag}
+    )
+
+    assert first.headers["Cache-Control"] == "no-cache"
+    assert second.status_code == 304
+    assert second.get_data() == b""
+
+
+def test_service_worker_is_served_from_root(flask_client):
+    client, _ = flask_client
+    response = client.get("/sw.js")
+
+    assert response.status_code == 200
+    assert "javascript" in response.mimetype
+    assert response.headers["Cache-Control"] == "no-cache"
+    response.close()
+
+
+def test_region_stream_emits_ndjson(flask_client):
+    client, service = flask_client
+    response = client.get("/api/regions/kanto/stream")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    assert response.mimetype == "application/x-ndjson"
+    assert response.headers["X-Total-Count"] == "2"
+    assert [line["name"] for line in lines] == ["Bulbasaur", "Charmander"]
+    assert lines[0]["types"] == ["Grass"]
+    assert service.last_region_request == ("kanto", None)
+
+
+def test_region_stream_handles_value_error(flask_client):
+    client, service = flask_client
+    service.raise_on_region_details = ValueError("no existe")
+
+    response = client.get("/api/regions/ultra/stream")
+    assert response.status_code == 400
+
+
+def test_list_endpoints_forward_hydrate_flag(flask_client):
+    client, service = flask_client
+
+    client.get("/api/types/electric", query_string={"hydrate": "true"})
+    assert service.last_hydrate is True
+
+    client.get("/api/regions/kanto", query_string={"hydrate": "0"})
+    assert service.last_hydrate is False
+
+
+def test_health_endpoint(flask_client):
+    client, _ = flask_client
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.get_json() == {"status": "ok"}
+
+
+def test_readiness_reports_cache_state(flask_client):
+    client, service = flask_client
+    ready = client.get("/readyz")
+
+    service.cache_state = {**service.cache_state, "warm": False, "warming": True}
+    warming = client.get("/readyz")
+
+    assert ready.status_code == 200
+    assert ready.get_json()["cache"]["warm"] is True
+    assert warming.status_code == 503
+    assert warming.get_json()["status"] == "warming"
+
+    service.cache_state = {**service.cache_state, "warm": False, "warming": False}
+    degraded_state = client.get("/readyz")
+    assert degraded_state.status_code == 200
+    assert degraded_state.get_json()["status"] == "degraded"
+
+
+def test_readiness_stays_in_rotation_while_rewarming_after_the_first_warm_up(flask_client):
+    client, service = flask_client
+    service.cache_state = {**service.cache_state, "warm": False, "warming": True, "ready": True}
+
+    response = client.get("/readyz")
+
+    assert response.status_code == 200
+    assert response.get_json()["status"] == "rewarming"
+
+
+def test_search_pokemon_negotiates_language(flask_client):
+    client, service = flask_client
+
+    response = client.get(
+        "/api/pokemon", query_string={"q": "pikachu"}, headers={"Accept-Language": "fr-FR,fr;q=0.9"}
+    )
+    assert service.last_lang == "fr"
+    assert "Accept-Language" in response.headers["Vary"]
+
+    client.get("/api/pokemon", query_string={"q": "pikachu", "lang": "en"})
+    assert service.last_lang == "en"
+
+    client.get("/api/pokemon/random", headers={"Accept-Language": "xx"})
+    assert service.last_lang == "es"
+
+
+def test_leaderboard_endpoint_forwards_filters(flask_client):
+    client, service = flask_client
+    response = client.get(
+        "/api/leaderboard", query_string={"stat": "speed", "type": "water", "limit": "5"}
+    )
+
+    assert response.status_code == 200
+    assert service.last_leaderboard == ("speed", "water", 5)
+
+
+def test_leaderboard_endpoint_rejects_unknown_stat(flask_client):
+    client, _ = flask_client
+    response = client.get("/api/leaderboard", query_string={"stat": "luck"})
+    assert response.status_code == 400
+
+
+def test_search_endpoint_collects_ranges_and_types(flask_client):
+    client, service = flask_client
+    response = client.get(
+        "/api/search?type=fire,flying&speed_min=100&weight_max=50&special_attack_min=90"
+        "&sort=speed&order=asc&page=2&per_page=10"
+    )
+
+    assert response.status_code == 200
+    ranges, type_names, sort, order, page, per_page = service.last_search
+    assert ranges == {"speed": (100.0, None), "weight": (None, 50.0), "special_attack": (90.0, None)}
+    assert type_names == ["fire", "flying"]
+    assert (sort, order, page, per_page) == ("speed", "asc", 2, 10)
+
+
+def test_search_endpoint_rejects_non_numeric_filters(flask_client):
+    client, _ = flask_client
+    response = client.get("/api/search?speed_min=fast")
+    assert response.status_code == 400
+
+
+def test_tournament_endpoint_accepts_comma_separated_pokemon(flask_client):
+    client, service = flask_client
+    response = client.get("/api/tournament?pokemon=pikachu,eevee&pokemon=1")
+
+    assert response.status_code == 200
+    assert service.last_tournament == ["pikachu", "eevee", "1"]
+
+
+def test_tournament_endpoint_validates_entrants(flask_client):
+    client, _ = flask_client
+
+    assert client.get("/api/tournament?pokemon=pikachu").status_code == 400
+    assert client.get("/api/tournament?pokemon=pikachu,missingno").status_code == 404
+
+
+def test_similar_endpoint_forwards_options(flask_client):
+    client, service = flask_client
+    response = client.get("/api/pokemon/25/similar?k=3&shared_types=true")
+
+    assert response.status_code == 200
+    assert service.last_similar == (25, 3, True)
+    assert client.get("/api/pokemon/0/similar").status_code == 404
+
+
+def test_compare_endpoint_forwards_matchup_mode(flask_client):
+    client, service = flask_client
+    response = client.get("/api/pokemon/compare?a=pikachu&b=onix&mode=Matchup")
+
+    assert response.status_code == 200
+    assert service.last_mode == "matchup"
+
+
+def test_evolutions_endpoint(flask_client):
+    client, service = flask_client
+
+    assert client.get("/api/pokemon/eevee/evolutions").status_code == 200
+    assert service.last_evolutions == "eevee"
+    assert client.get("/api/pokemon/missingno/evolutions").status_code == 404
+
+
+def test_requests_run_under_a_deadline(flask_client):
+    client, service = flask_client
+    seen = []
+    original = service.get_pokemon
+
+    def tracking_get_pokemon(*args, **kwargs):
+        seen.append(deadline.remaining())
+        return original(*args, **kwargs)
+
+    service.get_pokemon = tracking_get_pokemon
+    client.get("/api/pokemon?q=pikachu")
+
+    assert seen and 0 < seen[0] <= 8
+    assert deadline.remaining() is None
+
+
+def test_deadline_exceeded_maps_to_gateway_timeout(flask_client):
+    client, service = flask_client
+    service.raise_on_compare = DeadlineExceededError("Demasiado lento")
+
+    response = client.get("/api/pokemon/compare?a=pikachu&b=onix")
+
+    assert response.status_code == 504
+
+
+def test_stale_responses_are_flagged(flask_client):
+    client, service = flask_client
+    original = service.get_pokemon
+
+    def stale_get_pokemon(*args, **kwargs):
+        degraded.mark_stale("pokemon/25")
+        return original(*args, **kwargs)
+
+    service.get_pokemon = stale_get_pokemon
+    response = client.get("/api/pokemon?q=pikachu")
+
+    assert response.status_code == 200
+    assert response.headers["X-Pokedex-Stale"] == "1"
+    assert response.headers["Cache-Control"] == "no-store"
+    assert "X-Pokedex-Stale" not in client.get("/api/regions").headers
+
+
+def test_upstream_calls_are_only_reported_when_enabled(flask_client):
+    client, _ = flask_client
+    response = client.get("/api/regions/kanto/stream")
+
+    assert "X-Pokedex-Upstream-Calls" not in client.get("/api/regions").headers
+    assert "upstream_calls" not in response.get_data(as_text=True)
+
+
+def test_responses_report_upstream_calls():
+    service = ServiceStub()
+    app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    PokemonController(service, count_upstream_calls=True).register(app)
+    client = app.test_client()
+    original = service.get_pokemon
+
+    def fetching_get_pokemon(*args, **kwargs):
+        upstream_calls.record("https://pokeapi.co/api/v2/pokemon/pikachu")
+        upstream_calls.record("https://pokeapi.co/api/v2/pokemon-species/25")
+        return original(*args, **kwargs)
+
+    service.get_pokemon = fetching_get_pokemon
+
+    assert client.get("/api/pokemon?q=pikachu").headers["X-Pokedex-Upstream-Calls"] == "2"
+    assert client.get("/api/regions").headers["X-Pokedex-Upstream-Calls"] == "0"
+
+    def fetching_stream(region_key):
+        total, entries = ServiceStub.stream_region_entries(service, region_key)
+        upstream_calls.record("https://pokeapi.co/api/v2/pokedex/2")
+
+        def hydrate():
+            for summary in entries:
+                upstream_calls.record(f"https://pokeapi.co/api/v2/pokemon/{summary.identifier}")
+                yield summary
+
+        return total, hydrate()
+
+    service.stream_region_entries = fetching_stream
+    response = client.get("/api/regions/kanto/stream")
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    # Streamed bodies run after the headers are sent, so the count is the last line.
+    assert "X-Pokedex-Upstream-Calls" not in response.headers
+    assert lines[-1] == {"upstream_calls": 3}
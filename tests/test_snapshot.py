@@ -0,0 +1,107 @@
+import struct
+
+import pytest
+
+from app.snapshot import PokemonSnapshot
+from app.stat_index import StatIndex
+
+
+def make_payload(identifier, name, types, speed):
+    return {
+        "id": identifier,
+        "name": name,
+        "height": 4,
+        "weight": 60,
+        "types": [{"slot": slot, "type": {"name": type_name}} for slot, type_name in enumerate(types, 1)],
+        "abilities": [{"ability": {"name": "static"}}, {"ability": {"name": "lightning-rod"}}],
+        "stats": [
+            {"stat": {"name": "hp"}, "base_stat": 35},
+            {"stat": {"name": "speed"}, "base_stat": speed},
+        ],
+        "sprites": {"front_default": f"{name}.png"},
+    }
+
+
+@pytest.fixture
+def snapshot(tmp_path):
+    path = tmp_path / "pokedex.bin"
+    PokemonSnapshot.write(
+        path,
+        [
+            (
+                make_payload(130, "gyarados", ["water", "flying"], 81),
+                {"es": "Furioso y temible.", "en": "Fierce and feared."},
+            ),
+            (make_payload(25, "pikachu", ["electric"], 90), {"en": "Stores electricity in its cheeks."}),
+            (make_payload(1, "bulbasaur", ["grass", "poison"], 45), {}),
+        ],
+    )
+    snapshot = PokemonSnapshot(path)
+    yield snapshot
+    snapshot.close()
+
+
+def test_snapshot_builds_pokemon_lazily(snapshot):
+    pokemon = snapshot.get(130)
+
+    assert len(snapshot) == 3
+    assert snapshot.ids.tolist() == [1, 25, 130]
+    assert pokemon.name == "Gyarados"
+    assert pokemon.types == ["Water", "Flying"]
+    assert pokemon.abilities == ["Static", "Lightning Rod"]
+    assert pokemon.description == "Furioso y temible."
+    assert pokemon.total_stats == 35 + 81
+    assert pokemon.height_m == 0.4
+    assert snapshot.get("25").name == "Pikachu"
+    assert snapshot.get(151) is None
+
+
+def test_snapshot_finds_pokemon_by_name(snapshot):
+    assert snapshot.get("pikachu").identifier == 25
+    assert snapshot.get(" Gyarados ").identifier == 130
+    assert snapshot.get("bulbasaur").identifier == 1
+    assert "pikachu" in snapshot
+    assert snapshot.get("mew") is None
+    assert snapshot.get("aaa") is None and snapshot.get("zzz") is None
+
+
+def test_snapshot_keeps_every_language(snapshot):
+    assert snapshot.get(130, "en").description == "Fierce and feared."
+    # Missing translations fall back to Spanish, then English, like the live service.
+    assert snapshot.get(130, "fr").description == "Furioso y temible."
+    assert snapshot.get(25, "es").description == "Stores electricity in its cheeks."
+    assert snapshot.get(1, "en").description == ""
+
+
+def test_snapshot_rejects_other_versions(tmp_path, snapshot):
+    data = bytearray(snapshot.path.read_bytes())
+    struct.pack_into("<H", data, 4, PokemonSnapshot.VERSION + 1)
+    path = tmp_path / "future.bin"
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ValueError):
+        PokemonSnapshot(path)
+    (tmp_path / "junk.bin").write_bytes(b"nope")
+    with pytest.raises(ValueError):
+        PokemonSnapshot(tmp_path / "junk.bin")
+
+
+def test_stat_index_loads_from_snapshot(snapshot):
+    index = StatIndex.from_snapshot(snapshot)
+
+    assert len(index) == 3 and 130 in index
+    assert [entry["id"] for entry in index.top("speed", limit=2)] == [25, 130]
+    assert index.top("total", limit=1)[0]["name"] == "Pikachu"
+    assert index.top("total", type_name="flying")[0]["types"] == ["Water", "Flying"]
+    _, similar = index.nearest(25, k=1)
+    assert similar[0]["id"] == 130
+    # Labels are read from the mapped file, not copied into the index.
+    assert not index._labels
+
+
+def test_stat_index_mixes_snapshot_and_payload_rows(snapshot):
+    index = StatIndex.from_snapshot(snapshot)
+    index.add(make_payload(26, "raichu", ["electric"], 110))
+
+    assert [entry["name"] for entry in index.top("speed", limit=2)] == ["Raichu", "Pikachu"]
+    assert index.top("speed", type_name="flying")[0]["image_url"] == "gyarados.png"
@@ -0,0 +1,157 @@
+import pytest
+
+from app.stat_index import StatIndex, StatIndexCrawler
+from app.exceptions import PokemonNotFoundError, UpstreamUnavailableError
+
+
+def make_payload(identifier, speed, types=("water",), attack=50, weight=100):
+    return {
+        "id": identifier,
+        "name": f"pokemon-{identifier}",
+        "height": 10,
+        "weight": weight,
+        "types": [{"type": {"name": name}} for name in types],
+        "stats": [
+            {"stat": {"name": "hp"}, "base_stat": 50},
+            {"stat": {"name": "attack"}, "base_stat": attack},
+            {"stat": {"name": "speed"}, "base_stat": speed},
+        ],
+        "sprites": {"front_default": f"{identifier}.png"},
+    }
+
+
+@pytest.fixture
+def index():
+    index = StatIndex(capacity=2)
+    index.add(make_payload(1, speed=45, types=("grass", "poison")))
+    index.add(make_payload(7, speed=43))
+    index.add(make_payload(54, speed=55))
+    index.add(make_payload(130, speed=81, types=("water", "flying"), attack=125, weight=2350))
+    index.add(make_payload(25, speed=90, types=("electric",)))
+    return index
+
+
+def test_add_grows_and_ignores_duplicates(index):
+    index.add(make_payload(25, speed=1))
+
+    assert len(index) == 5
+    assert 130 in index
+    assert index.top("speed", limit=1)[0]["value"] == 90
+
+
+def test_top_orders_by_stat_descending(index):
+    results = index.top("speed", limit=3)
+
+    assert [entry["id"] for entry in results] == [25, 130, 54]
+    assert results[0]["name"] == "Pokemon 25"
+    assert results[0]["types"] == ["Electric"]
+
+
+def test_top_filters_by_type_bitmask(index):
+    results = index.top("speed", type_name="water", limit=10)
+
+    assert [entry["id"] for entry in results] == [130, 54, 7]
+
+
+def test_top_total_breaks_ties_by_id(index):
+    results = index.top("total", type_name="water", limit=2)
+
+    assert results[0]["id"] == 130
+    assert results[0]["total_stats"] == 50 + 125 + 81
+    assert [entry["id"] for entry in index.top("hp", limit=2)] == [1, 7]
+
+
+def test_search_combines_ranges_and_types(index):
+    total, results = index.search({"speed": (50, None), "weight": (None, 500)}, ["water"])
+
+    assert total == 1
+    assert results[0]["id"] == 54
+    assert results[0]["weight_kg"] == 10.0
+
+
+def test_search_requires_every_type_and_paginates(index):
+    total, results = index.search(type_names=["water", "flying"])
+    assert total == 1 and results[0]["id"] == 130
+
+    total, page = index.search(sort="speed", descending=False, offset=1, limit=2)
+    assert total == 5
+    assert [entry["id"] for entry in page] == [1, 54]
+    assert page[0]["value"] == 45
+
+
+def test_nearest_returns_closest_profiles(index):
+    pokemon, similar = index.nearest(7, k=2)
+
+    assert pokemon["id"] == 7
+    assert [entry["id"] for entry in similar] == [1, 54]
+    assert similar[0]["distance"] <= similar[1]["distance"]
+
+
+def test_nearest_can_require_a_shared_type(index):
+    _, similar = index.nearest(25, k=3, shared_types=True)
+    assert similar == []
+
+    _, similar = index.nearest(7, k=5, shared_types=True)
+    assert {entry["id"] for entry in similar} == {54, 130}
+    assert index.nearest(999) is None
+
+
+def test_crawler_fills_index_and_skips_missing():
+    index = StatIndex()
+
+    def fetch(identifier):
+        if identifier == 2:
+            raise PokemonNotFoundError("missing")
+        return make_payload(identifier, speed=identifier)
+
+    crawler = StatIndexCrawler(index, fetch, range(1, 5), delay=0)
+    crawler.start()
+    crawler.join(timeout=2)
+
+    assert crawler.done
+    assert len(index) == 3
+
+
+def test_crawler_reads_cached_batches_and_retries_failures(monkeypatch):
+    index = StatIndex()
+    cached = {1: make_payload(1, speed=1), 2: make_payload(2, speed=2)}
+    fetched = []
+    outage = {"remaining": 3}
+
+    def fetch(identifier):
+        fetched.append(identifier)
+        if outage["remaining"]:
+            outage["remaining"] -= 1
+            raise UpstreamUnavailableError("down")
+        return make_payload(identifier, speed=identifier)
+
+    def lookup(identifiers):
+        return {identifier: cached[identifier] for identifier in identifiers if identifier in cached}
+
+    pauses = []
+    monkeypatch.setattr("app.stat_index.time.sleep", pauses.append)
+    crawler = StatIndexCrawler(index, fetch, range(1, 5), delay=0, cached=lookup, retry_delay=0.01)
+    crawler._run()
+
+    assert crawler.done
+    assert sorted(index.identifiers()) == [1, 2, 3, 4]
+    # Cached Pokémon are never fetched; failed ones are retried after a growing pause.
+    assert fetched == [3, 4, 3, 4, 3]
+    assert pauses[:3] == [0.01, 0.02, 0.04]
+
+
+def test_crawler_is_not_done_while_fetches_fail():
+    index = StatIndex()
+
+    def fetch(identifier):
+        raise UpstreamUnavailableError("down")
+
+    crawler = StatIndexCrawler(index, fetch, range(1, 3), delay=0, retry_delay=0.01)
+    crawler.start()
+    crawler.join(timeout=0.2)
+
+    assert not crawler.done
+    assert len(index) == 0
+    crawler.stop()
+    crawler.join(timeout=1)
+    assert not crawler._thread.is_alive()
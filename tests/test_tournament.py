@@ -0,0 +1,51 @@
+from app.models import Pokemon, PokemonStat
+from app.tournament import Tournament
+
+
+def make_pokemon(identifier, *values):
+    names = ("Hp", "Attack", "Defense", "Special Attack", "Special Defense", "Speed")
+    return Pokemon(
+        identifier=identifier,
+        name=f"Pokemon {identifier}",
+        description="",
+        height_m=1.0,
+        weight_kg=10.0,
+        types=["Normal"],
+        abilities=[],
+        stats=[PokemonStat(name=name, value=value) for name, value in zip(names, values)],
+        image_url="",
+    )
+
+
+def test_win_matrix_uses_totals_then_individual_stats():
+    strong = make_pokemon(1, 100, 100, 100, 100, 100, 100)
+    fast = make_pokemon(2, 50, 50, 50, 50, 50, 150)
+    bulky = make_pokemon(3, 150, 50, 50, 50, 50, 50)
+    mirror = make_pokemon(4, 150, 50, 50, 50, 50, 50)
+
+    tournament = Tournament([strong, fast, bulky, mirror])
+
+    assert tournament.results[0].tolist() == [0, 1, 1, 1]
+    assert tournament.results[1, 2] == 0
+    assert tournament.results[2, 3] == 0
+    assert (tournament.results == -tournament.results.T).all()
+
+
+def test_standings_rank_by_wins_then_draws():
+    entrants = [make_pokemon(7, *[40] * 6), make_pokemon(3, *[90] * 6), make_pokemon(5, *[60] * 6)]
+
+    standings = Tournament(entrants).standings()
+
+    assert [(entry["rank"], entry["id"]) for entry in standings] == [(1, 3), (2, 5), (3, 7)]
+    assert standings[0]["wins"] == 2 and standings[-1]["losses"] == 2
+
+
+def test_bracket_gives_byes_and_crowns_a_champion():
+    entrants = [make_pokemon(identifier, *[identifier * 10] * 6) for identifier in (1, 2, 3, 4, 5)]
+
+    result = Tournament(entrants).to_dict()
+
+    assert [len(round_["matches"]) for round_ in result["bracket"]] == [3, 2, 1]
+    assert result["bracket"][0]["matches"][2] == {"a": 5, "b": None, "winner": 5}
+    assert result["champion"] == 5
+    assert len(result["results"]) == 5
@@ -0,0 +1,44 @@
+import pytest
+
+from app.type_chart import TypeChart
+
+
+@pytest.fixture
+def chart():
+    return TypeChart.from_type_payloads(
+        {
+            "water": {
+                "damage_relations": {
+                    "double_damage_to": [{"name": "fire"}, {"name": "ground"}],
+                    "half_damage_to": [{"name": "water"}, {"name": "grass"}],
+                }
+            },
+            "electric": {
+                "damage_relations": {
+                    "double_damage_to": [{"name": "water"}, {"name": "flying"}],
+                    "no_damage_to": [{"name": "ground"}],
+                }
+            },
+            "shadow": {"damage_relations": {"double_damage_to": [{"name": "fire"}]}},
+        }
+    )
+
+
+def test_dual_types_multiply(chart):
+    assert chart.effectiveness(["Water"], ["Fire", "Ground"]) == 4.0
+    assert chart.effectiveness(["Electric"], ["Water", "Ground"]) == 0.0
+    assert chart.effectiveness(["Water"], ["Grass"]) == 0.5
+
+
+def test_best_attacking_type_is_used(chart):
+    assert chart.effectiveness(["Water", "Electric"], ["Water", "Flying"]) == 4.0
+    assert chart.effectiveness([], ["Fire"]) == 1.0
+
+
+def test_snapshot_round_trip(chart, tmp_path):
+    path = tmp_path / "types.json"
+    chart.save(path)
+
+    loaded = TypeChart.load(path)
+
+    assert (loaded.matrix == chart.matrix).all()
@@ -0,0 +1,13 @@
+import os
+
+from app import create_app
+
+app = create_app()
+
+# With gunicorn's preload_app this runs once in the master, so the warmed cache and
+# every structure built here are inherited by the workers through copy-on-write.
+# Both calls finish any background preload before gunicorn forks the workers.
+if os.environ.get("POKEDEX_WARM_ON_START", "1") != "0":
+    app.extensions["pokemon_service"].warm_up()
+else:
+    app.extensions["pokemon_service"].preload()